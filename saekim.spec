@@ -1,5 +1,16 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+import subprocess
+import sys
+
+# The PDF export page reads KaTeX from src/ui/vendor and never from the network,
+# so the build fails rather than ship without it
+if subprocess.call([sys.executable, os.path.join(SPECPATH, 'src', 'fetch_pdf_assets.py')]) != 0:
+    raise SystemExit("PDF export assets missing: src/fetch_pdf_assets.py failed")
+if not os.path.isfile(os.path.join(SPECPATH, 'src', 'ui', 'vendor', 'katex', 'katex.min.css')):
+    raise SystemExit("PDF export assets missing: src/ui/vendor/katex/katex.min.css")
+
 block_cipher = None
 
 a = Analysis(
@@ -15,7 +26,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=['runtime_hook.py'],
-    excludes=['torch', 'torchvision', 'torchaudio', 'nvidia', 'numpy', 'pandas', 'matplotlib', 'scipy'],
+    excludes=['torch', 'torchvision', 'torchaudio', 'nvidia', 'pandas', 'matplotlib', 'scipy'],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -4,13 +4,18 @@ Provides QWebChannel API for JavaScript ↔ Python communication
 """
 
 import json
-import shutil
+import itertools
 from pathlib import Path
+from typing import Optional
 from PyQt6.QtCore import QObject, pyqtSlot, pyqtSignal, QSettings, Qt
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QApplication
 
 from backend.file_manager import FileManager
 from backend.converter import DocumentConverter
+from backend.conversion_service import JOB_TIME_LIMITS, PRIORITY_INTERACTIVE, get_conversion_service
+from backend.image_store import ImageStore
+from backend.pdf_import_estimate import estimate_pdf_import, parse_page_range
+from backend.pdf_import_job import PdfImportJob, load_pdf_import_profile
 from utils.logger import get_logger
 
 logger = get_logger()
@@ -21,17 +26,31 @@ class BackendAPI(QObject):
     Backend API exposed to JavaScript via QWebChannel
     All methods decorated with @pyqtSlot can be called from JavaScript
     Tab-aware version - all operations work on the active tab
+
+    Exports run in the background: the export slots return
+    {success, pending, job_id, filepath, error} right away and the result
+    follows through conversion_finished. PDF exports render in the
+    converter's warm browser on its event loop, several at once; other
+    exports run in the conversion service.
     """
 
     # Signals to send data from Python to JavaScript
     file_opened = pyqtSignal(str, str)  # (filename, content)
     file_saved = pyqtSignal(str)  # (filepath)
     error_occurred = pyqtSignal(str)  # (error_message)
+    conversion_finished = pyqtSignal(str, str)  # (job_id, JSON {success, filepath, error, warning})
+
+    # Export results arrive on the service or event loop thread; re-emitted onto the GUI thread
+    _conversion_done = pyqtSignal(str, str, tuple)  # (job_id, filepath, result)
 
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
         self.converter = DocumentConverter()
+        self.conversion_service = get_conversion_service()
+        self.pdf_import_jobs = {}  # tab_id -> running PdfImportJob
+        self._pdf_export_ids = itertools.count(1)
+        self._conversion_done.connect(self._on_conversion_done)
         logger.info("Backend API initialized")
 
     @property
@@ -468,7 +487,7 @@ class BackendAPI(QObject):
             markdown_content: Markdown text to convert
 
         Returns:
-            JSON string with {success, filepath, error}
+            JSON string with {success, pending, job_id, filepath, error}
         """
         try:
             file_path, _ = QFileDialog.getSaveFileName(
@@ -491,15 +510,9 @@ class BackendAPI(QObject):
             if lines and lines[0].startswith('#'):
                 title = lines[0].lstrip('#').strip()
 
-            success, error = self.converter.markdown_to_pdf(markdown_content, file_path, title)
-
-            if success:
-                logger.info(f"PDF exported: {file_path}")
-
-            return json.dumps({
-                "success": success,
-                "filepath": file_path if success else "",
-                "error": error
+            return self._submit_export('markdown_to_pdf', {
+                'markdown_content': markdown_content, 'output_path': file_path, 'title': title,
+                'base_dir': self._active_document_dir()
             })
 
         except Exception as e:
@@ -555,22 +568,16 @@ class BackendAPI(QObject):
             file_path: Path to save the PDF
 
         Returns:
-            JSON string with {success, filepath, error}
+            JSON string with {success, pending, job_id, filepath, error}
         """
         try:
             # Ensure Playwright browser is installed
             if not self._ensure_playwright_browser():
                 return json.dumps({"success": False, "filepath": "", "error": "Browser installation cancelled or failed"})
 
-            success, error = self.converter.html_to_pdf(rendered_html, file_path, title)
-
-            if success:
-                logger.info(f"PDF exported from HTML: {file_path}")
-
-            return json.dumps({
-                "success": success,
-                "filepath": file_path if success else "",
-                "error": error
+            return self._submit_export('html_to_pdf', {
+                'rendered_html': rendered_html, 'output_path': file_path, 'title': title,
+                'base_dir': self._active_document_dir()
             })
 
         except Exception as e:
@@ -588,7 +595,7 @@ class BackendAPI(QObject):
             title: Document title
 
         Returns:
-            JSON string with {success, filepath, error}
+            JSON string with {success, pending, job_id, filepath, error}
         """
         try:
             file_path, _ = QFileDialog.getSaveFileName(
@@ -605,32 +612,125 @@ class BackendAPI(QObject):
             if not self._ensure_playwright_browser():
                 return json.dumps({"success": False, "filepath": "", "error": "Browser installation cancelled or failed"})
 
-            success, error = self.converter.html_to_pdf(rendered_html, file_path, title)
+            return self._submit_export('html_to_pdf', {
+                'rendered_html': rendered_html, 'output_path': file_path, 'title': title,
+                'base_dir': self._active_document_dir()
+            })
 
-            if success:
-                logger.info(f"PDF exported from HTML: {file_path}")
+        except Exception as e:
+            logger.error(f"Error in export_to_pdf_html: {e}")
+            return json.dumps({"success": False, "filepath": "", "error": str(e)})
+
+    def _active_document_dir(self) -> Optional[str]:
+        """Folder of the active tab's file, which relative image paths of an export point into"""
+        if self.active_tab and self.active_tab.file_path:
+            return str(self.active_tab.file_path.parent)
+        return None
+
+    def _submit_export(self, kind: str, params: dict) -> str:
+        """
+        Start an export in the background
+
+        PDF exports ('markdown_to_pdf', 'html_to_pdf') are submitted to the
+        converter's event loop, others are queued in the conversion service.
+
+        Returns:
+            JSON string with {success, pending, job_id, filepath, error}; the
+            result is emitted through conversion_finished with the same job_id
+        """
+        file_path = params['output_path']
+        if kind in ('markdown_to_pdf', 'html_to_pdf'):
+            job_id = f"pdf-{next(self._pdf_export_ids)}"
+            start_export = getattr(self.converter, f"{kind}_async")
+            future = start_export(timeout=JOB_TIME_LIMITS[kind], **params)
+            future.add_done_callback(lambda future: self._conversion_done.emit(
+                job_id, file_path, self._pdf_export_result(future, JOB_TIME_LIMITS[kind])
+            ))
+        else:
+            job = self.conversion_service.submit(kind, params, priority=PRIORITY_INTERACTIVE)
+            job_id = job.job_id
+            job.subscribe(on_done=lambda result: self._conversion_done.emit(job_id, file_path, result))
+
+        return json.dumps({
+            "success": True,
+            "pending": True,
+            "job_id": job_id,
+            "filepath": file_path,
+            "error": ""
+        })
+
+    @staticmethod
+    def _pdf_export_result(future, time_limit: float) -> tuple:
+        """(success, content, error) of a finished PDF export future, like a service job's result"""
+        try:
+            success, error = future.result()
+        except TimeoutError:
+            return False, "", f"Conversion timed out after {time_limit:g}s"
+        except Exception as e:
+            return False, "", f"Conversion failed: {str(e)}"
+        return success, "", error
+
+    def _on_conversion_done(self, job_id: str, file_path: str, result: tuple):
+        """Forward a finished export to JavaScript (GUI thread)"""
+        success, _, error = result
+        if success:
+            logger.info(f"Exported: {file_path}")
+        else:
+            logger.error(f"Export failed: {error}")
+
+        # A successful export may still report a problem (remote images left out of a PDF)
+        self.conversion_finished.emit(job_id, json.dumps({
+            "success": success,
+            "filepath": file_path if success else "",
+            "error": "" if success else error,
+            "warning": error if success else ""
+        }))
+
+    @pyqtSlot(str, str, result=str)
+    def estimate_pdf_import(self, pdf_path: str, page_range: str = "") -> str:
+        """
+        Pre-scan a PDF (without extracting text) and estimate its import
+
+        Args:
+            pdf_path: Path to PDF file
+            page_range: Pages to import, e.g. "120-180" or "40-" (empty = all pages)
 
+        Returns:
+            JSON string with {success, estimate, error}; estimate is
+            PdfImportEstimate.to_dict() (page counts and ratios, seconds,
+            markdown_bytes, image_bytes)
+        """
+        try:
+            estimate = estimate_pdf_import(pdf_path, parse_page_range(page_range),
+                                           load_pdf_import_profile())
             return json.dumps({
-                "success": success,
-                "filepath": file_path if success else "",
-                "error": error
+                "success": True,
+                "estimate": estimate.to_dict(),
+                "error": ""
             })
 
         except Exception as e:
-            logger.error(f"Error in export_to_pdf_html: {e}")
-            return json.dumps({"success": False, "filepath": "", "error": str(e)})
+            logger.error(f"Error in estimate_pdf_import: {e}")
+            return json.dumps({
+                "success": False,
+                "estimate": None,
+                "error": str(e)
+            })
 
     @pyqtSlot(result=str)
     def import_from_pdf(self) -> str:
         """
         Import PDF and convert to markdown with enhanced extraction
-        Prompts user to save the markdown file and opens it in a new tab
+        Shows the estimated import cost and lets the user pick a page range
+        (PdfImportDialog), prompts for the markdown file location, opens it in a new tab right
+        away and appends converted pages as they arrive (conversion runs on a
+        background thread, so the window stays responsive)
 
         Features:
         - Text extraction with heading/formatting detection
         - Table extraction
         - Image extraction (saved to {pdf_name}_images folder)
-        - Saves to user-selected location and opens in new tab
+        - Saves to user-selected location once the conversion completes
 
         Returns:
             JSON string with {success, filepath, images_dir, error}
@@ -657,27 +757,21 @@ class BackendAPI(QObject):
                     "error": "Cancelled"
                 })
 
-            # Step 2: Convert PDF to markdown
             pdf_path = Path(pdf_file_path)
             images_dir = pdf_path.parent / f"{pdf_path.stem}_images"
 
-            success, content, error = self.converter.pdf_to_markdown(
-                pdf_file_path,
-                output_dir=str(images_dir)
-            )
-
-            if not success:
+            # Step 2: Show the estimated cost and let the user pick a page range
+            from windows.dialogs.pdf_import_dialog import PdfImportDialog
+            profile = load_pdf_import_profile()
+            import_dialog = PdfImportDialog(pdf_file_path, profile, self.main_window)
+            if not import_dialog.exec():
                 return json.dumps({
                     "success": False,
                     "filepath": "",
                     "images_dir": "",
-                    "error": error
+                    "error": "Cancelled"
                 })
 
-            logger.info(f"PDF converted to markdown: {pdf_file_path}")
-            if images_dir.exists():
-                logger.info(f"Images extracted to: {images_dir}")
-
             # Step 3: Prompt user to save markdown file
             # Default path is PDF directory with .md extension
             default_save_path = str(pdf_path.with_suffix('.md'))
@@ -697,30 +791,14 @@ class BackendAPI(QObject):
                     "error": "Save cancelled"
                 })
 
-            # Step 4: Save markdown file
-            save_success, final_content, save_error = FileManager.save_file(
-                content,
-                md_file_path,
-                None  # No old file path
-            )
-
-            if not save_success:
-                return json.dumps({
-                    "success": False,
-                    "filepath": "",
-                    "images_dir": "",
-                    "error": f"Failed to save: {save_error}"
-                })
-
-            logger.info(f"Markdown file saved: {md_file_path}")
-
-            # Step 5: Open saved file in new tab
-            self.main_window.open_file_in_new_tab(md_file_path)
+            # Step 4: Open the tab right away and stream pages into it
+            self.start_pdf_import(pdf_file_path, md_file_path, str(images_dir),
+                                  import_dialog.page_range, profile)
 
             return json.dumps({
                 "success": True,
                 "filepath": md_file_path,
-                "images_dir": str(images_dir) if images_dir.exists() else "",
+                "images_dir": "",
                 "error": ""
             })
 
@@ -733,6 +811,192 @@ class BackendAPI(QObject):
                 "error": str(e)
             })
 
+    def start_pdf_import(self, pdf_file_path: str, md_file_path: str,
+                         images_dir: str, page_range: Optional[tuple] = None,
+                         profile: Optional[str] = None) -> str:
+        """
+        Open a tab for md_file_path and stream the PDF conversion into it
+
+        Args:
+            page_range: Optional (first, last) pages to import, last None for "to the end"
+            profile: Import profile (default: the one chosen in the settings)
+
+        Returns:
+            Tab ID receiving the converted content
+        """
+        job = PdfImportJob(pdf_file_path, md_file_path, images_dir, service=self.conversion_service,
+                           profile=profile or load_pdf_import_profile(), page_range=page_range,
+                           parent=self)
+        tab_id = self.attach_pdf_import(job)
+        job.start()
+        return tab_id
+
+    def attach_pdf_import(self, job: PdfImportJob) -> str:
+        """
+        Open a tab for a (possibly already running) PDF import job
+        The tab shows the pages converted so far and receives the rest as they
+        arrive; its editor is read-only until the import has finished, so the
+        final content never overwrites edits
+
+        Returns:
+            Tab ID receiving the converted content
+        """
+        md_file_path = job.md_path
+
+        tab_id = self.tab_manager.find_tab_by_path(md_file_path)
+        if tab_id:
+            self.cancel_pdf_import(tab_id)
+            self.tab_manager.update_tab_content(tab_id, job.content)
+            self._run_js_in_tab(
+                tab_id,
+                f"if (typeof window.setEditorContent === 'function') "
+                f"{{ window.setEditorContent({json.dumps(job.content)}); }}"
+            )
+        else:
+            tab_id = self.main_window.create_new_tab(md_file_path, job.content)
+            self.main_window.file_explorer.set_root_path(str(Path(md_file_path).parent))
+
+        if job.is_done:
+            return tab_id
+
+        job.page_converted.connect(
+            lambda chunk, progress: self._on_pdf_page_converted(tab_id, chunk, progress)
+        )
+        job.finished.connect(
+            lambda success, error: self._on_pdf_import_finished(tab_id, job, success, error)
+        )
+        self.pdf_import_jobs[tab_id] = job
+        self._set_editor_read_only(tab_id, True)  # A new tab's webview locks once loaded
+
+        return tab_id
+
+    def sync_pdf_import_content(self, tab_id: str):
+        """
+        Copy the pages streamed so far into the tab content and lock its
+        editor (when a webview has loaded, before it gets the content)
+        """
+        job = self.pdf_import_jobs.get(tab_id)
+        if job:
+            self.tab_manager.update_tab_content(tab_id, job.content)
+            self._set_editor_read_only(tab_id, True)
+
+    def cancel_pdf_import(self, tab_id: str, wait: bool = False):
+        """Cancel a running PDF import streaming into the given tab"""
+        job = self.pdf_import_jobs.pop(tab_id, None)
+        if job:
+            job.cancel(wait=wait)
+
+    def cancel_all_pdf_imports(self):
+        """Cancel all running PDF imports and wait for them to stop (used on exit)"""
+        for tab_id in list(self.pdf_import_jobs):
+            self.cancel_pdf_import(tab_id, wait=True)
+
+    def shutdown(self):
+        """Stop all conversions, the conversion workers and the export browser (used on exit)"""
+        for tab_id in list(self.pdf_import_jobs):
+            self.cancel_pdf_import(tab_id)
+        # Running jobs are killed, so nothing is written after the window is gone
+        self.conversion_service.shutdown()
+        self.converter.close()
+
+    def _on_pdf_page_converted(self, tab_id: str, chunk: str, progress: dict):
+        """Append a converted page to the tab (GUI thread)"""
+        if tab_id not in self.pdf_import_jobs:
+            return
+
+        tab = self.tab_manager.get_tab(tab_id)
+        if not tab:
+            return
+
+        if chunk:
+            # The tab content is only taken from the job when a webview loads
+            # (sync_pdf_import_content), not rebuilt for every page
+            self._run_js_in_tab(
+                tab_id,
+                f"if (typeof window.appendEditorContent === 'function') "
+                f"{{ window.appendEditorContent({json.dumps(chunk)}); }}"
+            )
+
+        first_page = progress.get('first_page', 1)
+        last_page = progress.get('last_page', progress['total_pages'])
+        self._set_tab_label(
+            tab_id,
+            f"{tab.get_display_name()} ({progress['page'] - first_page + 1}/{last_page - first_page + 1})"
+        )
+
+    def _on_pdf_import_finished(self, tab_id: str, job: PdfImportJob, success: bool, error: str):
+        """Replace streamed pages with the final content and notify the user (GUI thread)"""
+        if self.pdf_import_jobs.get(tab_id) is job:
+            del self.pdf_import_jobs[tab_id]
+
+        tab = self.tab_manager.get_tab(tab_id)
+        if not tab:
+            return
+
+        self._set_tab_label(tab_id, tab.get_display_name())
+
+        # Nothing was typed meanwhile (the editor was read-only), so the final
+        # content can replace the streamed pages
+        self._set_editor_read_only(tab_id, False)
+
+        if not success:
+            if error != "Cancelled":
+                logger.error(f"PDF import failed: {error}")
+                self._run_js_in_tab(
+                    tab_id,
+                    f"if (typeof Utils !== 'undefined') "
+                    f"{{ Utils.showToast({json.dumps('PDF 변환 실패: ' + error)}, 'error'); }}"
+                )
+            return
+
+        self.tab_manager.update_tab_content(tab_id, job.content)
+        self.tab_manager.update_tab_modified(tab_id, False)
+        self._run_js_in_tab(
+            tab_id,
+            f"if (typeof window.setEditorContent === 'function') "
+            f"{{ window.setEditorContent({json.dumps(job.content)}); }}"
+        )
+
+        progress = job.last_progress
+        logger.info(
+            f"PDF import finished: {job.pdf_path} "
+            f"({progress.get('last_page', 0) - progress.get('first_page', 1) + 1} pages, "
+            f"{progress.get('elapsed', 0):.1f}s, profile {job.profile})"
+        )
+
+        message = 'PDF를 마크다운으로 변환하여 새 탭에서 열었습니다'
+        if Path(job.output_dir).exists():
+            logger.info(f"Images extracted to: {job.output_dir}")
+            message += f"\n이미지가 {job.output_dir}에 저장되었습니다"
+        message += f"\n단계별 변환 시간: {job.timings.summary()}"
+        self._run_js_in_tab(
+            tab_id,
+            f"if (typeof Utils !== 'undefined') "
+            f"{{ Utils.showToast({json.dumps(message)}, 'success'); }}"
+        )
+
+    def _run_js_in_tab(self, tab_id: str, js_code: str):
+        """Run JavaScript in a specific tab's webview"""
+        webview = self.main_window.webview_cache.get(tab_id)
+        if webview:
+            webview.page().runJavaScript(js_code)
+
+    def _set_editor_read_only(self, tab_id: str, read_only: bool):
+        """Lock or unlock a tab's editor"""
+        self._run_js_in_tab(
+            tab_id,
+            f"if (typeof window.setEditorReadOnly === 'function') "
+            f"{{ window.setEditorReadOnly({json.dumps(read_only)}); }}"
+        )
+
+    def _set_tab_label(self, tab_id: str, label: str):
+        """Set the tab widget label of a tab"""
+        tab_widget = self.main_window.tab_widget
+        for i in range(tab_widget.count()):
+            if tab_widget.tabWhatsThis(i) == tab_id:
+                tab_widget.setTabText(i, label)
+                return
+
     @pyqtSlot(str, result=str)
     def export_to_docx(self, markdown_content: str) -> str:
         """
@@ -784,7 +1048,7 @@ class BackendAPI(QObject):
             markdown_content: Markdown text to convert
 
         Returns:
-            JSON string with {success, filepath, error}
+            JSON string with {success, pending, job_id, filepath, error}
         """
         try:
             # Use active tab's file directory as default
@@ -808,15 +1072,8 @@ class BackendAPI(QObject):
             if lines and lines[0].startswith('#'):
                 title = lines[0].lstrip('#').strip()
 
-            success, error = self.converter.markdown_to_html(markdown_content, file_path, title)
-
-            if success:
-                logger.info(f"HTML exported: {file_path}")
-
-            return json.dumps({
-                "success": success,
-                "filepath": file_path if success else "",
-                "error": error
+            return self._submit_export('markdown_to_html', {
+                'markdown_content': markdown_content, 'output_path': file_path, 'title': title
             })
 
         except Exception as e:
@@ -833,6 +1090,8 @@ class BackendAPI(QObject):
         - If current file is saved: copy to {md_filename}_images/ folder
         - If current file is unsaved: copy to data/temp/images/ folder
           (will be moved when file is saved)
+        - The folder is an ImageStore: an image already in it is reused; the
+          copy is the user's own file, never linked to other documents
 
         Returns:
             JSON string with {success, filepath, relative_path, error}
@@ -879,46 +1138,24 @@ class BackendAPI(QObject):
                 # Saved file: copy to {md_filename}_images/ folder
                 md_path = self.active_tab.file_path
                 images_dir = md_path.parent / f"{md_path.stem}_images"
-                images_dir.mkdir(exist_ok=True)
 
-                dest_filename = sanitized_filename
+                # Copy image (same content under a taken name reuses that file)
+                with ImageStore(images_dir) as image_store:
+                    dest_filename = image_store.add_file(source_path, sanitized_filename)
                 dest_path = images_dir / dest_filename
 
-                # Handle duplicate filenames
-                counter = 1
-                while dest_path.exists():
-                    stem = source_path.stem
-                    suffix = source_path.suffix
-                    dest_filename = f"{stem}_{counter}{suffix}"
-                    dest_path = images_dir / dest_filename
-                    counter += 1
-
-                # Copy image
-                shutil.copy2(source_path, dest_path)
-
                 # Use relative path from md file
                 relative_path_str = f"./{images_dir.name}/{dest_filename}"
 
             else:
                 # Unsaved file: copy to data/temp/images/
                 temp_images_dir = project_root / 'data' / 'temp' / 'images'
-                temp_images_dir.mkdir(parents=True, exist_ok=True)
 
-                dest_filename = sanitized_filename
+                # Copy image (same content under a taken name reuses that file)
+                with ImageStore(temp_images_dir) as image_store:
+                    dest_filename = image_store.add_file(source_path, sanitized_filename)
                 dest_path = temp_images_dir / dest_filename
 
-                # Handle duplicate filenames
-                counter = 1
-                while dest_path.exists():
-                    stem = source_path.stem
-                    suffix = source_path.suffix
-                    dest_filename = f"{stem}_{counter}{suffix}"
-                    dest_path = temp_images_dir / dest_filename
-                    counter += 1
-
-                # Copy image
-                shutil.copy2(source_path, dest_path)
-
                 # Use project-relative path (will be updated on save)
                 relative_path = dest_path.relative_to(project_root)
                 relative_path_str = str(relative_path).replace('\\', '/')
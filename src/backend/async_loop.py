@@ -0,0 +1,81 @@
+"""
+Async Loop Module
+Background thread running the asyncio event loop of a DocumentConverter
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class AsyncLoopThread:
+    """
+    asyncio event loop running in a daemon thread
+
+    The thread starts with the first submitted coroutine and runs until
+    stop(). Coroutines can be submitted from any thread, run concurrently
+    on the loop, and hand their results back as concurrent.futures.Future,
+    so the caller decides whether to block (result()) or be called back
+    (add_done_callback(), which runs on the loop thread). Objects bound to
+    the loop, like the Playwright browser, live as long as the thread.
+    """
+
+    def __init__(self, name: str = 'saekim-async'):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def submit(self, coro, timeout: Optional[float] = None) -> Future:
+        """
+        Schedule a coroutine on the loop
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds after which the coroutine is cancelled and the
+                     future fails with TimeoutError (None: no limit)
+
+        Returns:
+            Future of the coroutine's result
+        """
+        if timeout is not None:
+            coro = asyncio.wait_for(coro, timeout)
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the loop and wait for its result (not from the loop thread)"""
+        return self.submit(coro, timeout).result()
+
+    def stop(self, timeout: float = 10):
+        """Stop the loop; coroutines still running are abandoned"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning(f"Event loop thread {self.name} did not stop")
+        else:
+            loop.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
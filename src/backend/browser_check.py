@@ -0,0 +1,179 @@
+"""
+Browser Check Module
+Finds out whether the PDF export browser is installed without launching it
+"""
+
+import os
+import sys
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from backend.pdf_browser import bundled_browser_path
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Browsers of the Playwright registry that a headless Chromium launch needs;
+# releases since 1.49 run headless Chromium from the separate headless shell
+HEADLESS_BROWSERS = ('chromium-headless-shell', 'chromium')
+
+# Written by "playwright install" into a browser folder once it is complete
+INSTALLATION_MARKER = 'INSTALLATION_COMPLETE'
+
+
+@dataclass
+class BrowserProbe:
+    """What is on disk for the export browser"""
+    installed: bool
+    path: str  # Browser folder (or bundled executable)
+    browser_version: str
+    stamp: str  # Changes whenever the installation changes
+    detail: str = ""  # Why the browser counts as missing
+
+
+def playwright_browsers_dir() -> Path:
+    """Folder "playwright install" downloads browsers to (mirrors the Playwright registry)"""
+    configured = os.environ.get('PLAYWRIGHT_BROWSERS_PATH')
+    if configured == '0':
+        import playwright
+        return Path(playwright.__file__).parent / 'driver' / 'package' / '.local-browsers'
+    if configured:
+        return Path(configured).resolve()
+
+    if sys.platform == 'win32':
+        cache_dir = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        cache_dir = Path.home() / 'Library' / 'Caches'
+    else:
+        cache_dir = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_dir) / 'ms-playwright'
+
+
+def probe_browser() -> BrowserProbe:
+    """
+    Look for the export browser on disk
+
+    Reads the browser revisions the installed Playwright expects
+    (driver/package/browsers.json) and checks that their folders hold a
+    completed installation. Nothing is launched, not even the Playwright driver.
+    """
+    bundled_path = bundled_browser_path()
+    if bundled_path is not None and bundled_path.exists():
+        stat = bundled_path.stat()
+        return BrowserProbe(True, str(bundled_path), "bundled",
+                            f"bundled:{stat.st_size}:{stat.st_mtime_ns}")
+
+    try:
+        import playwright
+        from importlib.metadata import version
+        playwright_version = version('playwright')
+        browsers_json = Path(playwright.__file__).parent / 'driver' / 'package' / 'browsers.json'
+        with open(browsers_json, 'r', encoding='utf-8') as f:
+            browsers = {browser['name']: browser for browser in json.load(f)['browsers']}
+    except ImportError:
+        return BrowserProbe(False, "", "", "", "Playwright is not installed")
+    except Exception as e:
+        return BrowserProbe(False, "", "", "", f"Playwright browser list unreadable: {e}")
+
+    name = next((name for name in HEADLESS_BROWSERS if name in browsers), None)
+    if name is None:
+        return BrowserProbe(False, "", "", "", "Playwright lists no Chromium build")
+
+    browser = browsers[name]
+    browser_dir = playwright_browsers_dir() / f"{name.replace('-', '_')}-{browser['revision']}"
+    marker = browser_dir / INSTALLATION_MARKER
+    try:
+        marker_mtime = marker.stat().st_mtime_ns
+    except OSError:
+        return BrowserProbe(False, str(browser_dir), browser.get('browserVersion', ""), "",
+                            f"{name} {browser['revision']} is not installed")
+
+    return BrowserProbe(
+        installed=True,
+        path=str(browser_dir),
+        browser_version=browser.get('browserVersion', ""),
+        stamp=f"{playwright_version}:{name}-{browser['revision']}:{marker_mtime}",
+    )
+
+
+class BrowserCheck:
+    """
+    Whether PDF exports can launch their browser, without launching it each time
+
+    A real launch proves that the browser works; its result is remembered
+    for the process and in ~/.saekim/browser_check.json together with the
+    stamp of the installation it was made for. Later checks only probe the
+    disk (probe_browser()) and launch again when the installation changed,
+    when the stored result is missing or negative, or when the last export
+    failed (record_export()).
+    """
+
+    def __init__(self, state_path: Optional[Path] = None):
+        self.state_path = Path(state_path) if state_path else Path.home() / '.saekim' / 'browser_check.json'
+        self._lock = threading.Lock()
+        self._verified_stamp = None  # Installation verified in this process
+        self._state = None
+
+    def is_available(self, launch: Callable[[], bool]) -> bool:
+        """
+        Check that the export browser works
+
+        Args:
+            launch: Real launch check, called only when the cached result cannot be used
+
+        Returns:
+            True if the browser is installed and launches
+        """
+        with self._lock:
+            probe = probe_browser()
+            if not probe.installed:
+                logger.info(f"PDF export browser missing: {probe.detail}")
+                self._verified_stamp = None
+                return False
+            if probe.stamp == self._verified_stamp:
+                return True
+
+            state = self._load()
+            if state.get('stamp') == probe.stamp and state.get('verified') and not state.get('last_export_failed'):
+                self._verified_stamp = probe.stamp
+                return True
+
+            logger.info(f"Launching PDF export browser to check it ({probe.path})")
+            verified = launch()
+            self._save({'stamp': probe.stamp, 'browser_version': probe.browser_version,
+                        'verified': verified, 'last_export_failed': False})
+            self._verified_stamp = probe.stamp if verified else None
+            return verified
+
+    def record_export(self, success: bool):
+        """Remember the outcome of an export; after a failure the next check launches the browser"""
+        with self._lock:
+            state = self._load()
+            if state.get('last_export_failed', False) == (not success):
+                return
+            if not success:
+                self._verified_stamp = None
+            self._save(dict(state, last_export_failed=not success))
+
+    def _load(self) -> dict:
+        if self._state is None:
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {}
+        return self._state
+
+    def _save(self, state: dict):
+        self._state = state
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_name(f"{self.state_path.name}.tmp-{os.getpid()}")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Failed to save browser check: {e}")
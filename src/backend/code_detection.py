@@ -0,0 +1,628 @@
+"""
+Code Detection Module
+Classifiers used by the PDF importer to recognise source code in extracted text
+"""
+
+import re
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class CodeLineClassifier:
+    """
+    Decides whether a single line of text looks like code.
+
+    Built once per converter: all patterns are compiled up front and the
+    strong patterns are merged into two combined regexes (line-start and
+    anywhere). Cheap prefilters on the first token and on a few characters
+    skip the combined regexes for most prose lines, and verdicts are
+    memoized so repeated lines (headers, footers, boilerplate) cost a
+    dictionary lookup.
+    """
+
+    # Strong indicators - if any match, it's very likely code.
+    # Patterns anchored at the start of the line...
+    LINE_START_PATTERNS = [
+        # Python specific
+        r'^def\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?:',  # def func() -> Type:
+        r'^class\s+\w+.*:',  # class Foo:
+        r'^(from|import)\s+\w+',  # import/from
+        r'^@\w+',  # @decorator
+        r'^\s*if\s+.+:$',  # if condition:
+        r'^\s*elif\s+.+:$',  # elif condition:
+        r'^\s*else\s*:$',  # else:
+        r'^\s*for\s+\w+\s+in\s+.+:',  # for x in ...:
+        r'^\s*while\s+.+:',  # while ...:
+        r'^\s*try\s*:',  # try:
+        r'^\s*except.*:',  # except:
+        r'^\s*finally\s*:',  # finally:
+        r'^\s*with\s+.+:',  # with ...:
+        r'^\s*return\s+',  # return
+        r'^\s*yield\s+',  # yield
+        r'^\s*raise\s+',  # raise
+        r'^\s*pass\s*$',  # pass
+        r'^\s*break\s*$',  # break
+        r'^\s*continue\s*$',  # continue
+
+        # JavaScript/TypeScript
+        r'^(const|let|var)\s+\w+\s*=',
+        r'^function\s+\w+\s*\(',
+        r'^\s*=>\s*\{',
+
+        # Java/C#
+        r'^(public|private|protected)\s+(static\s+)?(void|int|String|boolean)',
+        r'^(public|private|protected)\s+class\s+\w+',
+
+        # C/C++
+        r'^#include\s*[<"]',
+        r'^#define\s+\w+',
+        r'^int\s+main\s*\(',
+
+        # General
+        r'^\s*//.*$',  # // comment
+        r'^\s*#(?!#)\s*\w+',  # # comment (but not ## heading)
+        r'^\s*/\*',  # /* comment
+        r'^\s*\*/',  # */ end comment
+    ]
+
+    # ...and patterns that may match anywhere in the line
+    ANYWHERE_PATTERNS = [
+        r'\w+\s*=\s*\[.*\]',  # list assignment
+        r'\w+\s*=\s*\{.*\}',  # dict assignment
+        r'\w+\s*=\s*\(.*\)',  # tuple assignment
+        r'lambda\s+\w+\s*:',  # lambda
+        r'map\s*\(.+\)',  # map()
+        r'filter\s*\(.+\)',  # filter()
+        r'list\s*\(.+\)',  # list()
+        r'dict\s*\(.+\)',  # dict()
+        r'range\s*\(.+\)',  # range()
+        r'print\s*\(.+\)',  # print()
+        r'input\s*\(.+\)',  # input()
+        r'len\s*\(.+\)',  # len()
+        r'\.split\s*\(',  # .split()
+        r'\.join\s*\(',  # .join()
+        r'\.append\s*\(',  # .append()
+        r'int\s*\(.+\)',  # int()
+        r'str\s*\(.+\)',  # str()
+        r'float\s*\(.+\)',  # float()
+        r'console\.(log|error|warn)\s*\(',
+        r'printf\s*\(',
+        r'cout\s*<<',
+    ]
+
+    # First words that can start a LINE_START_PATTERNS match ('except' is a prefix match)
+    LINE_START_WORDS = frozenset([
+        'def', 'class', 'from', 'import', 'if', 'elif', 'else', 'for', 'while',
+        'try', 'finally', 'with', 'return', 'yield', 'raise', 'pass', 'break',
+        'continue', 'const', 'let', 'var', 'function', 'public', 'private',
+        'protected', 'int',
+    ])
+    LINE_START_CHARS = frozenset('@#/*=')
+
+    # Every ANYWHERE_PATTERNS match contains one of these substrings
+    ANYWHERE_MARKERS = ('(', '=', 'lambda', 'cout')
+
+    def __init__(self, cache_size: int = 8192):
+        self._line_start_re = re.compile('|'.join(f'(?:{p})' for p in self.LINE_START_PATTERNS))
+        self._anywhere_re = re.compile('|'.join(f'(?:{p})' for p in self.ANYWHERE_PATTERNS))
+        self._first_word_re = re.compile(r'[A-Za-z]+')
+
+        # Weak indicators, scored when no strong pattern matched
+        self._indent_re = re.compile(r'^(\t|    +)')
+        self._bracket_re = re.compile(r'[\{\}\[\]\(\)]')
+        self._operator_re = re.compile(r'[=!<>]=|&&|\|\||=>|->|\+\+|--|==|!=')
+        self._assignment_re = re.compile(r'\w+\s*=\s*\w+')
+        self._sigil_re = re.compile(r'[$@]\w+')
+        self._snake_case_re = re.compile(r'\b[a-z]+_[a-z_]+\b')
+        self._string_literal_re = re.compile(r'["\'][^"\']+["\']')
+        self._comment_re = re.compile(r'^\s*#\s+\S')
+        self._method_call_re = re.compile(r'\w+\.\w+\(')
+
+        self.is_code = lru_cache(maxsize=cache_size)(self._classify)
+
+    def cache_info(self):
+        """Memoization statistics (hits, misses, maxsize, currsize)"""
+        return self.is_code.cache_info()
+
+    def _classify(self, text: str) -> bool:
+        text_stripped = text.strip()
+        if not text_stripped:
+            return False
+
+        if self._has_strong_pattern(text_stripped):
+            return True
+
+        return self._indicator_score(text, text_stripped) >= 3
+
+    def _has_strong_pattern(self, text_stripped: str) -> bool:
+        first_char = text_stripped[0]
+        if first_char in self.LINE_START_CHARS:
+            if self._line_start_re.match(text_stripped):
+                return True
+        else:
+            first_word = self._first_word_re.match(text_stripped)
+            if first_word:
+                word = first_word.group()
+                if word in self.LINE_START_WORDS or word.startswith('except'):
+                    if self._line_start_re.match(text_stripped):
+                        return True
+
+        for marker in self.ANYWHERE_MARKERS:
+            if marker in text_stripped:
+                return self._anywhere_re.search(text_stripped) is not None
+
+        return False
+
+    def _indicator_score(self, text: str, text_stripped: str) -> int:
+        """Score code-like characteristics; 3 or more means code"""
+        code_indicators = 0
+
+        # Has significant indentation (4+ spaces or tab at start)
+        if self._indent_re.match(text):
+            code_indicators += 3
+
+        # Line ends with colon (Python)
+        if text_stripped.endswith(':') and not text_stripped.startswith('#'):
+            code_indicators += 2
+
+        # Contains semicolon at end (C-style)
+        if text_stripped.endswith(';'):
+            code_indicators += 2
+
+        if code_indicators >= 3:
+            return code_indicators
+
+        # Contains brackets/braces
+        bracket_count = len(self._bracket_re.findall(text_stripped))
+        if bracket_count >= 2:
+            code_indicators += 2
+        elif bracket_count >= 1:
+            code_indicators += 1
+
+        # Contains operators common in code
+        if self._operator_re.search(text_stripped):
+            code_indicators += 2
+
+        # Multiple assignment operators
+        if '=' in text_stripped and self._assignment_re.search(text_stripped):
+            code_indicators += 1
+
+        if code_indicators >= 3:
+            return code_indicators
+
+        # Contains common code symbols
+        if self._sigil_re.search(text_stripped):  # $var, @decorator
+            code_indicators += 2
+
+        # Has snake_case identifiers (common in Python)
+        if self._snake_case_re.search(text_stripped):
+            code_indicators += 1
+
+        # Contains string literals with quotes
+        if self._string_literal_re.search(text_stripped):
+            code_indicators += 1
+
+        # Line is a comment (# followed by space and text)
+        if self._comment_re.match(text_stripped):
+            code_indicators += 2
+
+        # Contains method/function call pattern
+        if self._method_call_re.search(text_stripped):
+            code_indicators += 2
+
+        return code_indicators
+
+
+class CodeLanguageDetector:
+    """
+    Detects the programming language of a code block.
+
+    One tokenizing pass collects the block's word tokens; every pattern
+    feature is gated on the tokens or literals it cannot match without, so
+    only the few patterns with a chance of matching are actually searched.
+    Languages are then scored from the resulting feature set. Verdicts are
+    cached by block content hash, so repeated snippets are never rescored.
+    """
+
+    LANGUAGES = [
+        'python', 'javascript', 'typescript', 'java', 'c', 'cpp', 'csharp', 'go',
+        'rust', 'html', 'css', 'sql', 'bash', 'json', 'xml', 'yaml', 'markdown',
+    ]
+
+    # name: (pattern, flags, all tokens required, any token required, literals required)
+    # Case-insensitive patterns are gated on lowercased tokens (ASCII text only).
+    PATTERN_FEATURES = {
+        # Python
+        'py_def': (r'\bdef\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?\s*:', 0, ('def',), (), ()),
+        'py_class': (r'\bclass\s+\w+.*:', 0, ('class',), (), ()),
+        'py_decorator': (r'^\s*@\w+', re.MULTILINE, (), (), ('@',)),
+        'py_if': (r'\bif\s+.+:', 0, ('if',), (), (':',)),
+        'py_for_in': (r'\bfor\s+\w+\s+in\s+', 0, ('for', 'in'), (), ()),
+        'py_except': (r'\bexcept\s+\w+.*:', 0, ('except',), (), ()),
+        'py_print': (r'\bprint\s*\(', 0, ('print',), (), ()),
+        'py_lambda': (r'\blambda\s+\w+\s*:', 0, ('lambda',), (), ()),
+
+        # JavaScript
+        'js_const': (r'\bconst\s+\w+\s*=', 0, ('const',), (), ()),
+        'js_let': (r'\blet\s+\w+\s*=', 0, ('let',), (), ()),
+        'js_var': (r'\bvar\s+\w+\s*=', 0, ('var',), (), ()),
+        'js_function': (r'\bfunction\s+\w+\s*\(', 0, ('function',), (), ()),
+        'js_dom': (r'\bdocument\.|window\.', 0, (), (), ()),
+        'js_require': (r'require\s*\(', 0, (), (), ('require',)),
+
+        # TypeScript
+        'ts_type_annotation': (r':\s*(string|number|boolean|any|void)\b', 0, (),
+                               ('string', 'number', 'boolean', 'any', 'void'), (':',)),
+        'ts_interface': (r'\binterface\s+\w+\s*\{', 0, ('interface',), (), ()),
+        'ts_type_alias': (r'\btype\s+\w+\s*=', 0, ('type',), (), ()),
+
+        # Java
+        'java_public_class': (r'\bpublic\s+class\s+\w+', 0, ('public', 'class'), (), ()),
+        'java_main': (r'\bpublic\s+static\s+void\s+main', 0, ('public', 'static', 'void'), (), ()),
+        'java_sysout': (r'\bSystem\.out\.print', 0, (), (), ('System.out.print',)),
+        'java_private': (r'\bprivate\s+(static\s+)?(final\s+)?\w+\s+\w+', 0, ('private',), (), ()),
+        'java_new': (r'\bnew\s+\w+\s*\(', 0, ('new',), (), ()),
+        'java_annotation': (r'@Override|@Autowired|@Component', 0, (), (), ('@',)),
+
+        # C
+        'c_include_h': (r'#include\s*<\w+\.h>', 0, (), (), ('#include',)),
+        'c_main': (r'\bint\s+main\s*\(', 0, ('int', 'main'), (), ()),
+        'c_printf': (r'\bprintf\s*\(', 0, ('printf',), (), ()),
+        'c_scanf': (r'\bscanf\s*\(', 0, ('scanf',), (), ()),
+        'c_alloc': (r'\bmalloc\s*\(|\bfree\s*\(', 0, (), ('malloc', 'free'), ()),
+        'c_struct': (r'\bstruct\s+\w+\s*\{', 0, ('struct',), (), ()),
+
+        # C++
+        'cpp_include': (r'#include\s*<\w+>', 0, (), (), ('#include',)),
+        'cpp_class_body': (r'\bclass\s+\w+\s*\{', 0, ('class',), (), ()),
+        'cpp_namespace': (r'\bnamespace\s+\w+', 0, ('namespace',), (), ()),
+        'cpp_template': (r'\btemplate\s*<', 0, ('template',), (), ()),
+
+        # C#
+        'cs_using_system': (r'\busing\s+System', 0, ('using',), (), ()),
+        'cs_console': (r'\bConsole\.(WriteLine|ReadLine)', 0, (), (), ('Console.',)),
+        'cs_async_task': (r'\basync\s+Task', 0, ('async',), (), ()),
+
+        # Go
+        'go_package': (r'\bpackage\s+\w+', 0, ('package',), (), ()),
+        'go_func': (r'\bfunc\s+\w+\s*\(', 0, ('func',), (), ()),
+        'go_fmt': (r'\bfmt\.(Print|Println|Printf)', 0, ('fmt',), (), ()),
+        'go_goroutine': (r'\bgo\s+\w+\(', 0, ('go',), (), ()),
+        'go_defer': (r'\bdefer\s+', 0, ('defer',), (), ()),
+
+        # Rust
+        'rs_fn': (r'\bfn\s+\w+\s*\(', 0, ('fn',), (), ()),
+        'rs_let_mut': (r'\blet\s+mut\s+', 0, ('let', 'mut'), (), ()),
+        'rs_impl': (r'\bimpl\s+\w+', 0, ('impl',), (), ()),
+        'rs_pub_fn': (r'\bpub\s+fn\s+', 0, ('pub', 'fn'), (), ()),
+        'rs_return_type': (r'->\s*\w+', 0, (), (), ('->',)),
+
+        # HTML
+        'html_tag': (r'<(!DOCTYPE|html|head|body|div|span|p|a|img)\b', re.IGNORECASE, (),
+                     ('doctype', 'html', 'head', 'body', 'div', 'span', 'p', 'a', 'img'), ('<',)),
+        'html_close_tag': (r'</\w+>', 0, (), (), ('</',)),
+        'html_attribute': (r'<\w+\s+\w+="[^"]*"', 0, (), (), ('="',)),
+
+        # CSS
+        'css_rule': (r'\{[^}]*:\s*[^;]+;[^}]*\}', 0, (), (), ('{', ':', ';')),
+        'css_property': (r'\b(margin|padding|font-size|color|background|display)\s*:', 0, (),
+                         ('margin', 'padding', 'size', 'color', 'background', 'display'), (':',)),
+        'css_class_selector': (r'\.([\w-]+)\s*\{', 0, (), (), ('{',)),
+        'css_id_selector': (r'#[\w-]+\s*\{', 0, (), (), ('#', '{')),
+
+        # SQL
+        'sql_select': (r'\bSELECT\s+.+\s+FROM\b', re.IGNORECASE, ('select', 'from'), (), ()),
+        'sql_insert': (r'\bINSERT\s+INTO\b', re.IGNORECASE, ('insert', 'into'), (), ()),
+        'sql_create': (r'\bCREATE\s+(TABLE|DATABASE|INDEX)\b', re.IGNORECASE, ('create',), (), ()),
+        'sql_where': (r'\bWHERE\s+', re.IGNORECASE, ('where',), (), ()),
+        'sql_join': (r'\bJOIN\s+', re.IGNORECASE, ('join',), (), ()),
+
+        # Bash/Shell
+        'sh_shebang': (r'^#!/bin/(bash|sh|zsh)', re.MULTILINE, (), (), ('#!/bin/',)),
+        'sh_prompt': (r'^\$\s+\w+', re.MULTILINE, (), (), ('$',)),
+        'sh_command': (r'\b(sudo|apt|yum|brew|npm|pip|git|docker|kubectl)\s+', 0, (),
+                       ('sudo', 'apt', 'yum', 'brew', 'npm', 'pip', 'git', 'docker', 'kubectl'), ()),
+        'sh_echo': (r'\becho\s+', 0, ('echo',), (), ()),
+        'sh_export': (r'\bexport\s+\w+=', 0, ('export',), (), ()),
+        'sh_variable': (r'\$\{\w+\}|\$\w+', 0, (), (), ('$',)),
+
+        # JSON
+        'json_key': (r'"\w+"\s*:', 0, (), (), ('"',)),
+
+        # XML
+        'xml_declaration': (r'<\?xml\s+version=', 0, (), (), ('<?xml',)),
+        'xml_element': (r'<\w+[^>]*>[^<]*</\w+>', 0, (), (), ('</',)),
+
+        # YAML
+        'yaml_key_only': (r'^\w+:\s*$', re.MULTILINE, (), (), (':',)),
+        'yaml_list_key': (r'^\s*-\s+\w+:', re.MULTILINE, (), (), ('-', ':')),
+        'yaml_key_value': (r'^\w+:\s+\w+', re.MULTILINE, (), (), (':',)),
+    }
+
+    # (feature, language, points) - applied for every feature present
+    FEATURE_SCORES = [
+        ('py_def', 'python', 10), ('py_class', 'python', 8), ('py_self', 'python', 10),
+        ('py_dunder', 'python', 10), ('py_decorator', 'python', 5), ('py_control_flow', 'python', 3),
+        ('py_elif', 'python', 8), ('py_except', 'python', 5), ('py_import', 'python', 3),
+        ('py_from_import', 'python', 8), ('py_print', 'python', 2), ('py_none', 'python', 3),
+        ('py_bool', 'python', 2), ('py_lambda', 'python', 5),
+
+        ('js_const', 'javascript', 5), ('js_let', 'javascript', 5), ('js_var', 'javascript', 3),
+        ('js_function', 'javascript', 5), ('js_arrow', 'javascript', 5),
+        ('js_console_log', 'javascript', 8), ('js_dom', 'javascript', 8),
+        ('js_require', 'javascript', 5), ('js_null_undefined', 'javascript', 3),
+        ('js_strict_equality', 'javascript', 5),
+
+        ('ts_type_annotation', 'typescript', 8), ('ts_interface', 'typescript', 10),
+        ('ts_type_alias', 'typescript', 8), ('ts_generic', 'typescript', 3),
+
+        ('java_public_class', 'java', 10), ('java_main', 'java', 15), ('java_sysout', 'java', 10),
+        ('java_private', 'java', 5), ('java_new_statement', 'java', 3), ('java_annotation', 'java', 8),
+
+        ('c_include_h', 'c', 10), ('c_main', 'c', 8), ('c_printf', 'c', 8), ('c_scanf', 'c', 8),
+        ('c_alloc', 'c', 5), ('c_struct', 'c', 3),
+
+        ('cpp_modern_include', 'cpp', 5), ('cpp_std', 'cpp', 10), ('cpp_stream', 'cpp', 8),
+        ('cpp_class_statement', 'cpp', 5), ('cpp_scope', 'cpp', 3), ('cpp_namespace', 'cpp', 8),
+        ('cpp_template', 'cpp', 8),
+
+        ('cs_using_system', 'csharp', 10), ('cs_namespace_block', 'csharp', 5),
+        ('cs_console', 'csharp', 10), ('cs_async_task', 'csharp', 8), ('cs_var_statement', 'csharp', 3),
+
+        ('go_package', 'go', 10), ('go_func', 'go', 8), ('go_fmt', 'go', 10),
+        ('go_short_declaration', 'go', 8), ('go_goroutine', 'go', 5), ('go_defer', 'go', 8),
+
+        ('rs_fn', 'rust', 8), ('rs_let_mut', 'rust', 10), ('rs_impl', 'rust', 10),
+        ('rs_pub_fn', 'rust', 8), ('rs_macro', 'rust', 10), ('rs_return_path', 'rust', 5),
+
+        ('html_tag', 'html', 10), ('html_close_tag', 'html', 5), ('html_attribute', 'html', 3),
+
+        ('css_rule', 'css', 5), ('css_property', 'css', 8), ('css_class_selector', 'css', 5),
+        ('css_id_selector', 'css', 5),
+
+        ('sql_select', 'sql', 15), ('sql_insert', 'sql', 10), ('sql_create', 'sql', 10),
+        ('sql_where', 'sql', 5), ('sql_join', 'sql', 5),
+
+        ('sh_shebang', 'bash', 15), ('sh_prompt', 'bash', 5), ('sh_command', 'bash', 5),
+        ('sh_echo', 'bash', 3), ('sh_export', 'bash', 5), ('sh_variable', 'bash', 3),
+
+        ('json_document', 'json', 15),
+
+        ('xml_declaration', 'xml', 15), ('xml_document', 'xml', 5),
+
+        ('yaml_key_only', 'yaml', 5), ('yaml_list_key', 'yaml', 8), ('yaml_key_value_plain', 'yaml', 3),
+    ]
+
+    def __init__(self, cache_size: int = 4096):
+        self._patterns = {}
+        # Inverted index: token -> patterns it can open, so one set intersection
+        # with the block's tokens yields every candidate pattern
+        self._token_index = {}
+        self._lower_token_index = {}
+        self._ungated = set()
+        self._ignore_case = set()
+
+        for name, (pattern, flags, all_tokens, any_tokens, literals) in self.PATTERN_FEATURES.items():
+            self._patterns[name] = (re.compile(pattern, flags), all_tokens, any_tokens, literals)
+            ignore_case = bool(flags & re.IGNORECASE)
+            if ignore_case:
+                self._ignore_case.add(name)
+            index = self._lower_token_index if ignore_case else self._token_index
+            triggers = all_tokens[:1] or any_tokens
+            if not triggers:
+                self._ungated.add(name)
+            for token in triggers:
+                index.setdefault(token, []).append(name)
+
+        self._token_re = re.compile(r'\w+')
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def detect(self, code_lines: list) -> str:
+        """
+        Detect the language of a code block
+
+        Returns:
+            Language name, or "" if no language scores high enough
+        """
+        code_text = '\n'.join(code_lines)
+        key = hashlib.blake2b(code_text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+        language = self._cache.get(key)
+        if language is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return language
+
+        self.cache_misses += 1
+        scores = self.score(code_text)
+        language = self._best_language(scores)
+
+        # Log for debugging
+        top_scores = sorted(scores.items(), key=lambda x: -x[1])[:3]
+        logger.debug(f"Language detection scores: {top_scores}")
+
+        self._cache[key] = language
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return language
+
+    def score(self, code_text: str) -> dict:
+        """Score every language from the features of code_text"""
+        features = self.extract_features(code_text)
+
+        scores = dict.fromkeys(self.LANGUAGES, 0)
+        for feature, language, points in self.FEATURE_SCORES:
+            if feature in features:
+                scores[language] += points
+
+        if scores['typescript'] > 0:
+            scores['typescript'] += scores['javascript'] // 2  # TS inherits JS patterns
+        scores['cpp'] += scores['c'] // 2  # C++ inherits C patterns
+
+        return scores
+
+    def extract_features(self, code_text: str) -> set:
+        """Collect all features of a code block in one tokenizing pass"""
+        tokens = set(self._token_re.findall(code_text))
+
+        candidates = set(self._ungated)
+        for token in tokens.intersection(self._token_index):
+            candidates.update(self._token_index[token])
+        # Lowercased tokens are only exact gates for case-insensitive patterns on ASCII text
+        if code_text.isascii():
+            lower_tokens = {token.lower() for token in tokens}
+            for token in lower_tokens.intersection(self._lower_token_index):
+                candidates.update(self._lower_token_index[token])
+        else:
+            lower_tokens = None
+            candidates.update(self._ignore_case)
+
+        matched = set()
+        for name in candidates:
+            regex, all_tokens, any_tokens, literals = self._patterns[name]
+            if lower_tokens is not None or name not in self._ignore_case:
+                gate_tokens = lower_tokens if name in self._ignore_case else tokens
+                if len(all_tokens) > 1 and not all(token in gate_tokens for token in all_tokens):
+                    continue
+            if literals and not all(literal in code_text for literal in literals):
+                continue
+            if regex.search(code_text):
+                matched.add(name)
+
+        code_lower = code_text.lower()
+        features = set()
+
+        # === Python ===
+        for name in ('py_def', 'py_class', 'py_decorator', 'py_except', 'py_print', 'py_lambda'):
+            if name in matched:
+                features.add(name)
+        if 'self.' in code_text or 'self,' in code_text:
+            features.add('py_self')
+        if '__init__' in code_text or '__name__' in code_text or '__main__' in code_text:
+            features.add('py_dunder')
+        if 'py_if' in matched or 'py_for_in' in matched:
+            features.add('py_control_flow')
+        if 'elif' in tokens:
+            features.add('py_elif')
+        if 'import ' in code_lower and ';' not in code_text:
+            features.add('py_import')
+        if 'from ' in code_lower and ' import ' in code_lower:
+            features.add('py_from_import')
+        if 'None' in tokens:
+            features.add('py_none')
+        if 'True' in tokens or 'False' in tokens:
+            features.add('py_bool')
+
+        # === JavaScript ===
+        for name in ('js_const', 'js_let', 'js_var', 'js_function', 'js_dom', 'js_require'):
+            if name in matched:
+                features.add(name)
+        if '=>' in code_text:
+            features.add('js_arrow')
+        if 'console.log' in code_text:
+            features.add('js_console_log')
+        if 'null' in tokens and 'undefined' in tokens:
+            features.add('js_null_undefined')
+        if '===' in code_text or '!==' in code_text:
+            features.add('js_strict_equality')
+
+        # === TypeScript ===
+        for name in ('ts_type_annotation', 'ts_interface', 'ts_type_alias'):
+            if name in matched:
+                features.add(name)
+        if '<T>' in code_text or '<T,' in code_text:
+            features.add('ts_generic')
+
+        # === Java ===
+        for name in ('java_public_class', 'java_main', 'java_sysout', 'java_private', 'java_annotation'):
+            if name in matched:
+                features.add(name)
+        if 'java_new' in matched and ';' in code_text:
+            features.add('java_new_statement')
+
+        # === C ===
+        for name in ('c_include_h', 'c_main', 'c_printf', 'c_scanf', 'c_alloc', 'c_struct'):
+            if name in matched:
+                features.add(name)
+
+        # === C++ ===
+        if 'cpp_include' in matched and '.h>' not in code_text:
+            features.add('cpp_modern_include')  # Modern C++ headers without .h
+        if 'std::' in code_text:
+            features.add('cpp_std')
+        if 'cout' in code_text or 'cin' in code_text:
+            features.add('cpp_stream')
+        if 'cpp_class_body' in matched and ';' in code_text:
+            features.add('cpp_class_statement')
+        if '::' in code_text:
+            features.add('cpp_scope')
+        for name in ('cpp_namespace', 'cpp_template'):
+            if name in matched:
+                features.add(name)
+
+        # === C# ===
+        for name in ('cs_using_system', 'cs_console', 'cs_async_task'):
+            if name in matched:
+                features.add(name)
+        if 'cpp_namespace' in matched and '{' in code_text:
+            features.add('cs_namespace_block')
+        if 'js_var' in matched and ';' in code_text:
+            features.add('cs_var_statement')
+
+        # === Go ===
+        for name in ('go_package', 'go_func', 'go_fmt', 'go_goroutine', 'go_defer'):
+            if name in matched:
+                features.add(name)
+        if ':=' in code_text:
+            features.add('go_short_declaration')
+
+        # === Rust ===
+        for name in ('rs_fn', 'rs_let_mut', 'rs_impl', 'rs_pub_fn'):
+            if name in matched:
+                features.add(name)
+        if 'println!' in code_text or 'vec!' in code_text:
+            features.add('rs_macro')
+        if 'rs_return_type' in matched and '::' in code_text:
+            features.add('rs_return_path')
+
+        # === HTML / CSS / SQL / Bash / YAML ===
+        for name in ('html_tag', 'html_close_tag', 'html_attribute',
+                     'css_rule', 'css_property', 'css_class_selector', 'css_id_selector',
+                     'sql_select', 'sql_insert', 'sql_create', 'sql_where', 'sql_join',
+                     'sh_shebang', 'sh_prompt', 'sh_command', 'sh_echo', 'sh_export', 'sh_variable',
+                     'yaml_key_only', 'yaml_list_key'):
+            if name in matched:
+                features.add(name)
+        if 'yaml_key_value' in matched and '{' not in code_text:
+            features.add('yaml_key_value_plain')
+
+        # === JSON ===
+        stripped = code_text.strip()
+        if (stripped.startswith('{') and stripped.endswith('}')) or \
+           (stripped.startswith('[') and stripped.endswith(']')):
+            if 'json_key' in matched:
+                features.add('json_document')
+
+        # === XML ===
+        if 'xml_declaration' in matched:
+            features.add('xml_declaration')
+        if 'xml_element' in matched and '<html' not in code_lower:
+            features.add('xml_document')
+
+        return features
+
+    def _best_language(self, scores: dict) -> str:
+        # Find language with highest score
+        max_score = max(scores.values())
+        if max_score < 5:
+            return ""  # Not confident enough
+
+        return max(scores, key=scores.get)
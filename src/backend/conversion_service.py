@@ -0,0 +1,525 @@
+"""
+Conversion Service Module
+Runs DocumentConverter jobs in supervised worker processes
+"""
+
+import sys
+import json
+import heapq
+import atexit
+import hashlib
+import itertools
+import threading
+import time
+import multiprocessing
+from multiprocessing.connection import wait as wait_connections
+from typing import Callable, Optional
+
+from utils.logger import get_logger
+from utils.memory import rss_mb
+
+logger = get_logger()
+
+# Job priorities, lower runs first
+PRIORITY_INTERACTIVE = 0  # The user waits on the result (exports)
+PRIORITY_NORMAL = 1  # Imports streaming into a tab
+PRIORITY_BACKGROUND = 2
+
+# Job kinds and how long a job of that kind may run (seconds)
+JOB_TIME_LIMITS = {
+    'pdf_import': 30 * 60,
+    'html_to_pdf': 5 * 60,
+    'markdown_to_pdf': 5 * 60,
+    'markdown_to_html': 60,
+}
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MEMORY_LIMIT_MB = 3072
+DEFAULT_IDLE_TIMEOUT = 5 * 60
+
+
+class ConversionJob:
+    """
+    Handle of a job submitted to the ConversionService
+
+    Identical submissions share one job: every submit() of the same kind and
+    parameters while the job is queued or running returns this handle.
+    Listeners are called on the service's supervisor thread; listeners added
+    late get the events so far replayed first.
+    """
+
+    def __init__(self, job_id: str, kind: str, params: dict, priority: int,
+                 time_limit: Optional[float]):
+        self.job_id = job_id
+        self.kind = kind
+        self.params = params
+        self.priority = priority
+        self.time_limit = time_limit
+        self.state = 'queued'  # 'queued', 'running' or 'done'
+        self.result = None  # (success, content, error) once done
+
+        self._holders = 1  # Submissions not withdrawn yet
+        self._cancelled = False
+        self._events = []
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def is_done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def subscribe(self, on_event: Optional[Callable[[dict], None]] = None,
+                  on_done: Optional[Callable[[tuple], None]] = None):
+        """
+        Listen to the job
+
+        Args:
+            on_event: Called with every progress event (PDF imports: one per page)
+            on_done: Called once with the (success, content, error) result
+        """
+        with self._lock:
+            events = list(self._events)
+            if not self.is_done:
+                self._listeners.append((on_event, on_done))
+        if on_event:
+            for event in events:
+                on_event(event)
+        if self.is_done and on_done:
+            on_done(self.result)
+
+    def cancel(self) -> bool:
+        """
+        Withdraw one submission of the job
+
+        The job itself is cancelled once every submission withdrew: a queued
+        job never starts, a running PDF import stops after the current page.
+
+        Returns:
+            True if the job was cancelled
+        """
+        with self._lock:
+            self._holders -= 1
+            if self._holders > 0 or self.is_done:
+                return False
+            self._cancelled = True
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job is done; returns False on timeout"""
+        return self._done.wait(timeout)
+
+    def _emit(self, event: dict):
+        with self._lock:
+            self._events.append(event)
+            listeners = list(self._listeners)
+        for on_event, _ in listeners:
+            if on_event:
+                on_event(event)
+
+    def _finish(self, success: bool, content: str, error: str):
+        with self._lock:
+            if self.is_done:
+                return
+            self.state = 'done'
+            self.result = (success, content, error)
+            self._events = []
+            listeners, self._listeners = self._listeners, []
+            self._done.set()
+        for _, on_done in listeners:
+            if on_done:
+                on_done(self.result)
+
+
+class _Worker:
+    """One worker process and the job it is running"""
+
+    def __init__(self, context):
+        self.cancel_event = context.Event()
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_connection, self.cancel_event),
+            name='saekim-conversion-worker',
+            daemon=False  # PDF imports may start page worker processes
+        )
+        self.process.start()
+        child_connection.close()
+
+        self.job = None
+        self.started_at = 0.0
+        self.idle_since = time.monotonic()
+        self.peak_rss_mb = 0.0
+
+    def start_job(self, job: ConversionJob):
+        self.cancel_event.clear()
+        self.job = job
+        self.started_at = time.monotonic()
+        self.peak_rss_mb = 0.0
+        self.connection.send((job.job_id, job.kind, job.params))
+
+    def stop(self, kill: bool = False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except (OSError, ValueError):
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class ConversionService:
+    """
+    Supervised worker processes for conversion jobs
+
+    Conversions run outside the GUI process, so a malformed or huge PDF can
+    exhaust a worker's memory or crash it without taking the editor down.
+    A supervisor thread:
+    - Starts queued jobs by priority (then submission order) on up to
+      max_workers worker processes, started on demand.
+    - Deduplicates identical requests: submitting the same kind and
+      parameters while such a job is queued or running returns that job.
+    - Enforces per-job limits: a worker whose resident memory exceeds
+      memory_limit_mb, or whose job runs longer than its time limit, is
+      killed and its job fails.
+    - Replaces crashed and killed workers with fresh processes; only the job
+      that was running fails.
+    - Stops workers that have been idle for idle_timeout seconds.
+
+    Results are delivered through ConversionJob listeners on the supervisor
+    thread, so callers never block on a conversion.
+    """
+
+    POLL_INTERVAL = 0.2  # Seconds between memory/time checks of running jobs
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 memory_limit_mb: float = DEFAULT_MEMORY_LIMIT_MB,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.max_workers = max(1, max_workers)
+        self.memory_limit_mb = memory_limit_mb
+        self.idle_timeout = idle_timeout
+
+        # Spawned, not forked: the GUI process runs Qt and other threads
+        self._context = multiprocessing.get_context('spawn')
+        self._queue = []  # heap of (priority, sequence, job)
+        self._sequence = itertools.count()
+        self._job_ids = itertools.count(1)
+        self._active = {}  # request key -> queued or running job
+        self._workers = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._memory_unknown_logged = False
+
+    def submit(self, kind: str, params: dict, priority: int = PRIORITY_NORMAL,
+               time_limit: Optional[float] = None) -> ConversionJob:
+        """
+        Queue a conversion job
+
+        Args:
+            kind: 'pdf_import' (DocumentConverter.iter_pdf_to_markdown),
+                  'html_to_pdf', 'markdown_to_pdf' or 'markdown_to_html'
+            params: Keyword arguments of the converter method (picklable)
+            priority: PRIORITY_INTERACTIVE, PRIORITY_NORMAL or PRIORITY_BACKGROUND
+            time_limit: Seconds the job may run (default: JOB_TIME_LIMITS)
+
+        Returns:
+            The job, shared with identical submissions still in flight
+
+        Raises:
+            ValueError: If the job kind is unknown
+            RuntimeError: If the service has been shut down
+        """
+        if kind not in JOB_TIME_LIMITS:
+            raise ValueError(f"Unknown conversion job: {kind}")
+
+        key = self._request_key(kind, params)
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("Conversion service has been shut down")
+
+            job = self._active.get(key)
+            if job is not None and not job.is_cancelled:
+                with job._lock:
+                    job._holders += 1
+                if priority < job.priority and job.state == 'queued':
+                    # The stale heap entry is skipped when popped
+                    job.priority = priority
+                    heapq.heappush(self._queue, (priority, next(self._sequence), job))
+                logger.info(f"Conversion job {job.job_id} ({kind}) requested again, sharing it")
+                return job
+
+            job = ConversionJob(str(next(self._job_ids)), kind, params, priority,
+                                time_limit if time_limit is not None else JOB_TIME_LIMITS[kind])
+            self._active[key] = job
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+            self._ensure_thread()
+            self._condition.notify()
+
+        logger.info(f"Conversion job {job.job_id} ({kind}) queued with priority {priority}")
+        return job
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the service: queued jobs fail, running jobs are killed
+
+        Args:
+            wait: Wait for the supervisor thread and the workers to exit
+        """
+        with self._condition:
+            if self._stopping:
+                return
+            self._stopping = True
+            self._condition.notify()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    @staticmethod
+    def _request_key(kind: str, params: dict) -> str:
+        source = json.dumps([kind, params], sort_keys=True, default=str)
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._supervise, name='conversion-service',
+                                            daemon=True)
+            self._thread.start()
+
+    def _supervise(self):
+        try:
+            while True:
+                with self._condition:
+                    if self._stopping:
+                        break
+                    assignments = self._take_jobs()
+                    busy = [worker for worker in self._workers if worker.job is not None]
+                    if not busy and not assignments:
+                        self._stop_idle_workers()
+                        self._condition.wait(timeout=self.idle_timeout if self._workers else None)
+                        continue
+
+                # Workers are started and fed outside the lock, so submit() never waits
+                for worker, job in assignments:
+                    self._start_job(worker, job)
+
+                busy = [worker for worker in self._workers if worker.job is not None]
+                ready = wait_connections([worker.connection for worker in busy],
+                                         timeout=self.POLL_INTERVAL)
+                for worker in busy:
+                    if worker.connection in ready:
+                        self._receive(worker)
+                    if worker.job is not None:
+                        self._check_limits(worker)
+        except Exception:
+            logger.exception("Conversion service stopped unexpectedly")
+        finally:
+            self._stop_all()
+
+    def _take_jobs(self) -> list:
+        """
+        Pick the queued jobs that can start now (called with the lock held)
+
+        Returns:
+            List of (idle worker or None for a new worker, job)
+        """
+        idle = [worker for worker in self._workers if worker.job is None]
+        new_workers = self.max_workers - len(self._workers)
+        assignments = []
+
+        while self._queue and (idle or new_workers > 0):
+            priority, _, job = heapq.heappop(self._queue)
+            if job.state != 'queued' or priority != job.priority:
+                continue  # Stale entry of a re-prioritized job
+            if job.is_cancelled:
+                self._complete(job, False, "", "Cancelled")
+                continue
+
+            job.state = 'running'
+            if idle:
+                worker = idle.pop()
+                worker.job = job  # Reserved until started
+            else:
+                worker = None
+                new_workers -= 1
+            assignments.append((worker, job))
+
+        return assignments
+
+    def _start_job(self, worker: Optional[_Worker], job: ConversionJob):
+        try:
+            if worker is None:
+                worker = _Worker(self._context)
+                with self._condition:
+                    self._workers.append(worker)
+                logger.info(f"Conversion worker {worker.process.pid} started")
+            worker.start_job(job)
+        except Exception as e:
+            logger.error(f"Failed to start conversion job {job.job_id}: {e}")
+            with self._condition:
+                if worker is not None:
+                    worker.job = None
+                self._complete(job, False, "", f"Conversion could not be started: {e}")
+            return
+        logger.info(f"Conversion job {job.job_id} ({job.kind}) started in worker {worker.process.pid}")
+
+    def _receive(self, worker: _Worker):
+        job = worker.job
+        try:
+            message = worker.connection.recv()
+        except (EOFError, OSError):
+            worker.process.join(timeout=1)
+            self._replace_worker(worker, f"Conversion worker crashed "
+                                         f"(exit code {worker.process.exitcode})")
+            return
+
+        kind, payload = message
+        if kind == 'event':
+            job._emit(payload)
+            return
+
+        success, content, error = payload
+        elapsed = time.monotonic() - worker.started_at
+        logger.info(f"Conversion job {job.job_id} ({job.kind}) finished in {elapsed:.1f}s, "
+                    f"worker peak RSS {worker.peak_rss_mb:.0f} MB")
+        with self._condition:
+            worker.job = None
+            worker.idle_since = time.monotonic()
+            self._complete(job, success, content, error)
+
+    def _check_limits(self, worker: _Worker):
+        job = worker.job
+        if job.is_cancelled:
+            worker.cancel_event.set()  # PDF imports stop after the current page
+
+        if not worker.process.is_alive():
+            # Died before its last message could be read
+            if not worker.connection.poll():
+                self._replace_worker(worker, f"Conversion worker crashed "
+                                             f"(exit code {worker.process.exitcode})")
+            return
+
+        elapsed = time.monotonic() - worker.started_at
+        if job.time_limit and elapsed > job.time_limit:
+            self._replace_worker(worker, f"Conversion timed out after {job.time_limit:g}s")
+            return
+
+        memory = rss_mb(worker.process.pid)
+        if memory <= 0:
+            if not self._memory_unknown_logged:
+                logger.warning("Worker memory cannot be measured here; memory limit not enforced")
+                self._memory_unknown_logged = True
+            return
+        worker.peak_rss_mb = max(worker.peak_rss_mb, memory)
+        if self.memory_limit_mb and memory > self.memory_limit_mb:
+            self._replace_worker(worker, f"Conversion exceeded the memory limit "
+                                         f"({memory:.0f} MB > {self.memory_limit_mb:.0f} MB)")
+
+    def _replace_worker(self, worker: _Worker, error: str):
+        """Kill a worker and fail its job; a new worker starts with the next job"""
+        job = worker.job
+        logger.error(f"Conversion job {job.job_id} ({job.kind}) failed: {error}")
+        worker.stop(kill=True)
+        with self._condition:
+            worker.job = None
+            self._workers.remove(worker)
+            self._complete(job, False, "", error)
+
+    def _complete(self, job: ConversionJob, success: bool, content: str, error: str):
+        """Finish a job and forget its request key (called with the lock held)"""
+        for key, active_job in list(self._active.items()):
+            if active_job is job:
+                del self._active[key]
+        if job.is_cancelled and not error:
+            success, error = False, "Cancelled"
+        job._finish(success, content, error)
+
+    def _stop_idle_workers(self):
+        now = time.monotonic()
+        for worker in list(self._workers):
+            if worker.job is None and now - worker.idle_since >= self.idle_timeout:
+                logger.info(f"Conversion worker {worker.process.pid} stopped after being idle")
+                worker.stop()
+                self._workers.remove(worker)
+
+    def _stop_all(self):
+        with self._condition:
+            self._stopping = True
+            queued = [job for _, _, job in self._queue]
+            self._queue = []
+            workers, self._workers = self._workers, []
+
+        for worker in workers:
+            job = worker.job
+            worker.stop(kill=job is not None)
+            if job is not None:
+                with self._condition:
+                    self._complete(job, False, "", "Cancelled")
+        for job in queued:
+            with self._condition:
+                self._complete(job, False, "", "Cancelled")
+
+
+def _worker_main(connection, cancel_event):
+    """Worker process entry point: run jobs until the service says stop"""
+    from backend.converter import DocumentConverter, CancellationToken
+
+    converter = DocumentConverter()
+    cancel_token = CancellationToken(cancel_event)
+
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break  # The GUI process is gone
+        if message is None:
+            break
+
+        job_id, kind, params = message
+        try:
+            if kind == 'pdf_import':
+                for event in converter.iter_pdf_to_markdown(cancel_token=cancel_token, **params):
+                    connection.send(('event', event))
+                result = (True, "", "")
+            else:
+                success, error = getattr(converter, kind)(**params)
+                result = (success, "", error)
+
+        except MemoryError:
+            connection.send(('done', (False, "", "Conversion ran out of memory")))
+            sys.exit(1)  # Nothing in this process can be trusted any more
+
+        except Exception as e:
+            if kind == 'pdf_import':
+                error = f"PDF to Markdown conversion failed: {str(e)}"
+            else:
+                error = f"Conversion failed: {str(e)}"
+            logger.error(error)
+            result = (False, "", error)
+
+        connection.send(('done', result))
+
+    # Close the export browser kept warm between jobs
+    converter.close()
+
+
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+
+def get_conversion_service() -> ConversionService:
+    """The application-wide conversion service, created on first use"""
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = ConversionService()
+            atexit.register(_shared_service.shutdown)
+        return _shared_service
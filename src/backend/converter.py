@@ -4,38 +4,531 @@ Handles conversion between different document formats (MD, PDF, DOCX, HTML)
 """
 
 import os
-import asyncio
-import tempfile
+import re
+import time
+import hashlib
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Tuple, Optional
 
+from backend.async_loop import AsyncLoopThread
+from backend.browser_check import BrowserCheck
+from backend.code_detection import CodeLineClassifier, CodeLanguageDetector
+from backend.image_store import DEFAULT_OBJECTS_DIR, ImageStore
+from backend.margin_detection import RepeatedMarginDetector
+from backend.markdown_writer import MarkdownStreamWriter
+from backend.pdf_assets import asset_url
+from backend.pdf_browser import PdfBrowserService
+from backend.pdf_import_cache import PdfImportCache
+from backend.pdf_import_estimate import PdfImportHistory, classify_page, resolve_page_range
+from backend.pdf_import_profiles import (
+    DEFAULT_PDF_IMPORT_PROFILE, PdfImportTimings, StageTimer, get_pdf_import_profile
+)
 from utils.logger import get_logger
+from utils.memory import peak_rss_mb
 
 logger = get_logger()
 
+# Version of the PDF → Markdown output; bump it whenever the output changes
+# so that cached imports are invalidated
+PDF_IMPORT_VERSION = "4"
 
-def _run_async(coro):
-    """Run async coroutine in sync context"""
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is already running (e.g., in Qt), create a new one
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, coro)
-                return future.result()
-        else:
-            return loop.run_until_complete(coro)
-    except RuntimeError:
-        return asyncio.run(coro)
+# Table finders for the PyMuPDF import: PyMuPDF's own finder works on the
+# already open page, pdfplumber parses the file a second time
+PDF_TABLE_ENGINES = ('pymupdf', 'pdfplumber')
+
+# Indirect object reference in a PDF object source, e.g. "12 0 R"
+_PDF_OBJECT_REF = re.compile(r'\b(\d+) \d+ R\b')
+
+
+class CancellationToken:
+    """Thread-safe flag used to cancel a running PDF import"""
+
+    def __init__(self, event=None):
+        # A multiprocessing.Event lets another process cancel the import
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        """Request cancellation; the import stops after the current page"""
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class PdfImportSession:
+    """
+    Per-import PDF document session
+
+    Opens the PyMuPDF document and the pdfplumber handle once per import and
+    shares them across all per-page stages (text, images, tables), instead of
+    re-parsing the whole file for every page. The pdfplumber handle is only
+    opened when pdfplumber is used for tables.
+    Page-level objects are released as soon as a page has been processed.
+    The import profile decides which per-page stages run.
+    """
+
+    def __init__(self, pdf_path, table_engine: str = 'pymupdf',
+                 profile: str = DEFAULT_PDF_IMPORT_PROFILE):
+        if table_engine not in PDF_TABLE_ENGINES:
+            raise ValueError(f"Unknown table engine: {table_engine}")
+
+        self.pdf_path = Path(pdf_path)
+        self.table_engine = table_engine
+        self.profile = get_pdf_import_profile(profile)
+        self._doc = None
+        self._plumber_pdf = None
+        self._plumber_unavailable = False
+        self.font_table = PdfFontTable()
+
+    @property
+    def doc(self):
+        """PyMuPDF document, opened on first access"""
+        if self._doc is None:
+            import fitz  # PyMuPDF
+            self._doc = fitz.open(self.pdf_path)
+        return self._doc
+
+    @property
+    def page_count(self) -> int:
+        return len(self.doc)
+
+    def page_fingerprint(self, page_idx: int, salt: str = "") -> str:
+        """
+        Fingerprint everything the conversion of a page depends on
+
+        Covers the page geometry, its content streams and every object it
+        references (fonts, images, form XObjects) by xref number and content,
+        so an unchanged page keeps its fingerprint across PDF revisions.
+
+        Args:
+            page_idx: 0-based page index
+            salt: Conversion settings the page result depends on
+        """
+        doc = self.doc
+        page = doc[page_idx]
+
+        digest = hashlib.sha256(salt.encode('utf-8'))
+        digest.update(f"{tuple(page.rect)}|{page.rotation}|".encode('utf-8'))
+        digest.update(page.read_contents())
+
+        xrefs = {font[0] for font in page.get_fonts(full=True)}
+        xrefs.update(image[0] for image in page.get_images(full=True))
+        xrefs.update(xobject[0] for xobject in page.get_xobjects())
+        for xref in sorted(xrefs):
+            if xref <= 0:
+                continue
+            digest.update(f"|{xref}|".encode('utf-8'))
+            digest.update(doc.xref_object(xref, compressed=True).encode('utf-8'))
+            if doc.xref_is_stream(xref):
+                digest.update(doc.xref_stream_raw(xref))
+
+        return digest.hexdigest()
+
+    def image_source_digest(self, xref: int) -> str:
+        """
+        Digest of an image object and everything it references
+
+        Object numbers are left out, so identical images stored under
+        different xrefs (pages merged from separate files, generators that do
+        not reuse objects) get the same digest without decoding either.
+        """
+        doc = self.doc
+        digest = hashlib.sha256()
+        pending = [xref]
+        seen = set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+
+            source = doc.xref_object(current, compressed=True)
+            digest.update(_PDF_OBJECT_REF.sub('R', source).encode('utf-8'))
+            if doc.xref_is_stream(current):
+                digest.update(doc.xref_stream_raw(current))
+            xref_count = doc.xref_length()
+            pending.extend(ref for ref in map(int, reversed(_PDF_OBJECT_REF.findall(source)))
+                           if 0 < ref < xref_count)
+
+        return digest.hexdigest()
+
+    def plumber_page(self, page_idx: int):
+        """
+        Get a pdfplumber page from the shared handle
+
+        Returns:
+            pdfplumber Page, or None if pdfplumber is unavailable
+        """
+        if self._plumber_unavailable:
+            return None
+
+        if self._plumber_pdf is None:
+            try:
+                import pdfplumber
+            except ImportError:
+                self._plumber_unavailable = True
+                return None
+            self._plumber_pdf = pdfplumber.open(self.pdf_path)
+
+        pages = self._plumber_pdf.pages
+        if page_idx < len(pages):
+            return pages[page_idx]
+        return None
+
+    def release_plumber_page(self, page):
+        """Drop cached layout objects of a processed pdfplumber page"""
+        if page is not None:
+            page.flush_cache()
+
+    def close(self):
+        """Close all document handles"""
+        if self._plumber_pdf is not None:
+            self._plumber_pdf.close()
+            self._plumber_pdf = None
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+
+# Normalized once; matched as substrings of normalized font names
+MONOSPACE_FONT_NAMES = tuple(name.replace(' ', '') for name in [
+    # Common code fonts
+    'courier', 'consolas', 'monaco', 'menlo', 'inconsolata',
+    'source code', 'sourcecodepro', 'fira code', 'firacode',
+    'fira mono', 'firamono', 'dejavu mono', 'dejavumono',
+    'liberation mono', 'liberationmono', 'droid mono', 'droidmono',
+    'ubuntu mono', 'ubuntumono', 'roboto mono', 'robotomono',
+    'jetbrains mono', 'jetbrainsmono', 'cascadia', 'hack',
+    'mono', 'fixed', 'terminal', 'andale',
+    # Korean fonts
+    'd2coding', 'd2 coding', 'nanum gothic coding', 'nanumgothiccoding',
+    '나눔고딕코딩', 'malgun gothic coding',
+    # PDF embedded fonts often have weird names
+    'cour', 'cmtt', 'cmsy', 'lmtt',  # TeX/LaTeX fonts
+    'nixie', 'ocr', 'typewriter',
+])
+
+
+def is_monospace_font_name(font_name: str) -> bool:
+    """Check if a font name looks like a monospace/code font"""
+    font_lower = font_name.lower().replace(' ', '').replace('-', '').replace('_', '')
+    return any(mono in font_lower for mono in MONOSPACE_FONT_NAMES)
+
+
+class PdfFontTable:
+    """
+    Per-document font classification table
+
+    A document uses only a handful of distinct fonts, so every (font name,
+    span flags) pair is classified once as monospace/bold/italic and spans
+    are then resolved with a dictionary lookup. The PyMuPDF span flags are
+    used first; font name matching covers fonts whose flags are not set.
+    """
+
+    # PyMuPDF span flag bits
+    FLAG_ITALIC = 2
+    FLAG_MONOSPACED = 8
+    FLAG_BOLD = 16
+
+    def __init__(self):
+        self._styles = {}
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, font_name: str, flags: int) -> tuple:
+        """
+        Classify the font of a span
+
+        Returns:
+            (is_monospace, is_bold, is_italic)
+        """
+        key = (font_name, flags)
+        style = self._styles.get(key)
+        if style is not None:
+            self.hits += 1
+            return style
+
+        self.misses += 1
+        font_lower = font_name.lower()
+        style = (
+            bool(flags & self.FLAG_MONOSPACED) or is_monospace_font_name(font_lower),
+            bool(flags & self.FLAG_BOLD) or "bold" in font_lower or "black" in font_lower,
+            bool(flags & self.FLAG_ITALIC) or "italic" in font_lower or "oblique" in font_lower,
+        )
+        self._styles[key] = style
+        logger.debug(f"Font classified: {font_name} (flags={flags}) -> "
+                     f"monospace={style[0]}, bold={style[1]}, italic={style[2]}")
+        return style
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CodeBlockAccumulator:
+    """
+    Code lines collected across text blocks and pages
+
+    Lines are appended in place while a code block is open and formatted
+    once when it closes, so a listing spread over many blocks and pages is
+    built in linear time. Shared by the PyMuPDF and pdfplumber import paths.
+    """
+
+    def __init__(self, format_code_block):
+        """
+        Args:
+            format_code_block: Callable turning a list of code lines into markdown
+        """
+        self.format_code_block = format_code_block
+        self.lines = []
+        self.in_code_block = False
+
+    def add(self, line: str):
+        """Append a code line, opening a code block if none is open"""
+        self.in_code_block = True
+        self.lines.append(line)
+
+    def add_blank(self):
+        """Keep an empty line, but only inside an open code block"""
+        if self.in_code_block:
+            self.lines.append("")
+
+    def flush(self) -> str:
+        """
+        Close the open code block
+
+        Returns:
+            Markdown of the code block, or "" if no code was collected
+        """
+        code = self.format_code_block(self.lines) if self.lines else ""
+        self.lines = []
+        self.in_code_block = False
+        return code
+
+
+class PdfPageAssembler:
+    """
+    Deterministic merge stage for PyMuPDF page results
+
+    Replays extracted pages strictly in page order and owns all cross-page
+    state: code blocks that continue across pages, repeated header/footer
+    blocks that are only kept when they continue an open code block, and duplicate
+    images by xref or by content. Pages must be observed by margin_detector before they
+    are added (see RepeatedMarginDetector.lookahead()).
+    Page results may come from the current process or from worker processes;
+    the output is the same either way.
+    """
+
+    def __init__(self, converter, session: PdfImportSession, images_dir: Path,
+                 doc_name: str, last_page: int):
+        self.converter = converter
+        self.session = session
+        self.images_dir = images_dir
+        self.doc_name = doc_name
+        self.last_page = last_page  # Last page of the imported range
+
+        # Merge-stage timings of the page being added
+        self.timer = StageTimer()
+
+        # State for cross-page code block detection
+        self.code_block = CodeBlockAccumulator(
+            lambda code_lines: converter._format_code_block_for_profile(
+                code_lines, session.profile, self.timer
+            )
+        )
+
+        # Running headers/footers recognized across pages
+        self.margin_detector = RepeatedMarginDetector()
+
+        # Track processed image xrefs to avoid duplicates (logos, watermarks, etc.)
+        self.processed_image_xrefs = set()
+        self.extracted_images = []
+
+        # Images already written under another xref, looked up before decoding.
+        # Only images of the same stream length and size are ever hashed.
+        self._image_paths_by_size = {}  # (length, width, height) -> [(xref, path)]
+        self._image_digests = {}  # xref -> source digest
+
+        # Image files are written on a background thread, each unique image once
+        self.image_store = ImageStore(images_dir, converter.image_objects_dir, background=True)
+
+    def add_page(self, page_result: dict) -> list:
+        """
+        Merge one extracted page
+
+        Image extraction and code language scoring are timed in self.timer,
+        which is reset for every page.
+
+        Returns:
+            List of markdown chunks produced by this page
+        """
+        self.timer = StageTimer()
+        markdown_lines = []
+        page_num = page_result['page_num']
+
+        for item in page_result['items']:
+            # Skip repeated headers/footers unless they continue an open code block
+            if self.margin_detector.is_repeated(item['margin_keys']) and not (
+                    self.code_block.in_code_block
+                    and any(line[1] for line in item.get('lines', ()))):
+                self.margin_detector.blocks_removed += 1
+                continue
+
+            if item['type'] == 'text':
+                # Process block with code detection
+                block_output = self.converter._process_text_block_with_state(
+                    item['lines'], self.code_block
+                )
+                if block_output:
+                    markdown_lines.append(block_output)
+
+            elif item['type'] == 'image':
+                # Get image xref to check for duplicates
+                img_xref = item['xref']
+
+                # Skip duplicate images (logos, watermarks that appear on every page)
+                if img_xref != 0 and img_xref in self.processed_image_xrefs:
+                    logger.debug(f"Skipping duplicate image xref: {img_xref}")
+                    continue
+
+                # Mark this xref as processed
+                if img_xref != 0:
+                    self.processed_image_xrefs.add(img_xref)
+
+                # Flush code buffer before image
+                self._flush_code_block(markdown_lines)
+
+                # Extract image, unless the same image was written before
+                with self.timer.stage('images'):
+                    img_result = self._find_duplicate_image(img_xref)
+                    if img_result is None:
+                        img_result = self.converter._extract_image_from_block(
+                            self.session.doc, item, page_num, len(self.extracted_images) + 1,
+                            self.images_dir, self.doc_name, self.image_store
+                        )
+                        self._remember_image(img_xref, img_result)
+                if img_result:
+                    self.extracted_images.append(img_result)
+                    markdown_lines.append(f"\n![Image {len(self.extracted_images)}]({img_result})\n")
+
+        page_tables = page_result['tables']
+        if page_tables:
+            # Flush code buffer before tables
+            self._flush_code_block(markdown_lines)
+
+            for table_md in page_tables:
+                markdown_lines.append(f"\n{table_md}\n")
+
+        # Add page separator (but not if we're in a code block that continues)
+        if page_num < self.last_page and not self.code_block.in_code_block:
+            markdown_lines.append("\n---\n")
+
+        return markdown_lines
+
+    def finish(self) -> list:
+        """Flush the code block still open at the end of the imported pages"""
+        # All image files are on disk once the last page is out
+        with self.timer.stage('images'):
+            self.image_store.close()
+
+        code = self.code_block.flush()
+        return [code] if code else []
+
+    def close(self):
+        """Wait for pending image writes (also after a cancelled import)"""
+        self.image_store.close()
+
+    def _image_size_key(self, xref: int) -> Optional[tuple]:
+        doc = self.session.doc
+        key = tuple(doc.xref_get_key(xref, name)[1] for name in ('Length', 'Width', 'Height'))
+        return key if all(key) else None
+
+    def _image_digest(self, xref: int) -> str:
+        digest = self._image_digests.get(xref)
+        if digest is None:
+            digest = self._image_digests[xref] = self.session.image_source_digest(xref)
+        return digest
+
+    def _find_duplicate_image(self, xref: int) -> Optional[str]:
+        """Markdown path of an identical image extracted under another xref"""
+        if xref == 0:
+            return None
+        candidates = self._image_paths_by_size.get(self._image_size_key(xref))
+        if not candidates:
+            return None
+        for other_xref, path in candidates:
+            if self._image_digest(other_xref) == self._image_digest(xref):
+                logger.debug(f"Image xref {xref} is identical to xref {other_xref}")
+                return path
+        return None
+
+    def _remember_image(self, xref: int, path: Optional[str]):
+        size_key = self._image_size_key(xref) if path and xref != 0 else None
+        if size_key is not None:
+            self._image_paths_by_size.setdefault(size_key, []).append((xref, path))
+
+    def _flush_code_block(self, markdown_lines: list):
+        if self.code_block.in_code_block:
+            code = self.code_block.flush()
+            if code:
+                markdown_lines.append(code)
+
+
+def _extract_pdf_pages(pdf_path: str, page_nums: list, table_engine: str = 'pymupdf',
+                       profile: str = DEFAULT_PDF_IMPORT_PROFILE) -> list:
+    """Process pool entry point: extract the given pages (1-based) of a PDF"""
+    converter = DocumentConverter()
+    with PdfImportSession(pdf_path, table_engine, profile) as session:
+        doc = session.doc
+        return [
+            converter._extract_pdf_page(session, doc[page_num - 1], page_num)
+            for page_num in page_nums
+        ]
 
 
 class DocumentConverter:
     """Converts documents between various formats"""
 
     def __init__(self):
-        self.temp_dir = Path(tempfile.gettempdir()) / 'saekim_temp'
-        self.temp_dir.mkdir(exist_ok=True)
+        # Compiled once per converter, memoizes repeated lines
+        self.code_classifier = CodeLineClassifier()
+        self.language_detector = CodeLanguageDetector()
+
+        # Persistent cache of finished PDF imports (None disables it)
+        self.import_cache = PdfImportCache()
+
+        # Hard-link index of written images, shared across folders (None disables it)
+        self.image_objects_dir = DEFAULT_OBJECTS_DIR
+
+        # Throughput of past PDF imports, for import estimates (None disables recording)
+        self.import_history = PdfImportHistory()
+
+        # Event loop thread for the converter's coroutines (PDF exports)
+        self.async_loop = AsyncLoopThread()
+
+        # Headless Chromium kept running between PDF exports, bound to async_loop
+        self.pdf_browser = PdfBrowserService()
+        self.browser_check = BrowserCheck()
+
+    def close(self):
+        """Close the PDF browser and stop the event loop thread"""
+        if self.async_loop.is_running:
+            try:
+                self.async_loop.run(self.pdf_browser.close(), timeout=10)
+            except Exception as e:
+                logger.warning(f"Failed to close PDF browser: {e}")
+        self.async_loop.stop()
 
     def markdown_to_pdf(self, markdown_content: str, output_path: str,
                         title: str = "Document") -> Tuple[bool, str]:
@@ -48,7 +541,8 @@ class DocumentConverter:
             title: Document title
 
         Returns:
-            Tuple of (success, error_message)
+            Tuple of (success, message): the error, or a warning about
+            remote images left out of the PDF
         """
         try:
             # Convert markdown to HTML first
@@ -61,24 +555,22 @@ class DocumentConverter:
             logger.error(f"Error initializing converter: {e}")
 
     def check_playwright_browser(self) -> bool:
-        """Check if Playwright browsers are installed"""
+        """
+        Check if the Playwright browser is installed and launches
+
+        Probes the installation on disk; the browser is only launched when
+        the remembered result does not cover the installation or the last
+        export failed (see BrowserCheck). A launched browser stays warm for
+        the export that follows.
+        """
+        return self.browser_check.is_available(self._launch_playwright_browser)
+
+    def _launch_playwright_browser(self) -> bool:
         try:
-            import sys
-            # If frozen, check if the bundled browser exists
-            if getattr(sys, 'frozen', False):
-                bundled_browser_path = Path(sys._MEIPASS) / 'ms-playwright' / 'chromium-1194' / 'chrome-win' / 'chrome.exe'
-                if bundled_browser_path.exists():
-                    return True
-
-            # Standard check
-            from playwright.sync_api import sync_playwright
-            with sync_playwright() as p:
-                try:
-                    p.chromium.launch(executable_path=None)
-                except Exception:
-                    return False
+            self.async_loop.run(self.pdf_browser.warm_up(), timeout=60)
             return True
-        except Exception:
+        except Exception as e:
+            logger.warning(f"Playwright browser failed to launch: {e}")
             return False
 
     def install_playwright_browser(self) -> Tuple[bool, str]:
@@ -111,7 +603,7 @@ class DocumentConverter:
             return False, error_msg
 
     def markdown_to_pdf(self, markdown_content: str, output_path: str,
-                        title: str = "Document") -> Tuple[bool, str]:
+                        title: str = "Document", base_dir: Optional[str] = None) -> Tuple[bool, str]:
         """
         Convert Markdown to PDF using Playwright
 
@@ -119,25 +611,49 @@ class DocumentConverter:
             markdown_content: Markdown text
             output_path: Path to save PDF
             title: Document title
+            base_dir: Folder relative image paths resolve against (default: the PDF's folder)
 
         Returns:
-            Tuple of (success, error_message)
+            Tuple of (success, message): the error, or a warning about
+            remote images left out of the PDF
         """
+        return self.markdown_to_pdf_async(markdown_content, output_path, title, base_dir).result()
+
+    def markdown_to_pdf_async(self, markdown_content: str, output_path: str,
+                              title: str = "Document", base_dir: Optional[str] = None,
+                              timeout: Optional[float] = None) -> Future:
+        """
+        Start a Markdown to PDF conversion on the converter's event loop
+
+        Args:
+            markdown_content: Markdown text
+            output_path: Path to save PDF
+            title: Document title
+            base_dir: Folder relative image paths resolve against (default: the PDF's folder)
+            timeout: Seconds after which the conversion is cancelled (None: no limit)
+
+        Returns:
+            Future of (success, message) as above; fails with TimeoutError after timeout
+        """
+        return self.async_loop.submit(
+            self._async_markdown_to_pdf(markdown_content, output_path, title, base_dir), timeout
+        )
+
+    async def _async_markdown_to_pdf(self, markdown_content: str, output_path: str,
+                                     title: str, base_dir: Optional[str]) -> Tuple[bool, str]:
         try:
             # Convert markdown to HTML first
             html_content = self._markdown_to_html(markdown_content, title)
-
-            # Use Playwright to generate PDF
-            return self._generate_pdf_with_playwright(html_content, output_path)
-
         except Exception as e:
-
             error_msg = f"PDF conversion failed: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
 
+        # Use Playwright to generate PDF
+        return await self._async_generate_pdf(html_content, output_path, base_dir)
+
     def html_to_pdf(self, rendered_html: str, output_path: str,
-                    title: str = "Document") -> Tuple[bool, str]:
+                    title: str = "Document", base_dir: Optional[str] = None) -> Tuple[bool, str]:
         """
         Convert rendered HTML to PDF using Playwright
         This method preserves all formatting including Mermaid diagrams and KaTeX equations
@@ -146,22 +662,47 @@ class DocumentConverter:
             rendered_html: Fully rendered HTML from frontend
             output_path: Path to save PDF
             title: Document title
+            base_dir: Folder relative image paths resolve against (default: the PDF's folder)
 
         Returns:
-            Tuple of (success, error_message)
+            Tuple of (success, message): the error, or a warning about
+            remote images left out of the PDF
+        """
+        return self.html_to_pdf_async(rendered_html, output_path, title, base_dir).result()
+
+    def html_to_pdf_async(self, rendered_html: str, output_path: str,
+                          title: str = "Document", base_dir: Optional[str] = None,
+                          timeout: Optional[float] = None) -> Future:
+        """
+        Start a rendered HTML to PDF conversion on the converter's event loop
+
+        Args:
+            rendered_html: Fully rendered HTML from frontend
+            output_path: Path to save PDF
+            title: Document title
+            base_dir: Folder relative image paths resolve against (default: the PDF's folder)
+            timeout: Seconds after which the conversion is cancelled (None: no limit)
+
+        Returns:
+            Future of (success, message) as above; fails with TimeoutError after timeout
         """
+        return self.async_loop.submit(
+            self._async_html_to_pdf(rendered_html, output_path, title, base_dir), timeout
+        )
+
+    async def _async_html_to_pdf(self, rendered_html: str, output_path: str,
+                                 title: str, base_dir: Optional[str]) -> Tuple[bool, str]:
         try:
             # Wrap the rendered HTML in a complete HTML document with all dependencies
             full_html = self._create_full_html_for_pdf(rendered_html, title)
-
-            # Use Playwright to generate PDF
-            return self._generate_pdf_with_playwright(full_html, output_path)
-
         except Exception as e:
             error_msg = f"PDF conversion from HTML failed: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
 
+        # Use Playwright to generate PDF
+        return await self._async_generate_pdf(full_html, output_path, base_dir)
+
     def _create_full_html_for_pdf(self, rendered_html: str, title: str) -> str:
         """Create a complete HTML document for PDF generation with all necessary styles"""
         return f"""<!DOCTYPE html>
@@ -169,7 +710,7 @@ class DocumentConverter:
 <head>
     <meta charset="UTF-8">
     <title>{title}</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.css">
+    <link rel="stylesheet" href="{asset_url('katex/katex.min.css')}">
     <style>
         {self._get_pdf_css()}
     </style>
@@ -183,12 +724,13 @@ class DocumentConverter:
 
     def _generate_pdf_with_playwright(self, html_content: str, output_path: str) -> Tuple[bool, str]:
         """Generate PDF from HTML using Playwright"""
-        return _run_async(self._async_generate_pdf(html_content, output_path))
+        return self.async_loop.run(self._async_generate_pdf(html_content, output_path))
 
-    async def _async_generate_pdf(self, html_content: str, output_path: str) -> Tuple[bool, str]:
-        """Async implementation of PDF generation using Playwright"""
+    async def _async_generate_pdf(self, html_content: str, output_path: str,
+                                  base_dir: Optional[str] = None) -> Tuple[bool, str]:
+        """Async implementation of PDF generation, runs on the converter's event loop"""
         try:
-            from playwright.async_api import async_playwright
+            import playwright.async_api
         except ImportError:
             error_msg = (
                 "Playwright가 설치되지 않았습니다.\n\n"
@@ -199,75 +741,28 @@ class DocumentConverter:
             logger.error("Playwright not installed")
             return False, error_msg
 
-        temp_html_path = None
         try:
-            # Save HTML to temp file (Playwright needs a file or URL)
-            temp_html_path = self.temp_dir / f"temp_pdf_{os.getpid()}.html"
-            with open(temp_html_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-
-            import sys
-            async with async_playwright() as p:
-                launch_options = {'headless': True}
-                
-                # If frozen (exe), use bundled browser
-                if getattr(sys, 'frozen', False):
-                    # Path: _MEIPASS/ms-playwright/chromium-1194/chrome-win/chrome.exe
-                    bundled_browser_path = Path(sys._MEIPASS) / 'ms-playwright' / 'chromium-1194' / 'chrome-win' / 'chrome.exe'
-                    if bundled_browser_path.exists():
-                        launch_options['executable_path'] = str(bundled_browser_path)
-                        logger.info(f"Using bundled browser at: {bundled_browser_path}")
-                    else:
-                        logger.warning(f"Bundled browser not found at {bundled_browser_path}, trying default lookup")
-
-                # Launch browser
-                browser = await p.chromium.launch(**launch_options)
-                page = await browser.new_page()
-
-                # Load the HTML file
-                await page.goto(f'file:///{temp_html_path.as_posix()}', wait_until='networkidle')
-
-                # Wait for any dynamic content (KaTeX, Mermaid) to render
-                await page.wait_for_timeout(500)
-
-                # Generate PDF with A4 format
-                await page.pdf(
-                    path=output_path,
-                    format='A4',
-                    margin={
-                        'top': '2.5cm',
-                        'bottom': '2.5cm',
-                        'left': '2.5cm',
-                        'right': '2.5cm'
-                    },
-                    print_background=True,
-                    display_header_footer=True,
-                    header_template='<div></div>',
-                    footer_template='''
-                        <div style="font-size: 10px; text-align: center; width: 100%; color: #666;">
-                            <span class="pageNumber"></span> / <span class="totalPages"></span>
-                        </div>
-                    '''
-                )
-
-                await browser.close()
+            # Render in the warm browser (launched on the first export); the HTML
+            # is handed over from memory, relative paths resolve against base_dir
+            missing_images = await self.pdf_browser.render_pdf(
+                html_content, output_path, Path(base_dir or Path(output_path).parent)
+            )
 
             logger.info(f"PDF created successfully with Playwright: {output_path}")
+            self.browser_check.record_export(True)
+            if missing_images:
+                return True, (f"{len(missing_images)} remote image(s) could not be loaded "
+                              f"and are missing from the PDF: {', '.join(missing_images[:3])}"
+                              + (", ..." if len(missing_images) > 3 else ""))
             return True, ""
 
         except Exception as e:
             error_msg = f"Playwright PDF generation failed: {str(e)}"
             logger.error(error_msg)
+            # The next browser check launches the browser again
+            self.browser_check.record_export(False)
             return False, error_msg
 
-        finally:
-            # Clean up temp file
-            if temp_html_path and temp_html_path.exists():
-                try:
-                    temp_html_path.unlink()
-                except:
-                    pass
-
     def _markdown_to_html(self, markdown: str, title: str) -> str:
         """
         Convert Markdown to HTML for PDF generation
@@ -667,7 +1162,11 @@ svg tspan {
 }
 """
 
-    def pdf_to_markdown(self, pdf_path: str, output_dir: Optional[str] = None) -> Tuple[bool, str, str]:
+    def pdf_to_markdown(self, pdf_path: str, output_dir: Optional[str] = None,
+                        workers: int = 1, table_engine: str = 'pymupdf',
+                        profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                        timings: Optional[PdfImportTimings] = None,
+                        page_range: Optional[tuple] = None) -> Tuple[bool, str, str]:
         """
         Convert PDF to Markdown with enhanced structure detection
 
@@ -681,190 +1180,589 @@ svg tspan {
         Args:
             pdf_path: Path to PDF file
             output_dir: Directory to save extracted images (optional)
+            workers: Number of worker processes for page conversion
+                     (1 = convert in-process, 0 = one per CPU)
+            table_engine: Table finder, 'pymupdf' (falls back to pdfplumber when
+                          unavailable or failing) or 'pdfplumber'
+            profile: Import profile ('fast', 'balanced' or 'full'), see PDF_IMPORT_PROFILES
+            timings: Optional PdfImportTimings that receives the per-stage and
+                     per-page timing breakdown of the import
+            page_range: Optional (first, last) pages to import, 1-based and
+                        inclusive; last None imports to the end of the document
 
         Returns:
             Tuple of (success, markdown_content, error_message)
         """
         try:
             # Try PyMuPDF first for better extraction
-            return self._pdf_to_markdown_pymupdf(pdf_path, output_dir)
+            return self._pdf_to_markdown_pymupdf(pdf_path, output_dir, workers, table_engine,
+                                                 profile, timings, page_range)
         except ImportError:
             # Fallback to pdfplumber
-            return self._pdf_to_markdown_pdfplumber(pdf_path)
+            return self._pdf_to_markdown_pdfplumber(pdf_path, profile, timings, page_range)
         except Exception as e:
             error_msg = f"PDF to Markdown conversion failed: {str(e)}"
             logger.error(error_msg)
             return False, "", error_msg
 
-    def _pdf_to_markdown_pymupdf(self, pdf_path: str, output_dir: Optional[str] = None) -> Tuple[bool, str, str]:
-        """
-        Convert PDF to Markdown using PyMuPDF (fitz)
-        Uses BBox-based header/footer filtering and cross-page code block detection.
+    def iter_pdf_to_markdown(self, pdf_path: str, output_dir: Optional[str] = None,
+                             workers: int = 1, cancel_token: Optional[CancellationToken] = None,
+                             table_engine: str = 'pymupdf',
+                             profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                             page_range: Optional[tuple] = None):
         """
-        import fitz  # PyMuPDF
+        Convert PDF to Markdown page by page
 
-        pdf_path = Path(pdf_path)
+        Concatenating the 'markdown' chunks of all events and passing the
+        result through finalize_markdown() gives the same content as
+        pdf_to_markdown(). Conversion stops after the current page once
+        cancel_token is cancelled.
 
-        # Setup image output directory
-        if output_dir:
-            images_dir = Path(output_dir)
-        else:
-            images_dir = pdf_path.parent / f"{pdf_path.stem}_images"
+        Args:
+            pdf_path: Path to PDF file
+            output_dir: Directory to save extracted images (optional)
+            workers: Number of worker processes for page conversion
+            cancel_token: Optional token to cancel the import
+            table_engine: Table finder, 'pymupdf' or 'pdfplumber'
+            profile: Import profile ('fast', 'balanced' or 'full')
+            page_range: Optional (first, last) pages to import, last None for "to the end"
+
+        Yields:
+            dict with 'page', 'total_pages' (pages in the PDF), 'first_page' and
+            'last_page' (the imported range), 'markdown', 'page_time', 'elapsed',
+            'images', 'tables' (found on this page), 'total_images', 'total_tables',
+            'cached' and 'stage_times' (seconds per stage spent on this page, see
+            PDF_IMPORT_STAGES). An import served from the cache yields a single
+            event for the last page that carries the whole document.
+
+        Raises:
+            Exception: If the PDF cannot be converted
+        """
+        # Reject unknown profiles before any work is done
+        get_pdf_import_profile(profile)
 
-        markdown_lines = []
-        extracted_images = []
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            # Fallback to pdfplumber
+            yield from self._iter_pdf_markdown_pdfplumber(pdf_path, cancel_token, profile, page_range)
+            return
 
-        doc = fitz.open(pdf_path)
+        yield from self._iter_pdf_markdown_pymupdf(pdf_path, output_dir, workers, cancel_token,
+                                                   table_engine, profile, page_range)
 
-        # Collect all fonts used in the document for debugging
-        all_fonts = set()
+    def pdf_to_markdown_file(self, pdf_path: str, md_path: str, output_dir: Optional[str] = None,
+                             workers: int = 1, cancel_token: Optional[CancellationToken] = None,
+                             table_engine: str = 'pymupdf',
+                             profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                             page_range: Optional[tuple] = None) -> Tuple[bool, dict, str]:
+        """
+        Convert PDF to a Markdown file, streaming pages straight to disk
 
-        # State for cross-page code block detection
-        in_code_block = False
-        code_buffer = []
+        Produces the same file as saving the finalized content of
+        pdf_to_markdown(), but never holds the whole document in memory.
+        The file is only replaced once the conversion has completed.
 
-        # Track processed image xrefs to avoid duplicates (logos, watermarks, etc.)
-        processed_image_xrefs = set()
+        Args:
+            pdf_path: Path to PDF file
+            md_path: Markdown file to write
+            output_dir: Directory to save extracted images (optional)
+            workers: Number of worker processes for page conversion
+            cancel_token: Optional token to cancel the import
+            table_engine: Table finder, 'pymupdf' or 'pdfplumber'
+            profile: Import profile ('fast', 'balanced' or 'full')
+            page_range: Optional (first, last) pages to import, last None for "to the end"
+
+        Returns:
+            Tuple of (success, stats, error_message); stats has 'total_pages' (pages converted),
+            'total_images', 'total_tables', 'characters', 'cached', 'seconds',
+            'peak_rss_mb' and 'timings' (PdfImportTimings.to_dict())
+        """
+        start_time = time.perf_counter()
+        timings = PdfImportTimings(profile)
+        stats = {
+            'total_pages': 0,
+            'total_images': 0,
+            'total_tables': 0,
+            'characters': 0,
+            'cached': False,
+            'seconds': 0.0,
+            'peak_rss_mb': 0.0,
+            'timings': {},
+        }
 
         try:
-            total_pages = len(doc)
-
-            for page_num, page in enumerate(doc, 1):
-                page_rect = page.rect
-                page_height = page_rect.height
-
-                # Define header/footer regions - only for multi-page documents
-                # Single page PDFs often don't have headers/footers
-                use_filtering = total_pages > 2
-                if use_filtering:
-                    # Use conservative thresholds (top 5%, bottom 5%)
-                    header_threshold = page_height * 0.05
-                    footer_threshold = page_height * 0.95
-                else:
-                    # No filtering for short documents
-                    header_threshold = 0
-                    footer_threshold = page_height
-
-                # Extract text blocks with font information
-                blocks = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)["blocks"]
-
-                # Log fonts on first page for debugging
-                if page_num == 1:
-                    for block in blocks:
-                        if block["type"] == 0:  # Text block
-                            for line in block.get("lines", []):
-                                for span in line.get("spans", []):
-                                    font_name = span.get("font", "")
-                                    if font_name:
-                                        all_fonts.add(font_name)
-
-                    if all_fonts:
-                        logger.info(f"PDF fonts detected: {sorted(all_fonts)}")
-                    logger.info(f"PDF pages: {total_pages}, using header/footer filtering: {use_filtering}")
-
-                for block in blocks:
-                    # Get block's vertical position (y0 = top, y1 = bottom)
-                    block_y0 = block.get("bbox", [0, 0, 0, 0])[1]
-                    block_y1 = block.get("bbox", [0, 0, 0, 0])[3]
-
-                    # Skip header/footer regions based on BBox (only if filtering is enabled)
-                    if use_filtering:
-                        if block_y0 < header_threshold:
-                            # Header region - skip unless we're in a code block
-                            if not in_code_block:
-                                continue
-                        if block_y1 > footer_threshold:
-                            # Footer region - skip unless we're in a code block
-                            if not in_code_block:
-                                continue
-
-                    if block["type"] == 0:  # Text block
-                        # Process block with code detection
-                        block_result = self._process_text_block_with_state(
-                            block, in_code_block, code_buffer
-                        )
+            with MarkdownStreamWriter(md_path) as writer:
+                for event in self.iter_pdf_to_markdown(pdf_path, output_dir, workers, cancel_token,
+                                                       table_engine, profile, page_range):
+                    writer.write(event['markdown'])
+                    timings.add_event(event)
+                    stats['total_pages'] = event['last_page'] - event['first_page'] + 1
+                    stats['total_images'] = event['total_images']
+                    stats['total_tables'] = event['total_tables']
+                    stats['cached'] = event['cached']
 
-                        in_code_block = block_result['in_code_block']
-                        code_buffer = block_result['code_buffer']
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    raise InterruptedError("Cancelled")
 
-                        if block_result['output']:
-                            markdown_lines.append(block_result['output'])
+            stats['characters'] = writer.characters_written
 
-                    elif block["type"] == 1:  # Image block
-                        # Get image xref to check for duplicates
-                        img_xref = block.get("xref", 0)
+        except Exception as e:
+            error_msg = str(e) if isinstance(e, InterruptedError) else f"PDF to Markdown conversion failed: {str(e)}"
+            logger.error(error_msg)
+            return False, stats, error_msg
 
-                        # Skip duplicate images (logos, watermarks that appear on every page)
-                        if img_xref != 0 and img_xref in processed_image_xrefs:
-                            logger.debug(f"Skipping duplicate image xref: {img_xref}")
-                            continue
+        finally:
+            stats['seconds'] = time.perf_counter() - start_time
+            stats['peak_rss_mb'] = peak_rss_mb()
+            stats['timings'] = timings.to_dict()
 
-                        # Mark this xref as processed
-                        if img_xref != 0:
-                            processed_image_xrefs.add(img_xref)
+        logger.info(f"Markdown written to {md_path}: {stats['total_pages']} pages in "
+                    f"{stats['seconds']:.2f}s, peak RSS {stats['peak_rss_mb']:.0f} MB")
+        return True, stats, ""
 
-                        # Flush code buffer before image
-                        if in_code_block and code_buffer:
-                            markdown_lines.append(self._format_code_block(code_buffer))
-                            code_buffer = []
-                            in_code_block = False
+    def finalize_markdown(self, markdown_content: str) -> str:
+        """
+        Clean up concatenated page chunks into the final markdown document
 
-                        # Extract image
-                        img_result = self._extract_image_from_block(
-                            page, block, page_num, len(extracted_images) + 1,
-                            images_dir, pdf_path.stem
-                        )
-                        if img_result:
-                            extracted_images.append(img_result)
-                            markdown_lines.append(f"\n![Image {len(extracted_images)}]({img_result})\n")
+        MarkdownStreamWriter applies the same clean-up chunk by chunk.
+        """
+        import re
 
-                # Extract tables using pdfplumber for better table detection
-                page_tables = self._extract_tables_from_page(pdf_path, page_num - 1)
-                if page_tables:
-                    # Flush code buffer before tables
-                    if in_code_block and code_buffer:
-                        markdown_lines.append(self._format_code_block(code_buffer))
-                        code_buffer = []
-                        in_code_block = False
+        # Clean up excessive newlines
+        markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        return markdown_content.strip()
 
-                    for table_md in page_tables:
-                        markdown_lines.append(f"\n{table_md}\n")
+    def _pdf_to_markdown_pymupdf(self, pdf_path: str, output_dir: Optional[str] = None,
+                                 workers: int = 1, table_engine: str = 'pymupdf',
+                                 profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                                 timings: Optional[PdfImportTimings] = None,
+                                 page_range: Optional[tuple] = None) -> Tuple[bool, str, str]:
+        """
+        Convert PDF to Markdown using PyMuPDF (fitz)
+        Uses cross-page header/footer detection and cross-page code block detection.
+        """
+        import fitz  # PyMuPDF
 
-                # Add page separator (but not if we're in a code block that continues)
-                if page_num < total_pages and not in_code_block:
-                    markdown_lines.append("\n---\n")
+        writer = MarkdownStreamWriter()
+        for event in self._iter_pdf_markdown_pymupdf(pdf_path, output_dir, workers,
+                                                     table_engine=table_engine, profile=profile,
+                                                     page_range=page_range):
+            writer.write(event['markdown'])
+            if timings is not None:
+                timings.add_event(event)
+        writer.close()
+        return True, writer.getvalue(), ""
+
+    def _iter_pdf_markdown_pymupdf(self, pdf_path: str, output_dir: Optional[str] = None,
+                                   workers: int = 1,
+                                   cancel_token: Optional[CancellationToken] = None,
+                                   table_engine: str = 'pymupdf',
+                                   profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                                   page_range: Optional[tuple] = None):
+        """
+        Convert PDF to Markdown using PyMuPDF (fitz), yielding one event per page
 
-            # Flush remaining code buffer at end of document
-            if code_buffer:
-                markdown_lines.append(self._format_code_block(code_buffer))
+        Pages are extracted independently (optionally in worker processes) and
+        then stitched in page order by PdfPageAssembler, which owns all
+        cross-page state (open code blocks, duplicate image xrefs).
+        Only the pages of page_range are opened; a range import is cached
+        under its own key and shares its extracted pages with full imports.
+        """
+        import fitz  # PyMuPDF
 
-            markdown_content = '\n'.join(markdown_lines)
+        pdf_path = Path(pdf_path)
+
+        # Setup image output directory
+        if output_dir:
+            images_dir = Path(output_dir)
+        else:
+            images_dir = pdf_path.parent / f"{pdf_path.stem}_images"
 
-            # Clean up excessive newlines
-            import re
-            markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        start_time = time.perf_counter()
+        timings = PdfImportTimings(profile)
+
+        # Re-imports of an unchanged PDF are served from the persistent cache
+        cache_key = None
+        source = str(pdf_path.resolve())
+        if self.import_cache is not None:
+            cache_options = {
+                'engine': 'pymupdf',
+                'doc_name': pdf_path.stem,
+                'images_dir_name': images_dir.name,
+                'table_engine': table_engine,
+                'profile': profile,
+            }
+            if page_range is not None:
+                cache_options['page_range'] = list(page_range)
+            cache_key = self.import_cache.make_key(pdf_path, PDF_IMPORT_VERSION, cache_options)
+            cached = self.import_cache.load(cache_key, images_dir)
+            if cached is not None:
+                elapsed = time.perf_counter() - start_time
+                total_images = cached.get('total_images', len(cached['images']))
+                last_page = cached.get('last_page', cached['total_pages'])
+                yield {
+                    'page': last_page,
+                    'total_pages': cached['total_pages'],
+                    'first_page': cached.get('first_page', 1),
+                    'last_page': last_page,
+                    'markdown': cached['markdown'],
+                    'page_time': elapsed,
+                    'elapsed': elapsed,
+                    'images': total_images,
+                    'tables': cached['total_tables'],
+                    'total_images': total_images,
+                    'total_tables': cached['total_tables'],
+                    'cached': True,
+                    'stage_times': {}
+                }
+                return
+
+        # Open the document once and share it across all per-page stages
+        with PdfImportSession(pdf_path, table_engine, profile) as session:
+            total_pages = session.page_count
+            first_page, last_page = resolve_page_range(page_range, total_pages)
+            page_nums = range(first_page, last_page + 1)
+            if page_range is None:
+                logger.info(f"PDF pages: {total_pages}")
+            else:
+                logger.info(f"PDF pages: {first_page}-{last_page} of {total_pages}")
+
+            # Revised PDFs: reuse the extracted pages of the previous import whose
+            # fingerprint is unchanged. Only extraction is skipped - every page is
+            # still merged in order, so cross-page code blocks are stitched as usual.
+            fingerprints = {}
+            reused_pages = {}
+            previous_pages = {}
+            if cache_key is not None:
+                salt = f"{PDF_IMPORT_VERSION}|{table_engine}|{profile}"
+                fingerprints = {page_num: session.page_fingerprint(page_num - 1, salt) for page_num in page_nums}
+                previous_pages = self.import_cache.load_pages(source)
+                for page_num, fingerprint in fingerprints.items():
+                    if fingerprint in previous_pages:
+                        reused_pages[page_num] = dict(
+                            previous_pages[fingerprint], page_num=page_num, extract_time=0.0,
+                            stage_times={}
+                        )
+                if reused_pages:
+                    logger.info(f"Reusing {len(reused_pages)} of {len(page_nums)} pages from the previous import")
+
+            assembler = PdfPageAssembler(self, session, images_dir, pdf_path.stem, last_page)
+            has_output = False
+            total_tables = 0
+            # A range import keeps the other pages of the previous import for the next one
+            page_cache = dict(previous_pages) if page_range is not None else {}
+
+            # Freshly extracted pages, for the throughput history:
+            # (kind, seconds without images, markdown characters)
+            history_pages = []
+            history_images = 0
+            history_image_seconds = 0.0
+
+            # Finalized markdown for the cache entry, built as pages arrive
+            cache_writer = MarkdownStreamWriter() if cache_key is not None else None
+
+            page_results = assembler.margin_detector.lookahead(
+                self._iter_pdf_page_results(session, workers, reused_pages, page_nums),
+                lambda page_result: [item['margin_keys'] for item in page_result['items']]
+            )
+            for page_result in page_results:
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    logger.info(f"PDF import cancelled before page {page_result['page_num']}: {pdf_path}")
+                    assembler.close()
+                    return
+
+                merge_start = time.perf_counter()
+                page_num = page_result['page_num']
+                images_before = len(assembler.extracted_images)
+                if fingerprints:
+                    page_cache[fingerprints[page_num]] = {
+                        'items': page_result['items'],
+                        'tables': page_result['tables']
+                    }
+
+                page_lines = assembler.add_page(page_result)
+                if page_num == last_page:
+                    # Flush remaining code buffer at end of the imported pages
+                    page_lines.extend(assembler.finish())
+
+                # Chunks concatenate to '\n'.join() of all document lines
+                chunk = ""
+                if page_lines:
+                    chunk = ('\n' if has_output else '') + '\n'.join(page_lines)
+                    has_output = True
+
+                page_tables = len(page_result['tables'])
+                total_tables += page_tables
+                if cache_writer is not None:
+                    cache_writer.write(chunk)
+
+                # Extraction stages come with the page result, merge stages from the assembler
+                merge_time = time.perf_counter() - merge_start
+                stage_times = dict(page_result['stage_times'])
+                for stage, seconds in assembler.timer.seconds.items():
+                    stage_times[stage] = stage_times.get(stage, 0.0) + seconds
+                    merge_time -= seconds
+                stage_times['merge'] = merge_time
+
+                event = {
+                    'page': page_num,
+                    'total_pages': total_pages,
+                    'first_page': first_page,
+                    'last_page': last_page,
+                    'markdown': chunk,
+                    'page_time': page_result['extract_time'] + time.perf_counter() - merge_start,
+                    'elapsed': time.perf_counter() - start_time,
+                    'images': len(assembler.extracted_images) - images_before,
+                    'tables': page_tables,
+                    'total_images': len(assembler.extracted_images),
+                    'total_tables': total_tables,
+                    'cached': False,
+                    'stage_times': stage_times
+                }
+                timings.add_event(event)
+
+                if 'kind' in page_result:
+                    image_seconds = stage_times.get('images', 0.0)
+                    history_pages.append((page_result['kind'], event['page_time'] - image_seconds, len(chunk)))
+                    history_images += event['images']
+                    history_image_seconds += image_seconds
+
+                yield event
+
+            logger.info(f"PDF converted to markdown with PyMuPDF: {pdf_path} "
+                        f"(profile {profile}, peak RSS {peak_rss_mb():.0f} MB)")
+            logger.info(f"PDF import stage times: {timings.summary()}")
+            font_table = session.font_table
+            if font_table.misses:
+                logger.debug(f"Font table: {font_table.misses} fonts, "
+                             f"{font_table.hit_rate:.1%} of span lookups cached")
+            if assembler.extracted_images:
+                logger.info(f"Extracted {len(assembler.extracted_images)} images")
+            if assembler.margin_detector.blocks_removed:
+                logger.info(f"Removed {assembler.margin_detector.blocks_removed} repeated header/footer blocks")
+
+        if cache_writer is not None:
+            cache_writer.close()
+            self.import_cache.store(
+                cache_key,
+                cache_writer.getvalue(),
+                images_dir,
+                list(dict.fromkeys(Path(image_path).name for image_path in assembler.extracted_images)),
+                {'total_pages': total_pages, 'first_page': first_page, 'last_page': last_page,
+                 'total_tables': total_tables, 'total_images': len(assembler.extracted_images),
+                 'source': source},
+                page_cache
+            )
 
-            logger.info(f"PDF converted to markdown with PyMuPDF: {pdf_path}")
-            if extracted_images:
-                logger.info(f"Extracted {len(extracted_images)} images")
+        if self.import_history is not None:
+            self.import_history.record(profile, history_pages, history_images, history_image_seconds)
 
-            return True, markdown_content.strip(), ""
+    def _iter_pdf_page_results(self, session: PdfImportSession, workers: int = 1,
+                               reused_pages: Optional[dict] = None, page_nums=None):
+        """
+        Yield extracted page results in page order
 
+        Pages found in reused_pages (page number -> page result) are not
+        extracted again. With more than one worker, contiguous runs of the
+        remaining pages are extracted in a process pool; results are still
+        yielded strictly in page order.
+
+        Args:
+            page_nums: Ascending page numbers to yield (default: all pages)
+        """
+        if page_nums is None:
+            page_nums = range(1, session.page_count + 1)
+        reused_pages = reused_pages or {}
+        pending = [page_num for page_num in page_nums if page_num not in reused_pages]
+
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(pending)))
+
+        if workers == 1:
+            doc = session.doc
+            for page_num in page_nums:
+                if page_num in reused_pages:
+                    yield reused_pages[page_num]
+                else:
+                    yield self._extract_pdf_page(session, doc[page_num - 1], page_num)
+            return
+
+        # One contiguous run of pages per worker, so each worker opens the file once
+        from concurrent.futures import ProcessPoolExecutor
+        from itertools import chain
+        chunk_size = -(-len(pending) // workers)
+        chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+
+        logger.info(f"Converting {len(pending)} pages with {workers} worker processes")
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            extracted = chain.from_iterable(executor.map(
+                _extract_pdf_pages,
+                [str(session.pdf_path)] * len(chunks),
+                chunks,
+                [session.table_engine] * len(chunks),
+                [session.profile.name] * len(chunks)
+            ))
+            for page_num in page_nums:
+                if page_num in reused_pages:
+                    yield reused_pages[page_num]
+                else:
+                    yield next(extracted)
         finally:
-            doc.close()
+            # Don't wait for pages nobody will consume (cancelled import)
+            executor.shutdown(wait=False, cancel_futures=True)
 
-    def _process_text_block_with_state(self, block: dict, in_code_block: bool,
-                                        code_buffer: list) -> dict:
+    def _extract_pdf_page(self, session: PdfImportSession, page, page_num: int) -> dict:
         """
-        Process a text block with stateful code block detection.
-        Maintains code block state across blocks and pages.
+        Extract a single page into items that do not depend on other pages.
+
+        Stages the session's import profile turns off are skipped: without
+        table finding a table's text stays in the text flow, without code
+        detection every line is regular text.
 
         Returns:
-            dict with 'output', 'in_code_block', 'code_buffer'
+            dict with 'page_num', 'kind' (see classify_page()), 'items'
+            (text/image blocks in reading order, with their header/footer
+            'margin_keys'), 'tables' (markdown tables found on the page),
+            'extract_time' and 'stage_times'
         """
-        output_lines = []
-        current_in_code = in_code_block
-        current_buffer = code_buffer.copy()
+        import fitz  # PyMuPDF
+
+        extract_start = time.perf_counter()
+        timer = StageTimer()
+        profile = session.profile
+        page_height = page.rect.height
+
+        # Find tables first, so that their text is not emitted a second time
+        tables = []
+        if profile.tables:
+            with timer.stage('tables'):
+                tables = self._extract_tables_from_page(session, page, page_num - 1)
+        table_rects = [fitz.Rect(bbox) for bbox, _ in tables]
+
+        def in_table(bbox) -> bool:
+            # A line belongs to a table if its center lies inside the table
+            center = fitz.Point((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2)
+            return any(center in rect for rect in table_rects)
+
+        # Extract text blocks with font information.
+        # Lean mode: without TEXT_PRESERVE_IMAGES the dict carries no image blocks,
+        # so no image payloads are decoded just to read the text structure
+        blocks = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)["blocks"]
+
+        # Log fonts on first page for debugging
+        if page_num == 1:
+            all_fonts = set()
+            for block in blocks:
+                if block["type"] == 0:  # Text block
+                    for line in block.get("lines", []):
+                        for span in line.get("spans", []):
+                            font_name = span.get("font", "")
+                            if font_name:
+                                all_fonts.add(font_name)
+
+            if all_fonts:
+                logger.info(f"PDF fonts detected: {sorted(all_fonts)}")
+
+        # Images are only listed by xref and bbox here; their bytes are pulled
+        # lazily by the merge stage, and only for images that are not duplicates
+        # (get_image_info(xrefs=True) would decode every image to hash it)
+        images = []
+        if profile.images:
+            with timer.stage('images'):
+                for image in page.get_images(full=True):
+                    bbox = page.get_image_bbox(image)
+                    if bbox.is_empty or bbox.is_infinite or not bbox.intersects(page.rect):
+                        continue  # Not displayed on this page
+                    images.append((tuple(bbox), image[0]))
+                images.sort(key=lambda image: (image[0][1], image[0][0]))
+
+        # Header/footer blocks are only recognized (and skipped) by the merge
+        # stage, once they are seen repeating across pages
+        def image_item(image) -> dict:
+            bbox, xref = image
+            return {
+                'type': 'image',
+                'margin_keys': RepeatedMarginDetector.image_keys(xref, bbox[1], bbox[3], page_height),
+                'xref': xref
+            }
+
+        text_items = []
+        text_tops = []
+        for block in blocks:
+            if block["type"] != 0:  # Text blocks only
+                continue
+
+            if table_rects:
+                lines = [line for line in block.get("lines", []) if not in_table(line["bbox"])]
+                if not lines:
+                    continue  # Rendered as a table
+                block = dict(block, lines=lines)
+
+            bbox = block.get("bbox", [0, 0, 0, 0])
+            block_lines = self._extract_text_block_lines(block, session.font_table,
+                                                         profile.code_blocks, timer)
+            text_tops.append(bbox[1])
+            # Text set as a heading (font size >= 14) is never a running header
+            margin_keys = []
+            if block_lines and max(line[2] for line in block_lines) < 14:
+                with timer.stage('margins'):
+                    margin_keys = RepeatedMarginDetector.text_keys(
+                        '\n'.join(line[0] for line in block_lines), bbox[1], bbox[3], page_height
+                    )
+            text_items.append({
+                'type': 'text',
+                'margin_keys': margin_keys,
+                'lines': block_lines
+            })
+
+        # Place every image after the last text block that starts above it
+        images_after = {}  # number of preceding text blocks -> image items
+        for image in images:
+            position = 0
+            for index, top in enumerate(text_tops, 1):
+                if top <= image[0][1]:
+                    position = index
+            images_after.setdefault(position, []).append(image_item(image))
+
+        items = images_after.get(0, [])
+        for index, text_item in enumerate(text_items, 1):
+            items.append(text_item)
+            items.extend(images_after.get(index, []))
+
+        # Everything not attributed to another stage is text extraction
+        extract_time = time.perf_counter() - extract_start
+        timer.add('text', extract_time - sum(timer.seconds.values()))
+
+        return {
+            'page_num': page_num,
+            'kind': classify_page(page),
+            'items': items,
+            'tables': [table_md for _, table_md in tables],
+            'extract_time': extract_time,
+            'stage_times': timer.seconds
+        }
+
+    def _extract_text_block_lines(self, block: dict, font_table: PdfFontTable,
+                                  detect_code: bool = True,
+                                  timer: Optional[StageTimer] = None) -> list:
+        """
+        Extract the lines of a text block with their formatting.
+
+        Args:
+            block: PyMuPDF text block
+            font_table: Font classification table of the document
+            detect_code: Detect code lines; otherwise is_code is always False
+            timer: Optional page timer that receives the code detection time
+
+        Returns:
+            List of (line_text, is_code, max_font_size, is_bold, is_italic) tuples
+        """
+        lines = []
+        code_seconds = 0.0
 
         for line in block.get("lines", []):
             line_text = ""
@@ -876,45 +1774,61 @@ svg tspan {
             for span in line.get("spans", []):
                 text = span.get("text", "")
                 font_size = span.get("size", 12)
-                font_name = span.get("font", "").lower()
 
                 max_font_size = max(max_font_size, font_size)
 
-                # Detect monospace font
-                if self._is_monospace_font(font_name):
-                    is_monospace = True
-
-                # Detect bold/italic
-                if "bold" in font_name or "black" in font_name:
-                    is_bold = True
-                if "italic" in font_name or "oblique" in font_name:
-                    is_italic = True
+                # Detect monospace/bold/italic font
+                span_monospace, span_bold, span_italic = font_table.classify(
+                    span.get("font", ""), span.get("flags", 0)
+                )
+                is_monospace = is_monospace or span_monospace
+                is_bold = is_bold or span_bold
+                is_italic = is_italic or span_italic
 
                 line_text += text
 
+            if not detect_code:
+                is_monospace = False
+            elif not is_monospace and line_text.strip():
+                # Also check content pattern if font detection fails
+                code_start = time.perf_counter()
+                is_monospace = self._looks_like_code(line_text)
+                code_seconds += time.perf_counter() - code_start
+
+            lines.append((line_text, is_monospace, max_font_size, is_bold, is_italic))
+
+        if timer is not None and code_seconds:
+            timer.add('code', code_seconds)
+
+        return lines
+
+    def _process_text_block_with_state(self, block_lines: list,
+                                        code_block: CodeBlockAccumulator) -> str:
+        """
+        Process the extracted lines of a text block with stateful code block detection.
+        Code lines go into code_block, which carries open code blocks across blocks and pages.
+
+        Returns:
+            Markdown of the block's text and of code blocks closed by it
+        """
+        output_lines = []
+
+        for line_text, is_monospace, max_font_size, is_bold, is_italic in block_lines:
             line_text_stripped = line_text.strip()
             if not line_text_stripped:
-                if current_in_code:
-                    current_buffer.append("")
+                code_block.add_blank()
                 continue
 
-            # Also check content pattern if font detection fails
-            if not is_monospace:
-                is_monospace = self._looks_like_code(line_text)
-
             # State machine for code blocks
             if is_monospace:
-                if not current_in_code:
-                    # Starting new code block
-                    current_in_code = True
                 # Add to code buffer (preserve indentation)
-                current_buffer.append(line_text.rstrip())
+                code_block.add(line_text.rstrip())
             else:
                 # Not monospace - end code block if we were in one
-                if current_in_code and current_buffer:
-                    output_lines.append(self._format_code_block(current_buffer))
-                    current_buffer = []
-                    current_in_code = False
+                if code_block.in_code_block:
+                    code = code_block.flush()
+                    if code:
+                        output_lines.append(code)
 
                 # Format as regular text
                 formatted_line = line_text_stripped
@@ -940,11 +1854,7 @@ svg tspan {
 
                 output_lines.append(formatted_line)
 
-        return {
-            'output': '\n'.join(output_lines) if output_lines else "",
-            'in_code_block': current_in_code,
-            'code_buffer': current_buffer
-        }
+        return '\n'.join(output_lines) if output_lines else ""
 
     def _process_text_block(self, block: dict) -> str:
         """
@@ -1048,174 +1958,26 @@ svg tspan {
         Detect if text looks like code based on content patterns.
         This is a fallback when font detection doesn't work.
         """
-        import re
-
-        text_stripped = text.strip()
-        if not text_stripped:
-            return False
-
-        # Strong indicators - if any match, it's very likely code
-        strong_patterns = [
-            # Python specific
-            r'^def\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?:',  # def func() -> Type:
-            r'^class\s+\w+.*:',  # class Foo:
-            r'^(from|import)\s+\w+',  # import/from
-            r'^@\w+',  # @decorator
-            r'^\s*if\s+.+:$',  # if condition:
-            r'^\s*elif\s+.+:$',  # elif condition:
-            r'^\s*else\s*:$',  # else:
-            r'^\s*for\s+\w+\s+in\s+.+:',  # for x in ...:
-            r'^\s*while\s+.+:',  # while ...:
-            r'^\s*try\s*:',  # try:
-            r'^\s*except.*:',  # except:
-            r'^\s*finally\s*:',  # finally:
-            r'^\s*with\s+.+:',  # with ...:
-            r'^\s*return\s+',  # return
-            r'^\s*yield\s+',  # yield
-            r'^\s*raise\s+',  # raise
-            r'^\s*pass\s*$',  # pass
-            r'^\s*break\s*$',  # break
-            r'^\s*continue\s*$',  # continue
-            r'\w+\s*=\s*\[.*\]',  # list assignment
-            r'\w+\s*=\s*\{.*\}',  # dict assignment
-            r'\w+\s*=\s*\(.*\)',  # tuple assignment
-            r'lambda\s+\w+\s*:',  # lambda
-            r'map\s*\(.+\)',  # map()
-            r'filter\s*\(.+\)',  # filter()
-            r'list\s*\(.+\)',  # list()
-            r'dict\s*\(.+\)',  # dict()
-            r'range\s*\(.+\)',  # range()
-            r'print\s*\(.+\)',  # print()
-            r'input\s*\(.+\)',  # input()
-            r'len\s*\(.+\)',  # len()
-            r'\.split\s*\(',  # .split()
-            r'\.join\s*\(',  # .join()
-            r'\.append\s*\(',  # .append()
-            r'int\s*\(.+\)',  # int()
-            r'str\s*\(.+\)',  # str()
-            r'float\s*\(.+\)',  # float()
-
-            # JavaScript/TypeScript
-            r'^(const|let|var)\s+\w+\s*=',
-            r'^function\s+\w+\s*\(',
-            r'^\s*=>\s*\{',
-            r'console\.(log|error|warn)\s*\(',
-
-            # Java/C#
-            r'^(public|private|protected)\s+(static\s+)?(void|int|String|boolean)',
-            r'^(public|private|protected)\s+class\s+\w+',
-
-            # C/C++
-            r'^#include\s*[<"]',
-            r'^#define\s+\w+',
-            r'^int\s+main\s*\(',
-            r'printf\s*\(',
-            r'cout\s*<<',
-
-            # General
-            r'^\s*//.*$',  # // comment
-            r'^\s*#(?!#)\s*\w+',  # # comment (but not ## heading)
-            r'^\s*/\*',  # /* comment
-            r'^\s*\*/',  # */ end comment
-        ]
-
-        for pattern in strong_patterns:
-            if re.search(pattern, text_stripped):
-                logger.debug(f"Code pattern matched: {pattern} in '{text_stripped[:50]}...'")
-                return True
-
-        # Check for code-like characteristics
-        code_indicators = 0
-
-        # Has significant indentation (4+ spaces or tab at start)
-        if re.match(r'^(\t|    +)', text):
-            code_indicators += 3
-
-        # Line ends with colon (Python)
-        if text_stripped.endswith(':') and not text_stripped.startswith('#'):
-            code_indicators += 2
-
-        # Contains brackets/braces
-        bracket_count = len(re.findall(r'[\{\}\[\]\(\)]', text_stripped))
-        if bracket_count >= 2:
-            code_indicators += 2
-        elif bracket_count >= 1:
-            code_indicators += 1
-
-        # Contains operators common in code
-        if re.search(r'[=!<>]=|&&|\|\||=>|->|\+\+|--|==|!=', text_stripped):
-            code_indicators += 2
-
-        # Contains semicolon at end (C-style)
-        if text_stripped.endswith(';'):
-            code_indicators += 2
-
-        # Multiple assignment operators
-        if text_stripped.count('=') >= 1 and re.search(r'\w+\s*=\s*\w+', text_stripped):
-            code_indicators += 1
-
-        # Contains common code symbols
-        if re.search(r'[$@]\w+', text_stripped):  # $var, @decorator
-            code_indicators += 2
-
-        # Has snake_case identifiers (common in Python)
-        if re.search(r'\b[a-z]+_[a-z_]+\b', text_stripped):
-            code_indicators += 1
-
-        # Contains string literals with quotes
-        if re.search(r'["\'][^"\']+["\']', text_stripped):
-            code_indicators += 1
-
-        # Line is a comment (# followed by space and text)
-        if re.match(r'^\s*#\s+\S', text_stripped):
-            code_indicators += 2
-
-        # Contains method/function call pattern
-        if re.search(r'\w+\.\w+\(', text_stripped):
-            code_indicators += 2
-
-        # Threshold for considering it code
-        if code_indicators >= 3:
-            logger.debug(f"Code indicators: {code_indicators} for '{text_stripped[:50]}...'")
-            return True
-
-        return False
+        return self.code_classifier.is_code(text)
 
     def _is_monospace_font(self, font_name: str) -> bool:
         """Check if font is a monospace/code font"""
-        monospace_fonts = [
-            # Common code fonts
-            'courier', 'consolas', 'monaco', 'menlo', 'inconsolata',
-            'source code', 'sourcecodepro', 'fira code', 'firacode',
-            'fira mono', 'firamono', 'dejavu mono', 'dejavumono',
-            'liberation mono', 'liberationmono', 'droid mono', 'droidmono',
-            'ubuntu mono', 'ubuntumono', 'roboto mono', 'robotomono',
-            'jetbrains mono', 'jetbrainsmono', 'cascadia', 'hack',
-            'mono', 'fixed', 'terminal', 'andale',
-            # Korean fonts
-            'd2coding', 'd2 coding', 'nanum gothic coding', 'nanumgothiccoding',
-            '나눔고딕코딩', 'malgun gothic coding',
-            # PDF embedded fonts often have weird names
-            'cour', 'cmtt', 'cmsy', 'lmtt',  # TeX/LaTeX fonts
-            'nixie', 'ocr', 'typewriter',
-        ]
-        font_lower = font_name.lower().replace(' ', '').replace('-', '').replace('_', '')
+        return is_monospace_font_name(font_name)
 
-        # Log font for debugging
-        logger.debug(f"Checking font: {font_name} -> {font_lower}")
-
-        result = any(mono.replace(' ', '') in font_lower for mono in monospace_fonts)
-        if result:
-            logger.debug(f"  -> Detected as monospace!")
-        return result
+    def _format_code_block(self, code_lines: list, language: Optional[str] = None) -> str:
+        """
+        Format accumulated code lines as a markdown code block
 
-    def _format_code_block(self, code_lines: list) -> str:
-        """Format accumulated code lines as a markdown code block"""
+        Args:
+            code_lines: Code lines of the block
+            language: Language tag of the fence (None = detect from content)
+        """
         if not code_lines:
             return ""
 
         # Try to detect language from content
-        language = self._detect_code_language(code_lines)
+        if language is None:
+            language = self._detect_code_language(code_lines)
 
         # Remove common leading whitespace (dedent)
         non_empty_lines = [line for line in code_lines if line.strip()]
@@ -1223,274 +1985,31 @@ svg tspan {
             min_indent = min(len(line) - len(line.lstrip()) for line in non_empty_lines)
             code_lines = [line[min_indent:] if len(line) >= min_indent else line for line in code_lines]
 
-        # Remove trailing empty lines
-        while code_lines and not code_lines[-1].strip():
-            code_lines.pop()
-
-        # Remove leading empty lines
-        while code_lines and not code_lines[0].strip():
-            code_lines.pop(0)
+        # Remove leading and trailing empty lines
+        start, end = 0, len(code_lines)
+        while end > start and not code_lines[end - 1].strip():
+            end -= 1
+        while start < end and not code_lines[start].strip():
+            start += 1
 
-        code_content = '\n'.join(code_lines)
+        code_content = '\n'.join(code_lines[start:end])
         return f"```{language}\n{code_content}\n```"
 
+    def _format_code_block_for_profile(self, code_lines: list, profile, timer: StageTimer) -> str:
+        """Format a code block, scoring its language only if the import profile asks for it"""
+        if not profile.code_languages:
+            return self._format_code_block(code_lines, language="")
+
+        with timer.stage('languages'):
+            language = self._detect_code_language(code_lines) if code_lines else ""
+        return self._format_code_block(code_lines, language)
+
     def _detect_code_language(self, code_lines: list) -> str:
         """
         Detect programming language from code content using scoring system.
         Returns the language with highest confidence score.
         """
-        import re
-
-        code_text = '\n'.join(code_lines)
-        code_lower = code_text.lower()
-
-        # Score-based detection
-        scores = {
-            'python': 0,
-            'javascript': 0,
-            'typescript': 0,
-            'java': 0,
-            'c': 0,
-            'cpp': 0,
-            'csharp': 0,
-            'go': 0,
-            'rust': 0,
-            'html': 0,
-            'css': 0,
-            'sql': 0,
-            'bash': 0,
-            'json': 0,
-            'xml': 0,
-            'yaml': 0,
-            'markdown': 0,
-        }
-
-        # === Python (very specific patterns) ===
-        if re.search(r'\bdef\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?\s*:', code_text):
-            scores['python'] += 10  # def func(): or def func() -> Type:
-        if re.search(r'\bclass\s+\w+.*:', code_text):
-            scores['python'] += 8
-        if 'self.' in code_text or 'self,' in code_text:
-            scores['python'] += 10  # Very Python-specific
-        if '__init__' in code_text or '__name__' in code_text or '__main__' in code_text:
-            scores['python'] += 10
-        if re.search(r'^\s*@\w+', code_text, re.MULTILINE):  # Decorators
-            scores['python'] += 5
-        if re.search(r'\bif\s+.+:', code_text) or re.search(r'\bfor\s+\w+\s+in\s+', code_text):
-            scores['python'] += 3  # Colon-based control flow
-        if re.search(r'\belif\b', code_text):
-            scores['python'] += 8  # elif is Python-only
-        if re.search(r'\bexcept\s+\w+.*:', code_text):
-            scores['python'] += 5
-        if 'import ' in code_lower and ';' not in code_text:
-            scores['python'] += 3
-        if 'from ' in code_lower and ' import ' in code_lower:
-            scores['python'] += 8  # from x import y
-        if re.search(r'\bprint\s*\(', code_text):
-            scores['python'] += 2
-        if re.search(r'\bNone\b', code_text):
-            scores['python'] += 3
-        if re.search(r'\bTrue\b|\bFalse\b', code_text):
-            scores['python'] += 2
-        if re.search(r'\blambda\s+\w+\s*:', code_text):
-            scores['python'] += 5
-
-        # === JavaScript ===
-        if re.search(r'\bconst\s+\w+\s*=', code_text):
-            scores['javascript'] += 5
-        if re.search(r'\blet\s+\w+\s*=', code_text):
-            scores['javascript'] += 5
-        if re.search(r'\bvar\s+\w+\s*=', code_text):
-            scores['javascript'] += 3
-        if re.search(r'\bfunction\s+\w+\s*\(', code_text):
-            scores['javascript'] += 5
-        if '=>' in code_text:
-            scores['javascript'] += 5  # Arrow function
-        if 'console.log' in code_text:
-            scores['javascript'] += 8
-        if re.search(r'\bdocument\.|window\.', code_text):
-            scores['javascript'] += 8
-        if re.search(r'require\s*\(', code_text):
-            scores['javascript'] += 5
-        if re.search(r'\bnull\b', code_text) and re.search(r'\bundefined\b', code_text):
-            scores['javascript'] += 3
-        if '===' in code_text or '!==' in code_text:
-            scores['javascript'] += 5
-
-        # === TypeScript ===
-        if re.search(r':\s*(string|number|boolean|any|void)\b', code_text):
-            scores['typescript'] += 8
-        if re.search(r'\binterface\s+\w+\s*\{', code_text):
-            scores['typescript'] += 10
-        if re.search(r'\btype\s+\w+\s*=', code_text):
-            scores['typescript'] += 8
-        if '<T>' in code_text or '<T,' in code_text:
-            scores['typescript'] += 3
-        if scores['typescript'] > 0:
-            scores['typescript'] += scores['javascript'] // 2  # TS inherits JS patterns
-
-        # === Java ===
-        if re.search(r'\bpublic\s+class\s+\w+', code_text):
-            scores['java'] += 10
-        if re.search(r'\bpublic\s+static\s+void\s+main', code_text):
-            scores['java'] += 15
-        if re.search(r'\bSystem\.out\.print', code_text):
-            scores['java'] += 10
-        if re.search(r'\bprivate\s+(static\s+)?(final\s+)?\w+\s+\w+', code_text):
-            scores['java'] += 5
-        if re.search(r'\bnew\s+\w+\s*\(', code_text) and ';' in code_text:
-            scores['java'] += 3
-        if re.search(r'@Override|@Autowired|@Component', code_text):
-            scores['java'] += 8
-
-        # === C ===
-        if re.search(r'#include\s*<\w+\.h>', code_text):
-            scores['c'] += 10
-        if re.search(r'\bint\s+main\s*\(', code_text):
-            scores['c'] += 8
-        if re.search(r'\bprintf\s*\(', code_text):
-            scores['c'] += 8
-        if re.search(r'\bscanf\s*\(', code_text):
-            scores['c'] += 8
-        if re.search(r'\bmalloc\s*\(|\bfree\s*\(', code_text):
-            scores['c'] += 5
-        if re.search(r'\bstruct\s+\w+\s*\{', code_text):
-            scores['c'] += 3
-
-        # === C++ ===
-        if re.search(r'#include\s*<\w+>', code_text) and not re.search(r'\.h>', code_text):
-            scores['cpp'] += 5  # Modern C++ headers without .h
-        if 'std::' in code_text:
-            scores['cpp'] += 10
-        if 'cout' in code_text or 'cin' in code_text:
-            scores['cpp'] += 8
-        if re.search(r'\bclass\s+\w+\s*\{', code_text) and ';' in code_text:
-            scores['cpp'] += 5
-        if '::' in code_text:
-            scores['cpp'] += 3
-        if re.search(r'\bnamespace\s+\w+', code_text):
-            scores['cpp'] += 8
-        if re.search(r'\btemplate\s*<', code_text):
-            scores['cpp'] += 8
-        scores['cpp'] += scores['c'] // 2  # C++ inherits C patterns
-
-        # === C# ===
-        if re.search(r'\busing\s+System', code_text):
-            scores['csharp'] += 10
-        if re.search(r'\bnamespace\s+\w+', code_text) and '{' in code_text:
-            scores['csharp'] += 5
-        if re.search(r'\bConsole\.(WriteLine|ReadLine)', code_text):
-            scores['csharp'] += 10
-        if re.search(r'\basync\s+Task', code_text):
-            scores['csharp'] += 8
-        if re.search(r'\bvar\s+\w+\s*=', code_text) and ';' in code_text:
-            scores['csharp'] += 3
-
-        # === Go ===
-        if re.search(r'\bpackage\s+\w+', code_text):
-            scores['go'] += 10
-        if re.search(r'\bfunc\s+\w+\s*\(', code_text):
-            scores['go'] += 8
-        if re.search(r'\bfmt\.(Print|Println|Printf)', code_text):
-            scores['go'] += 10
-        if ':=' in code_text:
-            scores['go'] += 8  # Go's short declaration
-        if re.search(r'\bgo\s+\w+\(', code_text):
-            scores['go'] += 5  # Goroutine
-        if re.search(r'\bdefer\s+', code_text):
-            scores['go'] += 8
-
-        # === Rust ===
-        if re.search(r'\bfn\s+\w+\s*\(', code_text):
-            scores['rust'] += 8
-        if re.search(r'\blet\s+mut\s+', code_text):
-            scores['rust'] += 10  # Rust's mutable let
-        if re.search(r'\bimpl\s+\w+', code_text):
-            scores['rust'] += 10
-        if re.search(r'\bpub\s+fn\s+', code_text):
-            scores['rust'] += 8
-        if 'println!' in code_text or 'vec!' in code_text:
-            scores['rust'] += 10  # Rust macros
-        if re.search(r'->\s*\w+', code_text) and '::' in code_text:
-            scores['rust'] += 5
-
-        # === HTML ===
-        if re.search(r'<(!DOCTYPE|html|head|body|div|span|p|a|img)\b', code_text, re.IGNORECASE):
-            scores['html'] += 10
-        if re.search(r'</\w+>', code_text):
-            scores['html'] += 5
-        if re.search(r'<\w+\s+\w+="[^"]*"', code_text):
-            scores['html'] += 3
-
-        # === CSS ===
-        if re.search(r'\{[^}]*:\s*[^;]+;[^}]*\}', code_text):
-            scores['css'] += 5
-        if re.search(r'\b(margin|padding|font-size|color|background|display)\s*:', code_text):
-            scores['css'] += 8
-        if re.search(r'\.([\w-]+)\s*\{', code_text):
-            scores['css'] += 5  # Class selector
-        if re.search(r'#[\w-]+\s*\{', code_text):
-            scores['css'] += 5  # ID selector
-
-        # === SQL ===
-        if re.search(r'\bSELECT\s+.+\s+FROM\b', code_text, re.IGNORECASE):
-            scores['sql'] += 15
-        if re.search(r'\bINSERT\s+INTO\b', code_text, re.IGNORECASE):
-            scores['sql'] += 10
-        if re.search(r'\bCREATE\s+(TABLE|DATABASE|INDEX)\b', code_text, re.IGNORECASE):
-            scores['sql'] += 10
-        if re.search(r'\bWHERE\s+', code_text, re.IGNORECASE):
-            scores['sql'] += 5
-        if re.search(r'\bJOIN\s+', code_text, re.IGNORECASE):
-            scores['sql'] += 5
-
-        # === Bash/Shell ===
-        if re.search(r'^#!/bin/(bash|sh|zsh)', code_text, re.MULTILINE):
-            scores['bash'] += 15
-        if re.search(r'^\$\s+\w+', code_text, re.MULTILINE):
-            scores['bash'] += 5
-        if re.search(r'\b(sudo|apt|yum|brew|npm|pip|git|docker|kubectl)\s+', code_text):
-            scores['bash'] += 5
-        if re.search(r'\becho\s+', code_text):
-            scores['bash'] += 3
-        if re.search(r'\bexport\s+\w+=', code_text):
-            scores['bash'] += 5
-        if re.search(r'\$\{\w+\}|\$\w+', code_text):
-            scores['bash'] += 3
-
-        # === JSON ===
-        stripped = code_text.strip()
-        if (stripped.startswith('{') and stripped.endswith('}')) or \
-           (stripped.startswith('[') and stripped.endswith(']')):
-            if re.search(r'"\w+"\s*:', code_text):
-                scores['json'] += 15
-
-        # === XML ===
-        if re.search(r'<\?xml\s+version=', code_text):
-            scores['xml'] += 15
-        if re.search(r'<\w+[^>]*>[^<]*</\w+>', code_text) and '<html' not in code_lower:
-            scores['xml'] += 5
-
-        # === YAML ===
-        if re.search(r'^\w+:\s*$', code_text, re.MULTILINE):
-            scores['yaml'] += 5
-        if re.search(r'^\s*-\s+\w+:', code_text, re.MULTILINE):
-            scores['yaml'] += 8
-        if re.search(r'^\w+:\s+\w+', code_text, re.MULTILINE) and '{' not in code_text:
-            scores['yaml'] += 3
-
-        # Find language with highest score
-        max_score = max(scores.values())
-        if max_score < 5:
-            return ""  # Not confident enough
-
-        best_lang = max(scores, key=scores.get)
-
-        # Log for debugging
-        top_scores = sorted(scores.items(), key=lambda x: -x[1])[:3]
-        logger.debug(f"Language detection scores: {top_scores}")
-
-        return best_lang
+        return self.language_detector.detect(code_lines)
 
     def _detect_list_item(self, text: str) -> str:
         """Detect and convert list items to markdown format"""
@@ -1510,23 +2029,25 @@ svg tspan {
 
         return text
 
-    def _extract_image_from_block(self, page, block: dict, page_num: int,
+    def _extract_image_from_block(self, doc, block: dict, page_num: int,
                                    img_num: int, images_dir: Path,
-                                   doc_name: str) -> Optional[str]:
-        """Extract image from PDF block and save to file"""
+                                   doc_name: str, image_store: Optional[ImageStore] = None) -> Optional[str]:
+        """
+        Extract image from PDF block and save to file
+
+        With an image store the file is written by the store (possibly later,
+        on its writer thread).
+        """
         try:
             import fitz
 
-            # Create images directory if needed
-            images_dir.mkdir(parents=True, exist_ok=True)
-
             # Get image from page
             xref = block.get("xref", 0)
             if xref == 0:
                 return None
 
             # Extract image
-            base_image = page.parent.extract_image(xref)
+            base_image = doc.extract_image(xref)
             if not base_image:
                 return None
 
@@ -1535,12 +2056,13 @@ svg tspan {
 
             # Save image
             image_filename = f"{doc_name}_p{page_num}_img{img_num}.{image_ext}"
-            image_path = images_dir / image_filename
-
-            with open(image_path, "wb") as f:
-                f.write(image_bytes)
+            if image_store is None:
+                with ImageStore(images_dir, self.image_objects_dir) as image_store:
+                    image_store.put(image_bytes, image_filename)
+            else:
+                image_store.put(image_bytes, image_filename)
 
-            logger.info(f"Extracted image: {image_path}")
+            logger.info(f"Extracted image: {images_dir / image_filename}")
 
             # Return relative path for markdown
             return f"./{images_dir.name}/{image_filename}"
@@ -1549,32 +2071,55 @@ svg tspan {
             logger.warning(f"Failed to extract image: {e}")
             return None
 
-    def _extract_tables_from_page(self, pdf_path: str, page_idx: int) -> list:
-        """Extract tables from a specific page using pdfplumber"""
-        try:
-            import pdfplumber
+    def _extract_tables_from_page(self, session: PdfImportSession, page, page_idx: int) -> list:
+        """
+        Extract the tables of a page with the session's table engine
 
-            tables_md = []
+        PyMuPDF's table finder works on the already open page. pdfplumber is
+        used when it is selected, or when the PyMuPDF finder is unavailable
+        (PyMuPDF < 1.23) or fails on the page.
 
-            with pdfplumber.open(pdf_path) as pdf:
-                if page_idx < len(pdf.pages):
-                    page = pdf.pages[page_idx]
-                    tables = page.extract_tables()
+        Returns:
+            List of (bbox, markdown_table) tuples
+        """
+        if session.table_engine == 'pymupdf' and hasattr(page, 'find_tables'):
+            try:
+                found = [(tuple(table.bbox), table.extract()) for table in page.find_tables().tables]
+                return self._tables_to_markdown(found)
+            except Exception as e:
+                logger.warning(f"PyMuPDF table finder failed on page {page_idx + 1}, using pdfplumber: {e}")
+
+        return self._extract_tables_pdfplumber(session, page_idx)
+
+    def _extract_tables_pdfplumber(self, session: PdfImportSession, page_idx: int) -> list:
+        """Extract tables from a specific page using the session's pdfplumber handle"""
+        page = None
+        try:
+            found = []
 
-                    for table in tables:
-                        if table and len(table) > 0:
-                            md_table = self._table_to_markdown(table)
-                            if md_table:
-                                tables_md.append(md_table)
+            page = session.plumber_page(page_idx)
+            if page is not None:
+                found = [(tuple(table.bbox), table.extract()) for table in page.find_tables()]
 
-            return tables_md
+            return self._tables_to_markdown(found)
 
-        except ImportError:
-            return []
         except Exception as e:
             logger.warning(f"Table extraction failed: {e}")
             return []
 
+        finally:
+            session.release_plumber_page(page)
+
+    def _tables_to_markdown(self, found: list) -> list:
+        """Convert (bbox, rows) tables to (bbox, markdown_table), dropping empty ones"""
+        tables = []
+        for bbox, table in found:
+            if table and len(table) > 0:
+                md_table = self._table_to_markdown(table)
+                if md_table:
+                    tables.append((bbox, md_table))
+        return tables
+
     def _table_to_markdown(self, table: list) -> str:
         """Convert table data to markdown table format"""
         if not table or len(table) < 1:
@@ -1658,335 +2203,291 @@ svg tspan {
 
         return '\n'.join(result_lines)
 
-    def _detect_repeated_headers_footers(self, pages_content: list) -> dict:
+    def _pdf_to_markdown_pdfplumber(self, pdf_path: str, profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                                    timings: Optional[PdfImportTimings] = None,
+                                    page_range: Optional[tuple] = None) -> Tuple[bool, str, str]:
         """
-        Detect repeated headers and footers across multiple pages.
-
-        Args:
-            pages_content: List of page contents, each being a list of lines
-
-        Returns:
-            dict with 'headers' and 'footers' sets of repeated text patterns
+        Fallback: Convert PDF to Markdown using pdfplumber
+        Uses cross-page header/footer detection and cross-page code block detection.
         """
-        import re
-
-        if len(pages_content) < 2:
-            return {'headers': set(), 'footers': set(), 'page_numbers': set()}
-
-        # Collect first N and last N lines from each page
-        NUM_LINES_TO_CHECK = 3
-
-        page_headers = []  # List of sets of header lines per page
-        page_footers = []  # List of sets of footer lines per page
-
-        for page_lines in pages_content:
-            if not page_lines:
-                page_headers.append(set())
-                page_footers.append(set())
-                continue
-
-            # Get first few non-empty lines (potential headers)
-            headers = set()
-            count = 0
-            for line in page_lines:
-                if line.strip():
-                    # Normalize the line (remove page numbers)
-                    normalized = self._normalize_for_comparison(line)
-                    if normalized:
-                        headers.add(normalized)
-                    count += 1
-                    if count >= NUM_LINES_TO_CHECK:
-                        break
-            page_headers.append(headers)
-
-            # Get last few non-empty lines (potential footers)
-            footers = set()
-            count = 0
-            for line in reversed(page_lines):
-                if line.strip():
-                    normalized = self._normalize_for_comparison(line)
-                    if normalized:
-                        footers.add(normalized)
-                    count += 1
-                    if count >= NUM_LINES_TO_CHECK:
-                        break
-            page_footers.append(footers)
-
-        # Find lines that appear in most pages (threshold: 50%+)
-        threshold = len(pages_content) // 2
-
-        # Count header occurrences
-        header_counts = {}
-        for headers in page_headers:
-            for h in headers:
-                header_counts[h] = header_counts.get(h, 0) + 1
-
-        # Count footer occurrences
-        footer_counts = {}
-        for footers in page_footers:
-            for f in footers:
-                footer_counts[f] = footer_counts.get(f, 0) + 1
-
-        repeated_headers = {h for h, count in header_counts.items() if count > threshold}
-        repeated_footers = {f for f, count in footer_counts.items() if count > threshold}
-
-        logger.debug(f"Detected repeated headers: {repeated_headers}")
-        logger.debug(f"Detected repeated footers: {repeated_footers}")
+        try:
+            writer = MarkdownStreamWriter()
+            for event in self._iter_pdf_markdown_pdfplumber(pdf_path, profile=profile, page_range=page_range):
+                writer.write(event['markdown'])
+                if timings is not None:
+                    timings.add_event(event)
+            writer.close()
+            return True, writer.getvalue(), ""
 
-        return {
-            'headers': repeated_headers,
-            'footers': repeated_footers
-        }
+        except ImportError as e:
+            error_msg = "pdfplumber가 설치되지 않았습니다.\n\npip install pdfplumber"
+            logger.error(error_msg)
+            return False, "", error_msg
 
-    def _normalize_for_comparison(self, text: str) -> str:
-        """
-        Normalize text for comparison, removing page numbers and dates.
-        Returns empty string if the line is just a page number.
+    def _group_chars_into_lines(self, chars: list, monospace_fonts: dict) -> list:
         """
-        import re
-
-        text = text.strip()
-
-        # Check if line is just a page number - remove entirely
-        page_number_patterns = [
-            r'^-?\s*\d+\s*-?$',  # Just number: "1", "- 1 -", "-1-"
-            r'^page\s*\d+$',  # "Page 1"
-            r'^\d+\s*/\s*\d+$',  # "1 / 10"
-            r'^p\.?\s*\d+$',  # "p.1", "p 1"
-            r'^\d+\s*페이지$',  # Korean: "1 페이지"
-            r'^제?\s*\d+\s*쪽$',  # Korean: "제 1 쪽"
-        ]
-
-        for pattern in page_number_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return ""  # This is just a page number, ignore it
-
-        # Remove page numbers from within text
-        text = re.sub(r'\s*-?\s*\d+\s*-?\s*$', '', text)  # Trailing page number
-        text = re.sub(r'^\s*-?\s*\d+\s*-?\s*', '', text)  # Leading page number
-        text = re.sub(r'\s*page\s*\d+\s*', ' ', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s*\d+\s*/\s*\d+\s*', ' ', text)
-
-        # Remove dates
-        date_patterns = [
-            r'\d{4}[-/\.]\d{1,2}[-/\.]\d{1,2}',  # 2024-01-01
-            r'\d{1,2}[-/\.]\d{1,2}[-/\.]\d{4}',  # 01-01-2024
-            r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일',  # Korean date
-        ]
-        for pattern in date_patterns:
-            text = re.sub(pattern, '', text)
-
-        return text.strip()
-
-    def _is_page_number_line(self, text: str) -> bool:
-        """Check if a line is just a page number."""
-        import re
-
-        text = text.strip()
-        if not text:
-            return False
+        Group pdfplumber chars into text lines
 
-        page_number_patterns = [
-            r'^-?\s*\d+\s*-?$',
-            r'^page\s*\d+$',
-            r'^\d+\s*/\s*\d+$',
-            r'^p\.?\s*\d+$',
-            r'^\d+\s*페이지$',
-            r'^제?\s*\d+\s*쪽$',
-        ]
-
-        for pattern in page_number_patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return True
-        return False
-
-    def _filter_repeated_content(self, pages_content: list) -> list:
-        """
-        Filter out repeated headers/footers from pages.
-        Keeps first occurrence of repeated headers, removes all page numbers.
+        Chars are grouped by their top position rounded to 0.1pt and ordered
+        by x0 within a line: a single stable NumPy sort over the whole page,
+        split wherever the line key changes.
 
         Args:
-            pages_content: List of page contents, each being a list of lines
+            chars: pdfplumber page chars
+            monospace_fonts: Cache of font name -> monospace verdict
 
         Returns:
-            Filtered list of page contents
+            List of (y, line_text, has_monospace_font, max_font_size) tuples in y order
         """
-        if len(pages_content) < 2:
-            return pages_content
-
-        # Detect repeated patterns
-        repeated = self._detect_repeated_headers_footers(pages_content)
-        repeated_headers = repeated['headers']
-        repeated_footers = repeated['footers']
+        from operator import itemgetter
+        import numpy as np
 
-        # Track which repeated headers we've already included
-        included_headers = set()
+        texts = list(map(itemgetter('text'), chars))
+        font_names = [char.get('fontname', '') for char in chars]
 
-        filtered_pages = []
+        # Monospace check once per distinct font
+        for font_name in set(font_names):
+            if font_name not in monospace_fonts:
+                monospace_fonts[font_name] = self._is_monospace_font(font_name.lower())
+        char_is_monospace = [monospace_fonts[font_name] for font_name in font_names]
 
-        for page_idx, page_lines in enumerate(pages_content):
-            filtered_lines = []
-
-            for line in page_lines:
-                # Skip page number lines
-                if self._is_page_number_line(line):
-                    continue
-
-                # Check if this is a repeated header/footer
-                normalized = self._normalize_for_comparison(line)
-
-                if normalized in repeated_headers:
-                    if normalized not in included_headers:
-                        # First occurrence - keep it
-                        included_headers.add(normalized)
-                        filtered_lines.append(line)
-                    # else: skip duplicate header
-                elif normalized in repeated_footers:
-                    # Skip repeated footers (usually copyright, page info etc.)
-                    continue
-                else:
-                    filtered_lines.append(line)
-
-            filtered_pages.append(filtered_lines)
-
-        return filtered_pages
-
-    def _pdf_to_markdown_pdfplumber(self, pdf_path: str) -> Tuple[bool, str, str]:
-        """
-        Fallback: Convert PDF to Markdown using pdfplumber
-        Uses BBox-based header/footer filtering and cross-page code block detection.
+        lines = []
+        count = len(chars)
+        top_array = np.fromiter(map(itemgetter('top'), chars), dtype=float, count=count)
+        x0_array = np.fromiter(map(itemgetter('x0'), chars), dtype=float, count=count)
+
+        # Line keys must match round(top, 1) exactly. rint(top * 10) / 10 gives the
+        # same value everywhere except right next to a .x5 tie, where the scaled
+        # value may have been rounded across the tie - those use round() itself.
+        scaled = top_array * 10
+        top_keys = np.rint(scaled) / 10
+        for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+            top_keys[i] = round(chars[i]['top'], 1)
+
+        # lexsort is stable: order by line key, then x0, then original index
+        order = np.lexsort((x0_array, top_keys))
+        sorted_keys = top_keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], count]
+        line_is_monospace = np.logical_or.reduceat(np.array(char_is_monospace, dtype=bool)[order], starts)
+        size_array = np.fromiter((char.get('size', 0) for char in chars), dtype=float, count=count)
+        line_font_size = np.maximum.reduceat(size_array[order], starts)
+
+        sorted_texts = [texts[i] for i in order.tolist()]
+        for y, start, end, is_monospace, font_size in zip(
+                sorted_keys[starts].tolist(), starts.tolist(), ends.tolist(),
+                line_is_monospace.tolist(), line_font_size.tolist()):
+            lines.append((y, ''.join(sorted_texts[start:end]), is_monospace, font_size))
+
+        return lines
+
+    def _iter_plumber_page_results(self, pdf, monospace_fonts: dict, profile, page_nums=None):
         """
-        try:
-            import pdfplumber
-
-            markdown_lines = []
-
-            # State for cross-page code block detection
-            in_code_block = False
-            code_buffer = []
-
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-
-                # Define header/footer regions - only for multi-page documents
-                use_filtering = total_pages > 2
-
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_height = page.height
+        Extract the pages of an open pdfplumber document, in page order
 
-                    if use_filtering:
-                        # Use conservative thresholds (top 5%, bottom 5%)
-                        header_threshold = page_height * 0.05
-                        footer_threshold = page_height * 0.95
-                    else:
-                        # No filtering for short documents
-                        header_threshold = 0
-                        footer_threshold = page_height
-
-                    # Extract tables first (with BBox filtering)
-                    tables = page.extract_tables()
-                    for table in tables:
+        Args:
+            pdf: Open pdfplumber document
+            monospace_fonts: Cache of font name -> monospace verdict
+            profile: PdfImportProfile deciding whether tables and code are detected
+            page_nums: Ascending page numbers to extract (default: all pages)
+
+        Yields:
+            dict with 'page_num', 'tables' (markdown tables), 'lines' as
+            (line_text, is_code, margin_keys) tuples, 'extract_time' and 'stage_times'
+        """
+        if page_nums is None:
+            page_nums = range(1, len(pdf.pages) + 1)
+
+        for page_num in page_nums:
+            page = pdf.pages[page_num - 1]
+            extract_start = time.perf_counter()
+            timer = StageTimer()
+            page_height = page.height
+
+            # Extract tables first
+            tables = []
+            if profile.tables:
+                with timer.stage('tables'):
+                    for table in page.extract_tables():
                         if table and len(table) > 0:
-                            # Flush code buffer before table
-                            if in_code_block and code_buffer:
-                                markdown_lines.append(self._format_code_block(code_buffer))
-                                code_buffer = []
-                                in_code_block = False
-
                             md_table = self._table_to_markdown(table)
                             if md_table:
-                                markdown_lines.append(f"\n{md_table}\n")
-
-                    # Extract text with position info using chars
-                    chars = page.chars
-                    if chars:
-                        # Group chars into lines by y-position
-                        lines_by_y = {}
-                        for char in chars:
-                            y = round(char['top'], 1)  # Round to group nearby chars
-                            if y not in lines_by_y:
-                                lines_by_y[y] = []
-                            lines_by_y[y].append(char)
-
-                        # Sort by y position and process each line
-                        for y in sorted(lines_by_y.keys()):
-                            # Skip header/footer regions (only if filtering enabled)
-                            if use_filtering and y < header_threshold and not in_code_block:
-                                continue
-                            if use_filtering and y > footer_threshold and not in_code_block:
-                                continue
-
-                            # Build line text from chars
-                            line_chars = sorted(lines_by_y[y], key=lambda c: c['x0'])
-                            line_text = ''.join(c['text'] for c in line_chars)
-
-                            # Check if this line looks like code
-                            is_code = self._looks_like_code(line_text)
-
-                            # Check font (if available)
-                            fonts = set(c.get('fontname', '') for c in line_chars)
-                            for font in fonts:
-                                if self._is_monospace_font(font.lower()):
-                                    is_code = True
-                                    break
-
-                            if is_code:
-                                if not in_code_block:
-                                    in_code_block = True
-                                code_buffer.append(line_text.rstrip())
-                            else:
-                                # Flush code buffer
-                                if in_code_block and code_buffer:
-                                    markdown_lines.append(self._format_code_block(code_buffer))
-                                    code_buffer = []
-                                    in_code_block = False
-
-                                # Add regular line
-                                if line_text.strip():
-                                    markdown_lines.append(line_text.strip())
+                                tables.append(md_table)
+
+            lines = []
+            code_seconds = 0.0
+            margin_seconds = 0.0
+
+            # Extract text with position info using chars
+            chars = page.chars
+            if chars:
+                # Lines in y order
+                for y, line_text, has_monospace_font, max_font_size in self._group_chars_into_lines(
+                        chars, monospace_fonts):
+                    # Check if this line looks like code, or uses a monospace font
+                    is_code = False
+                    if profile.code_blocks:
+                        code_start = time.perf_counter()
+                        is_code = has_monospace_font or self._looks_like_code(line_text)
+                        code_seconds += time.perf_counter() - code_start
+
+                    # Text set as a heading (font size >= 14) is never a running header
+                    margin_keys = []
+                    if max_font_size < 14:
+                        margin_start = time.perf_counter()
+                        margin_keys = RepeatedMarginDetector.text_keys(
+                            line_text, y, y + max_font_size, page_height
+                        )
+                        margin_seconds += time.perf_counter() - margin_start
 
-                    else:
-                        # Fallback: extract_text without position info
-                        text = page.extract_text()
-                        if text:
-                            for line in text.split('\n'):
-                                is_code = self._looks_like_code(line)
+                    lines.append((line_text, is_code, margin_keys))
 
-                                if is_code:
-                                    if not in_code_block:
-                                        in_code_block = True
-                                    code_buffer.append(line.rstrip())
-                                else:
-                                    if in_code_block and code_buffer:
-                                        markdown_lines.append(self._format_code_block(code_buffer))
-                                        code_buffer = []
-                                        in_code_block = False
+            else:
+                # Fallback: extract_text without position info
+                text = page.extract_text()
+                if text:
+                    for line in text.split('\n'):
+                        lines.append((line, profile.code_blocks and self._looks_like_code(line), []))
+
+            # Release cached layout objects of the processed page
+            page.flush_cache()
+
+            if profile.code_blocks:
+                timer.add('code', code_seconds)
+            timer.add('margins', margin_seconds)
+
+            # Everything not attributed to another stage is text extraction
+            extract_time = time.perf_counter() - extract_start
+            timer.add('text', extract_time - sum(timer.seconds.values()))
+
+            yield {
+                'page_num': page_num,
+                'tables': tables,
+                'lines': lines,
+                'extract_time': extract_time,
+                'stage_times': timer.seconds
+            }
+
+    def _iter_pdf_markdown_pdfplumber(self, pdf_path: str,
+                                      cancel_token: Optional[CancellationToken] = None,
+                                      profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                                      page_range: Optional[tuple] = None):
+        """
+        Fallback: Convert PDF to Markdown using pdfplumber, yielding one event per page
+        Events have the same shape as iter_pdf_to_markdown().
+        """
+        import pdfplumber
 
-                                    if line.strip():
-                                        markdown_lines.append(line.strip())
+        start_time = time.perf_counter()
+        import_profile = get_pdf_import_profile(profile)
+        timings = PdfImportTimings(profile)
+        has_output = False
+        total_tables = 0
 
-                    # Add page separator (but not if we're in a code block)
-                    if page_num < total_pages and not in_code_block:
-                        markdown_lines.append("\n---\n")
+        # Merge-stage timings of the current page
+        merge_timer = StageTimer()
 
-            # Flush remaining code buffer
-            if code_buffer:
-                markdown_lines.append(self._format_code_block(code_buffer))
+        # State for cross-page code block detection
+        code_block = CodeBlockAccumulator(
+            lambda code_lines: self._format_code_block_for_profile(code_lines, import_profile, merge_timer)
+        )
 
-            markdown_content = '\n'.join(markdown_lines)
+        # Running headers/footers recognized across pages
+        margin_detector = RepeatedMarginDetector()
 
-            # Clean up excessive newlines
-            import re
-            markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
+        # Monospace verdict per font name, shared by all pages
+        monospace_fonts = {}
 
-            logger.info(f"PDF converted to markdown with pdfplumber: {pdf_path}")
+        with pdfplumber.open(pdf_path) as pdf:
+            total_pages = len(pdf.pages)
+            first_page, last_page = resolve_page_range(page_range, total_pages)
 
-            return True, markdown_content.strip(), ""
+            page_results = margin_detector.lookahead(
+                self._iter_plumber_page_results(pdf, monospace_fonts, import_profile,
+                                                range(first_page, last_page + 1)),
+                lambda page_result: [line[2] for line in page_result['lines']]
+            )
+            for page_result in page_results:
+                page_num = page_result['page_num']
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    logger.info(f"PDF import cancelled before page {page_num}: {pdf_path}")
+                    return
+
+                merge_start = time.perf_counter()
+                merge_timer = StageTimer()
+                page_lines = []
+                page_tables = len(page_result['tables'])
+
+                for md_table in page_result['tables']:
+                    # Flush code buffer before table
+                    if code_block.in_code_block:
+                        page_lines.append(code_block.flush())
+                    page_lines.append(f"\n{md_table}\n")
+
+                for line_text, is_code, margin_keys in page_result['lines']:
+                    # Skip repeated headers/footers unless they continue an open code block
+                    if margin_detector.is_repeated(margin_keys) and not (code_block.in_code_block and is_code):
+                        margin_detector.blocks_removed += 1
+                        continue
+
+                    if is_code:
+                        code_block.add(line_text.rstrip())
+                    else:
+                        # Flush code buffer
+                        if code_block.in_code_block:
+                            page_lines.append(code_block.flush())
+
+                        # Add regular line
+                        if line_text.strip():
+                            page_lines.append(line_text.strip())
+
+                # Add page separator (but not if we're in a code block)
+                if page_num < last_page and not code_block.in_code_block:
+                    page_lines.append("\n---\n")
+
+                # Flush remaining code buffer
+                if page_num == last_page and code_block.lines:
+                    page_lines.append(code_block.flush())
+
+                # Chunks concatenate to '\n'.join() of all document lines
+                chunk = ""
+                if page_lines:
+                    chunk = ('\n' if has_output else '') + '\n'.join(page_lines)
+                    has_output = True
+
+                total_tables += page_tables
+
+                merge_time = time.perf_counter() - merge_start
+                stage_times = dict(page_result['stage_times'])
+                for stage, seconds in merge_timer.seconds.items():
+                    stage_times[stage] = stage_times.get(stage, 0.0) + seconds
+                    merge_time -= seconds
+                stage_times['merge'] = merge_time
+
+                event = {
+                    'page': page_num,
+                    'total_pages': total_pages,
+                    'first_page': first_page,
+                    'last_page': last_page,
+                    'markdown': chunk,
+                    'page_time': page_result['extract_time'] + time.perf_counter() - merge_start,
+                    'elapsed': time.perf_counter() - start_time,
+                    'images': 0,
+                    'tables': page_tables,
+                    'total_images': 0,
+                    'total_tables': total_tables,
+                    'cached': False,
+                    'stage_times': stage_times
+                }
+                timings.add_event(event)
+                yield event
+
+        if margin_detector.blocks_removed:
+            logger.info(f"Removed {margin_detector.blocks_removed} repeated header/footer lines")
+        logger.info(f"PDF converted to markdown with pdfplumber: {pdf_path} "
+                    f"(profile {profile}, peak RSS {peak_rss_mb():.0f} MB)")
+        logger.info(f"PDF import stage times: {timings.summary()}")
 
-        except ImportError as e:
-            error_msg = "pdfplumber가 설치되지 않았습니다.\n\npip install pdfplumber"
-            logger.error(error_msg)
-            return False, "", error_msg
     def markdown_to_html(self, markdown_content: str, output_path: str,
                          title: str = "Document") -> Tuple[bool, str]:
         """
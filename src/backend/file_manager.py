@@ -5,13 +5,14 @@ Stateless utility class for file I/O operations on markdown files
 
 import json
 import re
-import shutil
 import sys
 import os
 from pathlib import Path
 from typing import Optional, Tuple, List
 from datetime import datetime
 
+from backend.image_store import ImageStore
+
 
 class FileManager:
     """Stateless utility class for file operations"""
@@ -195,35 +196,21 @@ class FileManager:
         project_root = Path(__file__).parent.parent.parent
 
         # Create images folder: {md_filename}_images/
+        # (the store only creates it once an image is written)
         images_dir = md_path.parent / f"{md_path.stem}_images"
 
-        # Only create folder if there are actually images to move
-        moved_count = 0
-
-        for temp_path in temp_images:
-            src = project_root / temp_path
-
-            if src.exists():
-                # Create images folder only when first image is moved
-                if moved_count == 0:
-                    images_dir.mkdir(exist_ok=True)
-
-                # Move image to new location
-                dest = images_dir / src.name
-
-                # Handle duplicate filenames
-                counter = 1
-                while dest.exists():
-                    stem = src.stem
-                    suffix = src.suffix
-                    dest = images_dir / f"{stem}_{counter}{suffix}"
-                    counter += 1
+        with ImageStore(images_dir) as image_store:
+            for temp_path in temp_images:
+                src = project_root / temp_path
 
-                shutil.move(str(src), str(dest))
-                moved_count += 1
+                if src.exists():
+                    # Move image to new location; an identical image already
+                    # in the folder is reused instead of stored under a new name
+                    dest_name = image_store.add_file(src)
+                    ImageStore.remove_file(src)
 
-                # Update markdown content with new relative path
-                new_relative_path = f"./{images_dir.name}/{dest.name}"
-                content = content.replace(temp_path, new_relative_path)
+                    # Update markdown content with new relative path
+                    new_relative_path = f"./{images_dir.name}/{dest_name}"
+                    content = content.replace(temp_path, new_relative_path)
 
         return content
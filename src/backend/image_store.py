@@ -0,0 +1,321 @@
+"""
+Image Store Module
+Content-addressed writing of extracted and inserted images
+"""
+
+import os
+import stat
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_OBJECTS_DIR = Path.home() / '.saekim' / 'images'
+
+READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH  # 0444
+
+
+class ImageStore:
+    """
+    Writes the images of one folder, each unique content only once
+
+    Images are identified by the SHA-256 of their bytes:
+    - Bytes already stored in this folder return the existing file name, so
+      the markdown references one file.
+    - With an objects_dir, bytes already written anywhere else are
+      hard-linked from there. Only PDF import output, whose file names the
+      converter owns, uses one; images the user inserts are their own
+      files and only deduplicated within their folder.
+      Hard links are indexed by digest in objects_dir
+      (<objects_dir>/<2 hex>/<digest>), so the filesystem is the hash
+      index: one stat or link per image, no directory scans, and safe to
+      share between processes. Indexed images are read-only (0444), so
+      no program edits a file in place that other folders link to, and an
+      object is verified by its digest before every link.
+    - Only new bytes are written, to a temporary file that is then moved
+      into place.
+    - A file name taken by different content gets the digest appended,
+      instead of probing for a free _1, _2... suffix.
+
+    Objects no other folder links to any more are pruned at most once a day.
+
+    add() decides the file name from the content right away. put() stores
+    under a name the caller owns and leaves hashing to the writer: with
+    background=True writes run on a single worker thread, so an import can
+    go on with the next page meanwhile. close() waits for all pending writes.
+    """
+
+    MAX_PENDING_WRITES = 8  # Images held in memory for the writer thread
+    PRUNE_INTERVAL = 24 * 60 * 60
+    PRUNE_MARKER = ".last-prune"
+
+    def __init__(self, images_dir, objects_dir: Optional[Path] = None,
+                 background: bool = False):
+        """
+        Initialize the store
+
+        Args:
+            images_dir: Folder the images are written to
+            objects_dir: Hard-link index shared by all folders, for PDF import
+                         output only (None = only deduplicate within images_dir)
+            background: Write files on a worker thread
+        """
+        self.images_dir = Path(images_dir)
+        self.objects_dir = Path(objects_dir) if objects_dir else None
+        self.written = 0  # Images written to disk
+        self.linked = 0  # Images hard-linked from an identical image
+        self.referenced = 0  # Images resolved to a file already in this folder
+        self.failed = 0
+
+        self._closed = False
+        self._names = {}  # digest -> file name in images_dir
+        self._reserved = {}  # file name -> digest, for names not written yet
+        self._executor = None
+        self._slots = None
+        if background:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-store')
+            self._slots = threading.BoundedSemaphore(self.MAX_PENDING_WRITES)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def file_digest(path) -> str:
+        with open(path, 'rb') as f:
+            return ImageStore.digest(f.read())
+
+    @staticmethod
+    def replace_file(source, target):
+        """os.replace() that also replaces a read-only target (refused on Windows)"""
+        try:
+            os.replace(source, target)
+        except PermissionError:
+            os.chmod(target, stat.S_IWRITE | READ_ONLY)
+            os.replace(source, target)
+
+    @staticmethod
+    def remove_file(path):
+        """os.unlink() that also removes a read-only file (refused on Windows)"""
+        try:
+            os.unlink(path)
+        except PermissionError:
+            os.chmod(path, stat.S_IWRITE | READ_ONLY)
+            os.unlink(path)
+
+    def add(self, data: bytes, file_name: str, overwrite: bool = False) -> str:
+        """
+        Store image bytes
+
+        Args:
+            data: Image bytes
+            file_name: Preferred file name inside images_dir
+            overwrite: Replace a different file of the same name (names the
+                       caller owns, e.g. re-imported PDF images) instead of
+                       choosing another name
+
+        Returns:
+            File name of the image inside images_dir
+        """
+        digest = self.digest(data)
+
+        name = self._names.get(digest)
+        if name is None:
+            name, stored = self._choose_name(file_name, digest, len(data), overwrite)
+            self._names[digest] = name
+            if not stored:
+                self._schedule_write(data, digest, name)
+                return name
+
+        self.referenced += 1
+        return name
+
+    def put(self, data: bytes, file_name: str):
+        """
+        Store image bytes under file_name, replacing a different file of that name
+
+        The file is left alone if it already holds these bytes.
+        """
+        self._schedule_write(data, None, file_name)
+
+    def add_file(self, source_path, file_name: Optional[str] = None) -> str:
+        """Store the content of an image file; returns its file name inside images_dir"""
+        source_path = Path(source_path)
+        with open(source_path, 'rb') as f:
+            data = f.read()
+        return self.add(data, file_name or source_path.name)
+
+    def close(self):
+        """Wait for pending writes and prune the shared index if it is due"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self.written or self.linked or self.referenced:
+            logger.info(f"Image store {self.images_dir}: {self.written} written, "
+                        f"{self.linked} linked, {self.referenced} referenced"
+                        + (f", {self.failed} failed" if self.failed else ""))
+        self._prune_if_due()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def _choose_name(self, file_name: str, digest: str, size: int, overwrite: bool) -> tuple:
+        """
+        Pick the file name for new content
+
+        Returns:
+            (file name, True if that file already holds the content)
+        """
+        candidates = [file_name]
+        if not overwrite:
+            path = Path(file_name)
+            candidates += [f"{path.stem}_{digest[:8]}{path.suffix}", f"{digest}{path.suffix}"]
+
+        for name in candidates:
+            reserved_digest = self._reserved.get(name)
+            if reserved_digest is not None:
+                if reserved_digest == digest:
+                    return name, True
+            elif self._is_same_image(self.images_dir / name, digest, size):
+                return name, True
+            elif overwrite or not (self.images_dir / name).exists():
+                return name, False
+
+        # Not reached for content-derived names in practice; replace the last one
+        return candidates[-1], False
+
+    def _object_path(self, digest: str) -> Optional[Path]:
+        if self.objects_dir is None:
+            return None
+        return self.objects_dir / digest[:2] / digest
+
+    def _is_same_image(self, path: Path, digest: str, size: int) -> bool:
+        """Check if the file at path holds the image with this digest"""
+        try:
+            file_stat = path.stat()
+        except OSError:
+            return False
+        if file_stat.st_size != size:
+            return False
+
+        # A read-only link of the indexed object cannot have been edited in place
+        object_path = self._object_path(digest)
+        if object_path is not None and not file_stat.st_mode & 0o222:
+            try:
+                if os.path.samefile(path, object_path):
+                    return True
+            except OSError:
+                pass
+
+        return self.file_digest(path) == digest
+
+    def _schedule_write(self, data: bytes, digest: Optional[str], name: str):
+        if digest is not None:
+            self._reserved[name] = digest
+        if self._executor is None:
+            self._write(data, digest, name)
+            return
+
+        # Bounded, so a fast import cannot pile up image bytes in memory
+        self._slots.acquire()
+        future = self._executor.submit(self._write, data, digest, name)
+        future.add_done_callback(lambda _: self._slots.release())
+
+    def _write(self, data: bytes, digest: Optional[str], name: str):
+        target = self.images_dir / name
+        temp_path = self.images_dir / f".{name}.tmp-{os.getpid()}-{threading.get_ident()}"
+
+        try:
+            if digest is None:
+                # put(): hashed here, on the writer thread
+                digest = self.digest(data)
+                if self._is_same_image(target, digest, len(data)):
+                    self.referenced += 1
+                    return
+
+            object_path = self._object_path(digest)
+            self.images_dir.mkdir(parents=True, exist_ok=True)
+
+            # Identical bytes written before: link them
+            if object_path is not None and self._link(object_path, temp_path, digest, len(data)):
+                self.replace_file(temp_path, target)
+                self.linked += 1
+                return
+
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            self.replace_file(temp_path, target)
+            self.written += 1
+
+            if object_path is not None:
+                try:
+                    object_path.parent.mkdir(parents=True, exist_ok=True)
+                    os.link(target, object_path)
+                    os.chmod(target, READ_ONLY)
+                except OSError:
+                    pass  # Already indexed, or the index is on another filesystem
+
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Failed to write image {target}: {e}")
+            try:
+                self.remove_file(temp_path)
+            except OSError:
+                pass
+
+        finally:
+            self._reserved.pop(name, None)
+
+    def _link(self, object_path: Path, link_path: Path, digest: str, size: int) -> bool:
+        """Hard-link an indexed image, dropping index entries edited since"""
+        try:
+            if object_path.stat().st_size != size or self.file_digest(object_path) != digest:
+                self.remove_file(object_path)
+                return False
+            os.chmod(object_path, READ_ONLY)
+            os.link(object_path, link_path)
+            return True
+        except OSError:
+            return False
+
+    def _prune_if_due(self):
+        """Remove index entries whose images were deleted everywhere else"""
+        if self.objects_dir is None or not self.objects_dir.exists():
+            return
+
+        marker = self.objects_dir / self.PRUNE_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < self.PRUNE_INTERVAL:
+                return
+        except OSError:
+            pass
+
+        marker.touch()
+        pruned = 0
+        for bucket in self.objects_dir.iterdir():
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket):
+                try:
+                    if entry.stat(follow_symlinks=False).st_nlink <= 1:
+                        self.remove_file(entry.path)
+                        pruned += 1
+                except OSError:
+                    continue
+        if pruned:
+            logger.info(f"Pruned {pruned} unreferenced images from {self.objects_dir}")
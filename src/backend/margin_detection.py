@@ -0,0 +1,157 @@
+"""
+Margin Detection Module
+Cross-page detection of running headers, footers and page numbers in imported PDFs
+"""
+
+import re
+import math
+import hashlib
+from collections import deque
+
+_WHITESPACE = re.compile(r'\s+')
+_DIGITS = re.compile(r'\d+')
+_LETTERS = re.compile(r'[^\W\d_]')
+
+
+class RepeatedMarginDetector:
+    """
+    Detects running headers and footers by their recurrence across pages
+
+    Every short text block (or line) that lies entirely inside the top or
+    bottom band of a page is hashed from its normalized text - whitespace
+    collapsed, case folded, digits of short number tokens replaced, so page
+    numbers and dates match - together with its quantized distance from the
+    page edge. Body text is never a candidate: a block reaching past the band,
+    with more than MAX_LINES lines or a line longer than MAX_LINE_CHARS, has
+    no keys, and numbers inside words or long tokens are kept, so body lines
+    that only differ by numbers do not look repeated. Recurrences are counted
+    in a hash map, so the total cost is linear in the number of lines.
+
+    A key counts as a header/footer once it was seen on at least MIN_REPEATS
+    pages and on at least MIN_DENSITY of the pages between its first and last
+    occurrence. Running headers, page numbers and logos recur on (almost)
+    every page; a chapter heading at the top of a page recurs once per
+    chapter at best, so it is kept.
+
+    Positions are quantized on two grids offset by half a cell, and a block
+    gets a key on each: two positions less than half a cell apart always
+    share a key, so small jitter between pages does not split the counts.
+
+    Keys are stable hex digests, so they can be computed in worker processes
+    and stored with cached page results.
+    """
+
+    MARGIN_RATIO = 0.08  # Top/bottom share searched for headers/footers, inside a 1-inch margin
+    MAX_LINES = 2  # Lines of a header/footer block
+    MAX_LINE_CHARS = 80  # Characters of a header/footer line
+    MAX_NUMBER_CHARS = 12  # Length of a number token whose digits are masked ("12/340", dates)
+    POSITION_QUANTUM = 8.0  # Grid cell size in points
+    MIN_REPEATS = 3
+    MIN_DENSITY = 0.4
+    LOOKAHEAD_PAGES = 16  # Pages observed before a page is emitted
+
+    def __init__(self):
+        self._stats = {}  # key -> [page count, first page, last page]
+        self.pages_observed = 0
+        self.blocks_removed = 0
+
+    @classmethod
+    def text_keys(cls, text: str, top: float, bottom: float, page_height: float) -> list:
+        """
+        Keys of a text block or line
+
+        Args:
+            text: Text of the block
+            top, bottom: Vertical extent of the block
+            page_height: Height of the page
+
+        Returns:
+            List of keys; empty for text in the page body
+        """
+        lines = [line for line in text.splitlines() if line.strip()]
+        if not lines or len(lines) > cls.MAX_LINES or \
+                any(len(line.strip()) > cls.MAX_LINE_CHARS for line in lines):
+            return []
+        tokens = _WHITESPACE.sub(' ', text).strip().casefold().split(' ')
+        normalized = ' '.join(
+            _DIGITS.sub('#', token)
+            if len(token) <= cls.MAX_NUMBER_CHARS and not _LETTERS.search(token) else token
+            for token in tokens
+        )
+        return cls._keys(normalized, top, bottom, page_height)
+
+    @classmethod
+    def image_keys(cls, xref: int, top: float, bottom: float, page_height: float) -> list:
+        """Keys of an image, identified by its xref"""
+        return cls._keys(f"\0image {xref}", top, bottom, page_height)
+
+    @classmethod
+    def _keys(cls, normalized: str, top: float, bottom: float, page_height: float) -> list:
+        # Only blocks entirely inside a band; body text starting in it is kept
+        if bottom <= page_height * cls.MARGIN_RATIO:
+            band, distance = 'header', top
+        elif top >= page_height * (1 - cls.MARGIN_RATIO):
+            band, distance = 'footer', page_height - bottom
+        else:
+            return []
+
+        cell = distance / cls.POSITION_QUANTUM
+        keys = []
+        for grid, offset in (('a', 0.0), ('b', 0.5)):
+            key_source = f"{band}|{grid}{math.floor(cell + offset)}|{normalized}"
+            keys.append(hashlib.blake2b(key_source.encode('utf-8'), digest_size=8).hexdigest())
+        return keys
+
+    def observe(self, page_num: int, page_keys):
+        """
+        Count the keys of one page
+
+        Pages must be observed in page order.
+
+        Args:
+            page_num: 1-based page number
+            page_keys: Iterable of key lists, one per block of the page
+        """
+        self.pages_observed += 1
+        stats = self._stats
+        for key in {key for keys in page_keys for key in keys}:
+            entry = stats.get(key)
+            if entry is None:
+                stats[key] = [1, page_num, page_num]
+            else:
+                entry[0] += 1
+                entry[2] = page_num
+
+    def lookahead(self, page_results, page_keys):
+        """
+        Observe pages ahead of the pages being emitted
+
+        Yields the page results in order, each one only after the next
+        LOOKAHEAD_PAGES pages have been observed (or the document ended), so
+        headers are recognized on the first pages too while output still
+        streams page by page.
+
+        Args:
+            page_results: Iterable of page dicts with a 'page_num'
+            page_keys: Callable returning the key lists of a page dict
+        """
+        pending = deque()
+        for page_result in page_results:
+            self.observe(page_result['page_num'], page_keys(page_result))
+            pending.append(page_result)
+            if len(pending) > self.LOOKAHEAD_PAGES:
+                yield pending.popleft()
+
+        while pending:
+            yield pending.popleft()
+
+    def is_repeated(self, keys: list) -> bool:
+        """Check if a block with the given keys is a repeated header/footer"""
+        for key in keys:
+            entry = self._stats.get(key)
+            if entry is None:
+                continue
+            count, first_page, last_page = entry
+            if count >= self.MIN_REPEATS and count >= self.MIN_DENSITY * (last_page - first_page + 1):
+                return True
+        return False
@@ -0,0 +1,122 @@
+"""
+Markdown Stream Writer Module
+Incremental clean-up and output of converted markdown, page chunk by page chunk
+"""
+
+import io
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from utils.logger import get_logger
+
+logger = get_logger()
+
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+
+
+class MarkdownStreamWriter:
+    """
+    Streaming equivalent of DocumentConverter.finalize_markdown()
+
+    Writing the chunks of an import one by one produces exactly
+    finalize_markdown(''.join(chunks)): runs of three or more newlines are
+    collapsed to a blank line and the document is stripped. Trailing
+    whitespace of the text written so far is held back until more text
+    arrives, because a newline run may continue in the next chunk and
+    whitespace at the very end is dropped.
+
+    Output goes to a markdown file (written to a temporary file and moved
+    into place on close, so a failed import never leaves a partial file)
+    or to an in-memory buffer when no path is given.
+    """
+
+    def __init__(self, file_path: Optional[str] = None, encoding: str = 'utf-8'):
+        """
+        Initialize the writer
+
+        Args:
+            file_path: Destination markdown file (None = keep in memory)
+            encoding: File encoding
+        """
+        self.file_path = Path(file_path) if file_path else None
+        self.characters_written = 0
+        self._pending = ""  # Trailing whitespace not written yet
+        self._started = False
+        self._closed = False
+
+        if self.file_path is None:
+            self._temp_path = None
+            self._output = io.StringIO()
+        else:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            self._temp_path = self.file_path.with_name(f"{self.file_path.name}.tmp-{os.getpid()}")
+            self._output = open(self._temp_path, 'w', encoding=encoding)
+
+    def write(self, chunk: str):
+        """Append a chunk of converted markdown"""
+        body = chunk.rstrip()
+        if not body:
+            self._pending += chunk
+            return
+
+        text = self._pending + body
+        self._pending = chunk[len(body):]
+
+        if not self._started:
+            text = text.lstrip()
+            self._started = True
+
+        # Written text always ends on a non-whitespace character, so every
+        # newline run in text is complete
+        text = _EXCESS_NEWLINES.sub('\n\n', text)
+        self._output.write(text)
+        self.characters_written += len(text)
+
+    def getvalue(self, include_pending: bool = False) -> str:
+        """
+        Markdown written to the in-memory buffer
+
+        Args:
+            include_pending: Also return the held-back trailing whitespace, so
+                             that chunks appended later join up as in the source
+        """
+        if self.file_path is not None:
+            raise ValueError("getvalue() is only available for in-memory writers")
+        value = self._output.getvalue()
+        return value + self._pending if include_pending else value
+
+    def close(self):
+        """Finish the document; a file target is moved into place"""
+        if self._closed:
+            return
+        self._closed = True
+        self._pending = ""
+
+        if self.file_path is not None:
+            self._output.close()
+            os.replace(self._temp_path, self.file_path)
+
+    def abort(self):
+        """Discard a file target without touching the destination file"""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.file_path is not None:
+            self._output.close()
+            try:
+                os.remove(self._temp_path)
+            except OSError as e:
+                logger.warning(f"Failed to remove {self._temp_path}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,126 @@
+"""
+PDF Assets Module
+Stylesheets and fonts of the PDF export page, served to the browser from memory
+"""
+
+import re
+import mimetypes
+import threading
+from pathlib import Path
+from typing import Optional
+from urllib.request import url2pathname
+
+from backend.file_manager import FileManager
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Origin the export page loads its assets from; requests to it are answered
+# by the export browser's request handler and never reach the network
+ASSET_ORIGIN = 'https://saekim.assets'
+
+KATEX_VERSION = '0.16.9'
+
+# Asset folder under ASSET_ORIGIN -> folder in src/ui/vendor
+PDF_ASSET_DIRS = {
+    'katex': 'ui/vendor/katex',
+}
+
+# Local files under ASSET_ORIGIN: LOCAL_URL + the path of the file:// URL.
+# Export documents are served from memory at a URL in their document's
+# folder, so relative image paths resolve against that folder
+LOCAL_URL = f'{ASSET_ORIGIN}/local'
+
+# file:// URLs in src/href attributes (the preview makes image paths absolute);
+# a page on ASSET_ORIGIN may not load file:// URLs itself
+_FILE_URL_ATTRIBUTE = re.compile(r'(\b(?:src|href)\s*=\s*["\']?)file://', re.IGNORECASE)
+
+# Set by the export page once its fonts and images are ready to print
+RENDER_COMPLETE_FLAG = 'window.saekimRenderComplete === true'
+
+# Injected into every export page before its own scripts: the load event
+# covers stylesheets and images, document.fonts.ready the web fonts
+RENDER_COMPLETE_SCRIPT = """
+window.addEventListener('load', () => {
+    document.fonts.ready.then(() => { window.saekimRenderComplete = true; });
+});
+"""
+
+mimetypes.add_type('font/woff2', '.woff2')
+mimetypes.add_type('font/woff', '.woff')
+
+
+def asset_url(path: str) -> str:
+    """URL of a bundled asset for the export page, e.g. asset_url('katex/katex.min.css')"""
+    return f"{ASSET_ORIGIN}/{path}"
+
+
+def local_url(path) -> str:
+    """ASSET_ORIGIN URL of a local file (see LOCAL_URL)"""
+    return LOCAL_URL + Path(path).resolve().as_uri()[len('file://'):]
+
+
+def local_path(url: str) -> Optional[Path]:
+    """Local file a LOCAL_URL URL stands for, None for other URLs"""
+    if not url.startswith(LOCAL_URL + '/'):
+        return None
+    url_path = url[len(LOCAL_URL):].split('?', 1)[0].split('#', 1)[0]
+    return Path(url2pathname(url_path))
+
+
+def rewrite_file_urls(html: str) -> str:
+    """Point file:// URLs of src/href attributes to LOCAL_URL"""
+    return _FILE_URL_ATTRIBUTE.sub(lambda match: match.group(1) + LOCAL_URL, html)
+
+
+class PdfAssets:
+    """
+    Bundled export assets, read from src/ui/vendor once and kept in memory
+
+    Assets are fetched into src/ui/vendor by fetch_pdf_assets.py, which
+    saekim.spec runs before bundling src/ui. A missing asset is never
+    fetched from the network; the request gets a 404 right away.
+    """
+
+    def __init__(self):
+        self._cache = {}  # path -> (body, content type)
+        self._lock = threading.Lock()
+        self._missing_logged = set()
+
+    def resolve(self, url: str) -> Optional[tuple]:
+        """
+        Look up the asset a request of the export page asks for
+
+        Args:
+            url: Requested URL
+
+        Returns:
+            (body, content_type) for a bundled asset, None for URLs outside
+            ASSET_ORIGIN and for unknown or missing assets
+        """
+        if not url.startswith(ASSET_ORIGIN + '/'):
+            return None
+        path = url[len(ASSET_ORIGIN) + 1:].split('?', 1)[0].split('#', 1)[0]
+        folder, _, name = path.partition('/')
+        if folder not in PDF_ASSET_DIRS or not name or '..' in name.split('/'):
+            return None
+
+        with self._lock:
+            asset = self._cache.get(path)
+            if asset is not None:
+                return asset
+
+            vendor_dir = PDF_ASSET_DIRS[folder]
+            asset_path = Path(FileManager.resource_path(vendor_dir)) / name
+            try:
+                body = asset_path.read_bytes()
+            except OSError:
+                if folder not in self._missing_logged:
+                    logger.warning(f"PDF export assets missing in {vendor_dir}, exporting without them "
+                                   f"(run src/fetch_pdf_assets.py to bundle them)")
+                    self._missing_logged.add(folder)
+                return None
+
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            asset = self._cache[path] = (body, content_type)
+            return asset
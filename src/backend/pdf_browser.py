@@ -0,0 +1,350 @@
+"""
+PDF Browser Module
+Long-lived headless Chromium that renders HTML documents to PDF
+"""
+
+import sys
+import asyncio
+import itertools
+from pathlib import Path
+from typing import Optional
+
+from backend.pdf_assets import (
+    ASSET_ORIGIN, PdfAssets, RENDER_COMPLETE_FLAG, RENDER_COMPLETE_SCRIPT,
+    local_path, local_url, rewrite_file_urls
+)
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Seconds without exports after which Chromium is closed
+DEFAULT_BROWSER_IDLE_TIMEOUT = 2 * 60
+
+# Rendered pages kept open for the next exports
+MAX_IDLE_PAGES = 2
+
+# Longest wait for the page's render-complete signal before printing anyway (ms)
+RENDER_TIMEOUT_MS = 30 * 1000
+
+# Longest wait for a remote image of the document (ms); slower images are left out
+REMOTE_IMAGE_TIMEOUT_MS = 10 * 1000
+
+# Page layout of exported PDFs
+PDF_OPTIONS = {
+    'format': 'A4',
+    'margin': {
+        'top': '2.5cm',
+        'bottom': '2.5cm',
+        'left': '2.5cm',
+        'right': '2.5cm'
+    },
+    'print_background': True,
+    'display_header_footer': True,
+    'header_template': '<div></div>',
+    'footer_template': '''
+        <div style="font-size: 10px; text-align: center; width: 100%; color: #666;">
+            <span class="pageNumber"></span> / <span class="totalPages"></span>
+        </div>
+    ''',
+}
+
+
+def bundled_browser_path() -> Optional[Path]:
+    """Chromium shipped inside the frozen executable, None when running from source"""
+    if not getattr(sys, 'frozen', False):
+        return None
+    # Path: _MEIPASS/ms-playwright/chromium-1194/chrome-win/chrome.exe
+    return Path(sys._MEIPASS) / 'ms-playwright' / 'chromium-1194' / 'chrome-win' / 'chrome.exe'
+
+
+def browser_launch_options() -> dict:
+    """Options for launching the export browser"""
+    launch_options = {'headless': True}
+
+    # If frozen (exe), use bundled browser
+    bundled_path = bundled_browser_path()
+    if bundled_path is not None:
+        if bundled_path.exists():
+            launch_options['executable_path'] = str(bundled_path)
+            logger.info(f"Using bundled browser at: {bundled_path}")
+        else:
+            logger.warning(f"Bundled browser not found at {bundled_path}, trying default lookup")
+    return launch_options
+
+
+class PdfBrowserService:
+    """
+    Headless Chromium kept running between PDF exports
+
+    Starting Playwright and launching Chromium takes most of a short export,
+    so the browser is launched on the first export and kept for the next
+    ones, which reuse its pages. A browser that crashed or was closed is
+    launched again by the next export (an export interrupted by the crash is
+    retried once), and the browser is closed after idle_timeout seconds
+    without exports. Several exports can render at once, each in its own page.
+
+    Export pages never touch temp files: the documents and their
+    stylesheets and fonts are answered from memory (PdfAssets) and local
+    images are read from disk. Remote images of the document are fetched
+    with a REMOTE_IMAGE_TIMEOUT_MS limit each and reported by render_pdf()
+    when they could not be loaded; other web requests are blocked.
+    Pages are printed as soon as they signal that fonts and images are
+    ready (RENDER_COMPLETE_SCRIPT), instead of after network idle and a
+    fixed delay.
+
+    Playwright objects belong to the event loop they were created on, so all
+    coroutines of the service must run on one loop (the converter's
+    AsyncLoopThread); close() it before that loop stops.
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_BROWSER_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.launches = 0  # Browser launches so far, for benchmarks and logs
+        self.assets = PdfAssets()
+        self._documents = {}  # Path the document is served at -> HTML being rendered
+        self._missing_images = {}  # Page being rendered -> remote image URLs not loaded
+        self._document_ids = itertools.count(1)
+
+        # Only touched from the event loop
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._idle_pages = []
+        self._launch_lock = asyncio.Lock()
+        self._active = 0
+        self._idle_handle = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a browser is currently launched"""
+        browser = self._browser
+        return browser is not None and browser.is_connected()
+
+    async def render_pdf(self, html: str, output_path: str, base_dir: Optional[Path] = None):
+        """
+        Render an HTML document in the browser and print it to a PDF file
+
+        The page loads the document from memory at a URL inside base_dir (see
+        LOCAL_URL), so relative paths in it resolve against that folder.
+
+        Args:
+            html: Complete HTML document
+            output_path: Path to save PDF
+            base_dir: Folder relative paths in the document point into
+                      (default: current directory)
+
+        Returns:
+            URLs of remote images that could not be loaded (left out of the PDF)
+
+        Raises:
+            ImportError: If Playwright is not installed
+            Exception: Playwright errors, if rendering failed twice
+        """
+        document_url = local_url(Path(base_dir or '.') / f".saekim-export-{next(self._document_ids)}.html")
+        document_path = local_path(document_url)
+        self._documents[document_path] = rewrite_file_urls(html).encode('utf-8')
+
+        self._active += 1
+        self._cancel_idle_close()
+        try:
+            for attempt in range(2):
+                page = await self._acquire_page()
+                self._missing_images[page] = missing_images = []
+                try:
+                    await page.goto(document_url, wait_until='domcontentloaded')
+                    await self._wait_until_rendered(page)
+                    await page.pdf(path=output_path, **PDF_OPTIONS)
+                except BaseException as e:
+                    # Also when cancelled (export time limit)
+                    asyncio.ensure_future(self._discard_page(page))
+                    if isinstance(e, Exception) and attempt == 0 and not self.is_running:
+                        logger.warning("PDF browser crashed during export, relaunching")
+                        continue
+                    raise
+                finally:
+                    self._missing_images.pop(page, None)
+                self._release_page(page)
+                return missing_images
+        finally:
+            del self._documents[document_path]
+            self._active -= 1
+            if not self._active:
+                self._schedule_idle_close()
+
+    async def warm_up(self):
+        """
+        Launch the browser ahead of an export (kept until idle_timeout)
+
+        Raises:
+            Exception: If Playwright or Chromium cannot be started
+        """
+        self._cancel_idle_close()
+        await self._ensure_browser()
+        if not self._active:
+            self._schedule_idle_close()
+
+    async def close(self):
+        """Close the browser and stop Playwright; the next export launches them again"""
+        self._cancel_idle_close()
+        await self._close_browser()
+        await self._stop_playwright()
+        # The next export may run on a new loop
+        self._launch_lock = asyncio.Lock()
+
+    async def _wait_until_rendered(self, page):
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        try:
+            await page.wait_for_function(RENDER_COMPLETE_FLAG, timeout=RENDER_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            logger.warning(f"PDF export page not rendered after {RENDER_TIMEOUT_MS / 1000:g}s, "
+                           f"printing it anyway")
+
+    async def _route(self, route):
+        """
+        Answer export page requests: documents and assets from memory, local
+        files from disk, remote images from the network
+        """
+        url = route.request.url
+        file_path = local_path(url)
+        if file_path is not None:
+            document = self._documents.get(file_path)
+            if document is not None:
+                await route.fulfill(body=document, content_type='text/html; charset=utf-8')
+            elif file_path.is_file():
+                await route.fulfill(path=file_path)
+            else:
+                await route.fulfill(status=404)
+            return
+
+        if url.startswith(ASSET_ORIGIN + '/'):
+            asset = self.assets.resolve(url)
+            if asset is None:
+                # Never fetched from the network: a missing asset fails at once
+                await route.fulfill(status=404)
+                return
+            body, content_type = asset
+            # Fonts are loaded cross-origin from the file:// page
+            await route.fulfill(body=body, content_type=content_type,
+                                headers={'Access-Control-Allow-Origin': '*'})
+        elif url.startswith(('http://', 'https://')):
+            if route.request.resource_type == 'image':
+                await self._fetch_remote_image(route)
+            else:
+                logger.info(f"Blocked network request of PDF export page: {url}")
+                await route.abort()
+        else:
+            await route.continue_()
+
+    async def _fetch_remote_image(self, route):
+        """Load a remote image of the document; one not loaded in time is left out and reported"""
+        url = route.request.url
+        try:
+            response = await route.fetch(timeout=REMOTE_IMAGE_TIMEOUT_MS)
+            await route.fulfill(response=response)
+            if response.ok:
+                return
+            error = f"HTTP {response.status}"
+        except Exception as e:
+            error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            try:
+                await route.abort()
+            except Exception:
+                pass  # The page is gone
+
+        logger.warning(f"Remote image of PDF export not loaded: {url} ({error})")
+        missing_images = self._missing_images.get(route.request.frame.page)
+        if missing_images is not None:
+            missing_images.append(url)
+
+    async def _acquire_page(self):
+        while self._idle_pages:
+            page = self._idle_pages.pop()
+            if not page.is_closed():
+                return page
+        context = await self._ensure_browser()
+        return await context.new_page()
+
+    def _release_page(self, page):
+        if len(self._idle_pages) < MAX_IDLE_PAGES and self.is_running and not page.is_closed():
+            self._idle_pages.append(page)
+        else:
+            asyncio.ensure_future(self._discard_page(page))
+
+    async def _discard_page(self, page):
+        try:
+            await page.close()
+        except Exception:
+            pass  # Already gone with its browser
+
+    async def _ensure_browser(self):
+        """Launch Playwright and Chromium unless they are running"""
+        async with self._launch_lock:
+            if self._context is not None and self.is_running:
+                return self._context
+
+            await self._close_browser()
+            from playwright.async_api import async_playwright
+
+            try:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                browser = await self._playwright.chromium.launch(**browser_launch_options())
+            except Exception:
+                # The driver may be what failed; start it again next time
+                await self._stop_playwright()
+                raise
+
+            browser.on('disconnected', lambda _: self._on_disconnected(browser))
+            self._browser = browser
+            context = await browser.new_context()
+            await context.add_init_script(RENDER_COMPLETE_SCRIPT)
+            await context.route('**/*', self._route)
+            self._context = context
+            self.launches += 1
+            logger.info("PDF browser launched")
+            return self._context
+
+    def _on_disconnected(self, browser):
+        if self._browser is browser:
+            logger.warning("PDF browser disconnected")
+            self._browser = None
+            self._context = None
+            self._idle_pages = []
+
+    async def _close_browser(self):
+        browser = self._browser
+        self._browser = None
+        self._context = None
+        self._idle_pages = []
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass  # Crashed or already closed
+
+    async def _stop_playwright(self):
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception:
+                pass
+
+    def _schedule_idle_close(self):
+        if self.idle_timeout and self._browser is not None:
+            loop = asyncio.get_running_loop()
+            self._idle_handle = loop.call_later(
+                self.idle_timeout, lambda: asyncio.ensure_future(self._close_if_idle())
+            )
+
+    def _cancel_idle_close(self):
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    async def _close_if_idle(self):
+        self._idle_handle = None
+        if not self._active and self._browser is not None:
+            logger.info(f"PDF browser closed after {self.idle_timeout:g}s without exports")
+            await self.close()
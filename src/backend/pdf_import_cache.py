@@ -0,0 +1,253 @@
+"""
+PDF Import Cache Module
+Persistent, content-addressed cache of PDF → Markdown import results
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from backend.image_store import ImageStore
+from utils.logger import get_logger
+
+logger = get_logger()
+
+
+class PdfImportCache:
+    """
+    On-disk cache of converted PDFs
+
+    Entries are keyed by the PDF's content hash combined with the converter
+    version and the conversion options, so renamed or re-downloaded copies
+    of the same file still hit. Each entry stores the finalized markdown and
+    the images extracted for it; on a hit the images are copied into the
+    target images folder instead of being re-extracted. Copies, not hard
+    links: the user may edit the restored images, and an edit must never
+    reach the cache entry.
+    Entries can also keep per-page results by page fingerprint, which lets
+    a revised PDF reuse every unchanged page of its previous import.
+    The cache is bounded in size and evicts least recently used entries.
+
+    Layout: <cache_dir>/<key>/{manifest.json, document.md, pages.json, images/...}
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    MARKDOWN_FILE = "document.md"
+    PAGES_FILE = "pages.json"
+    IMAGES_DIR = "images"
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the import cache
+
+        Args:
+            cache_dir: Cache directory (default: ~/.saekim/cache)
+            max_bytes: Total size the cache is trimmed to after every store
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.saekim' / 'cache'
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def file_digest(file_path) -> str:
+        """SHA-256 of a file's content, read in chunks"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def make_key(self, pdf_path, version: str, options: dict) -> str:
+        """
+        Build the cache key of an import
+
+        Args:
+            pdf_path: Path to PDF file
+            version: Converter version; bump it whenever the output changes
+            options: Conversion options that affect the output
+        """
+        key_data = {
+            'content': self.file_digest(pdf_path),
+            'version': version,
+            'options': options,
+        }
+        key_json = json.dumps(key_data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+
+    def load(self, key: str, images_dir: Path) -> Optional[dict]:
+        """
+        Look up an entry and restore its images into images_dir
+
+        Returns:
+            Manifest dict with the cached 'markdown' added, or None on a miss
+        """
+        entry_dir = self.cache_dir / key
+        manifest_path = entry_dir / self.MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+
+            with open(entry_dir / self.MARKDOWN_FILE, 'r', encoding='utf-8') as f:
+                markdown = f.read()
+
+            images = manifest.get('images', [])
+            if images:
+                images_dir = Path(images_dir)
+                images_dir.mkdir(parents=True, exist_ok=True)
+                for image_name in images:
+                    self._copy(entry_dir / self.IMAGES_DIR / image_name, images_dir / image_name)
+
+            # Mark as recently used for LRU eviction
+            os.utime(manifest_path)
+
+        except Exception as e:
+            logger.warning(f"Dropping unreadable PDF import cache entry {key}: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        manifest['markdown'] = markdown
+        logger.info(f"PDF import cache hit: {key[:12]} ({len(images)} images restored)")
+        return manifest
+
+    def load_pages(self, source: str) -> dict:
+        """
+        Per-page results of the most recent import of a source file
+
+        Args:
+            source: Resolved path of the PDF, as stored in the manifest
+
+        Returns:
+            dict of page fingerprint -> page result (empty if none cached)
+        """
+        if not self.cache_dir.exists():
+            return {}
+
+        latest = None
+        for entry_dir in self.cache_dir.iterdir():
+            manifest_path = entry_dir / self.MANIFEST_FILE
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('source') != source or not manifest.get('has_pages'):
+                    continue
+                last_used = manifest_path.stat().st_mtime
+            except Exception:
+                continue
+            if latest is None or last_used > latest[0]:
+                latest = (last_used, entry_dir)
+
+        if latest is None:
+            return {}
+
+        try:
+            with open(latest[1] / self.PAGES_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read cached pages of {source}: {e}")
+            return {}
+
+    def store(self, key: str, markdown: str, images_dir: Path, images: list, metadata: dict,
+              pages: Optional[dict] = None) -> bool:
+        """
+        Store a finished import
+
+        Args:
+            key: Cache key from make_key()
+            markdown: Finalized markdown content
+            images_dir: Folder the images were extracted to
+            images: File names of the extracted images inside images_dir
+            metadata: Additional manifest fields (page count, source path, ...)
+            pages: Optional page fingerprint -> JSON-serializable page result
+
+        Returns:
+            True if the entry was stored
+        """
+        entry_dir = self.cache_dir / key
+        temp_dir = self.cache_dir / f"{key}.tmp-{os.getpid()}"
+
+        try:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            (temp_dir / self.IMAGES_DIR).mkdir(parents=True)
+
+            size = 0
+            for image_name in images:
+                # Copy, so later edits to the imported images never reach the cache
+                # (content only: indexed images are read-only, cache entries are not)
+                target = temp_dir / self.IMAGES_DIR / image_name
+                shutil.copyfile(Path(images_dir) / image_name, target)
+                size += target.stat().st_size
+
+            markdown_bytes = markdown.encode('utf-8')
+            with open(temp_dir / self.MARKDOWN_FILE, 'wb') as f:
+                f.write(markdown_bytes)
+            size += len(markdown_bytes)
+
+            if pages is not None:
+                pages_bytes = json.dumps(pages, ensure_ascii=False).encode('utf-8')
+                with open(temp_dir / self.PAGES_FILE, 'wb') as f:
+                    f.write(pages_bytes)
+                size += len(pages_bytes)
+
+            manifest = dict(metadata, images=list(images), size=size, has_pages=pages is not None)
+            with open(temp_dir / self.MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+            # Publish atomically; a concurrent import of the same file may have won
+            if entry_dir.exists():
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            else:
+                os.replace(temp_dir, entry_dir)
+
+        except Exception as e:
+            logger.warning(f"Failed to store PDF import cache entry: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False
+
+        logger.info(f"PDF import cached: {key[:12]} ({size} bytes)")
+        self.evict()
+        return True
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        total_size = 0
+        for entry_dir in self.cache_dir.iterdir():
+            manifest_path = entry_dir / self.MANIFEST_FILE
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    size = json.load(f).get('size', 0)
+                last_used = manifest_path.stat().st_mtime
+            except Exception:
+                continue  # In-progress or foreign entry
+            entries.append((last_used, size, entry_dir))
+            total_size += size
+
+        entries.sort()
+        while total_size > self.max_bytes and entries:
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+            logger.info(f"Evicted PDF import cache entry: {entry_dir.name[:12]}")
+
+    def clear(self):
+        """Remove all cache entries"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @staticmethod
+    def _copy(source: Path, target: Path):
+        """Copy source to target; an existing target is replaced, never written into (it may be a hard link)"""
+        temp_path = target.with_name(f".{target.name}.tmp-{os.getpid()}")
+        try:
+            shutil.copyfile(source, temp_path)
+            ImageStore.replace_file(temp_path, target)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
@@ -0,0 +1,330 @@
+"""
+PDF Import Estimate Module
+Metadata-only pre-scan of a PDF and import cost estimates from past throughput
+"""
+
+import os
+import re
+import json
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from backend.pdf_import_profiles import DEFAULT_PDF_IMPORT_PROFILE, PDF_IMPORT_PROFILES
+from utils.logger import get_logger
+
+logger = get_logger()
+
+# Page kinds the cost model distinguishes
+PAGE_KINDS = ('text', 'image', 'table')
+
+# Path segments and rectangles in a content stream ("x y l", "x y w h re")
+_RULE_OPERATOR = re.compile(rb'\s(?:l|re)\s')
+
+# Ruling operators from which a page with text counts as a table page
+TABLE_RULES = 8
+
+
+def parse_page_range(spec: str) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Parse a page range typed by the user
+
+    Args:
+        spec: "40-85", "40-" (to the end), "7" or "" (all pages)
+
+    Returns:
+        (first, last) 1-based and inclusive, last None for "to the end";
+        None for all pages
+
+    Raises:
+        ValueError: If the text is not a page range
+    """
+    spec = spec.strip().replace(' ', '')
+    if not spec:
+        return None
+
+    match = re.fullmatch(r'(\d+)(?:(-)(\d*))?', spec)
+    if not match:
+        raise ValueError(f"Invalid page range: {spec}")
+
+    first = int(match.group(1))
+    if not match.group(2):
+        return first, first
+    return first, int(match.group(3)) if match.group(3) else None
+
+
+def resolve_page_range(page_range: Optional[tuple], page_count: int) -> Tuple[int, int]:
+    """
+    Clamp a page range to a document
+
+    Args:
+        page_range: (first, last) with last None for "to the end", or None for all pages
+        page_count: Number of pages in the PDF
+
+    Returns:
+        (first, last) 1-based and inclusive
+
+    Raises:
+        ValueError: If the range does not select any page of the document
+    """
+    if page_range is None:
+        return 1, page_count
+
+    first, last = page_range
+    if last is not None and last < first:
+        raise ValueError(f"Page range {first}-{last} ends before it starts")
+    last = page_count if last is None else min(last, page_count)
+    if first < 1 or first > page_count:
+        raise ValueError(f"Page range {first}-{page_range[1] or ''} is outside "
+                         f"the document's {page_count} pages")
+    return first, last
+
+
+def classify_page(page) -> str:
+    """
+    Kind of a PyMuPDF page for the cost model, without extracting its text
+
+    Pages without fonts but with images are scans ('image'), pages with text
+    and many ruling lines or rectangles are likely tables ('table'), the
+    rest is 'text'. Only the page's resources and content stream are read.
+    """
+    has_fonts = bool(page.get_fonts())
+    if not has_fonts:
+        return 'image' if page.get_images() else 'text'
+
+    rules = len(_RULE_OPERATOR.findall(page.read_contents()))
+    return 'table' if rules >= TABLE_RULES else 'text'
+
+
+@dataclass
+class PdfScan:
+    """Page kinds and images of (a page range of) a PDF, extrapolated from a sample"""
+    page_count: int  # Pages in the PDF
+    first_page: int
+    last_page: int
+    sampled_pages: int
+    text_pages: float
+    image_pages: float
+    table_pages: float
+    images: float  # Distinct images
+    image_bytes: float  # Encoded size of the distinct images
+    seconds: float  # Time the scan took
+
+    @property
+    def pages(self) -> int:
+        """Pages in the scanned range"""
+        return self.last_page - self.first_page + 1
+
+    @property
+    def text_ratio(self) -> float:
+        return (self.text_pages + self.table_pages) / self.pages
+
+    @property
+    def image_ratio(self) -> float:
+        return self.image_pages / self.pages
+
+    @property
+    def table_density(self) -> float:
+        return self.table_pages / self.pages
+
+
+def scan_pdf(pdf_path, page_range: Optional[tuple] = None, max_samples: int = 64) -> PdfScan:
+    """
+    Pre-scan a PDF without extracting any text
+
+    Up to max_samples pages spread evenly over the range are classified
+    (see classify_page()); the counts are extrapolated to the whole range.
+    Images found on several sampled pages (logos, backgrounds) are counted
+    once; the others are extrapolated like the pages.
+
+    Args:
+        pdf_path: Path to PDF file
+        page_range: (first, last) pages to scan, None for all pages
+        max_samples: Most pages looked at
+
+    Raises:
+        ValueError: If the page range does not select any page
+    """
+    import fitz  # PyMuPDF
+
+    start_time = time.perf_counter()
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+        first, last = resolve_page_range(page_range, page_count)
+        pages = last - first + 1
+        sample_count = min(pages, max_samples)
+        sample = sorted({first + (index * pages) // sample_count for index in range(sample_count)})
+
+        kinds = dict.fromkeys(PAGE_KINDS, 0)
+        image_pages = {}  # xref -> sampled pages showing it
+        image_sizes = {}
+        for page_num in sample:
+            page = doc[page_num - 1]
+            kinds[classify_page(page)] += 1
+            for image in page.get_images():
+                xref = image[0]
+                image_pages[xref] = image_pages.get(xref, 0) + 1
+                if xref not in image_sizes:
+                    length = doc.xref_get_key(xref, 'Length')
+                    image_sizes[xref] = int(length[1]) if length[0] == 'int' else 0
+
+    scale = pages / len(sample)
+    repeated = [xref for xref, count in image_pages.items() if count > 1]
+    single = [xref for xref, count in image_pages.items() if count == 1]
+
+    return PdfScan(
+        page_count=page_count,
+        first_page=first,
+        last_page=last,
+        sampled_pages=len(sample),
+        text_pages=kinds['text'] * scale,
+        image_pages=kinds['image'] * scale,
+        table_pages=kinds['table'] * scale,
+        images=len(repeated) + len(single) * scale,
+        image_bytes=(sum(image_sizes[xref] for xref in repeated)
+                     + sum(image_sizes[xref] for xref in single) * scale),
+        seconds=time.perf_counter() - start_time,
+    )
+
+
+@dataclass
+class PdfImportEstimate:
+    """Expected cost of importing a scanned PDF with a profile"""
+    profile: str
+    seconds: float
+    markdown_bytes: int
+    image_bytes: int
+    from_history: bool  # False: no import with this profile recorded yet
+    scan: PdfScan
+
+    def to_dict(self) -> dict:
+        """JSON-serializable estimate, including the scan"""
+        report = asdict(self)
+        report['scan'].update(pages=self.scan.pages, text_ratio=self.scan.text_ratio,
+                              image_ratio=self.scan.image_ratio,
+                              table_density=self.scan.table_density)
+        return report
+
+
+class PdfImportHistory:
+    """
+    Import throughput learned from finished imports
+
+    Kept per import profile and page kind: seconds per page (without image
+    extraction), markdown characters per page, and seconds per extracted
+    image. Each finished import is blended into the stored averages with
+    weight SMOOTHING, so the estimates follow the machine and the kind of
+    documents imported. Until a profile has been recorded, DEFAULTS are used.
+
+    Stored as JSON in ~/.saekim/import_history.json.
+    """
+
+    SMOOTHING = 0.3
+    STARTUP_SECONDS = 0.05  # Opening the document, fingerprints, cache lookup
+
+    # Starting points until an import with the profile is recorded: page times
+    # measured with PyMuPDF 1.28 on one core, characters of a page of running text
+    DEFAULTS = {
+        'fast': {'text': (0.002, 1500), 'image': (0.001, 20), 'table': (0.003, 1200), 'image_seconds': 0.0},
+        'balanced': {'text': (0.003, 1500), 'image': (0.002, 60), 'table': (0.004, 1200),
+                     'image_seconds': 0.006},
+        'full': {'text': (0.015, 1500), 'image': (0.004, 60), 'table': (0.025, 1200),
+                 'image_seconds': 0.006},
+    }
+
+    def __init__(self, history_path: Optional[Path] = None):
+        self.history_path = Path(history_path) if history_path else Path.home() / '.saekim' / 'import_history.json'
+        self._history = None
+
+    def _load(self) -> dict:
+        if self._history is None:
+            try:
+                with open(self.history_path, 'r', encoding='utf-8') as f:
+                    self._history = json.load(f)
+            except (OSError, ValueError):
+                self._history = {}
+        return self._history
+
+    def record(self, profile: str, pages: list, images: int, image_seconds: float):
+        """
+        Blend a finished import into the averages
+
+        Args:
+            profile: Import profile name
+            pages: (kind, seconds, markdown characters) of every extracted page,
+                   seconds without image extraction
+            images: Images extracted
+            image_seconds: Time spent extracting them
+        """
+        if not pages:
+            return
+
+        history = self._load()
+        entry = history.setdefault(profile, {})
+        for kind in PAGE_KINDS:
+            kind_pages = [(seconds, chars) for page_kind, seconds, chars in pages if page_kind == kind]
+            if not kind_pages:
+                continue
+            observed = (sum(seconds for seconds, _ in kind_pages) / len(kind_pages),
+                        sum(chars for _, chars in kind_pages) / len(kind_pages))
+            entry[kind] = self._blend(entry.get(kind), observed)
+        if images:
+            entry['image_seconds'] = self._blend(entry.get('image_seconds'), image_seconds / images)
+
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.history_path.with_name(f"{self.history_path.name}.tmp-{os.getpid()}")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(history, f, indent=2)
+            os.replace(temp_path, self.history_path)
+        except OSError as e:
+            logger.warning(f"Failed to save import history: {e}")
+
+    def estimate(self, scan: PdfScan, profile: str = DEFAULT_PDF_IMPORT_PROFILE) -> PdfImportEstimate:
+        """Estimate import time and output size of a scanned PDF"""
+        recorded = self._load().get(profile, {})
+        defaults = self.DEFAULTS.get(profile, self.DEFAULTS[DEFAULT_PDF_IMPORT_PROFILE])
+        rates = dict(defaults, **recorded)
+
+        seconds = self.STARTUP_SECONDS
+        markdown_bytes = 0.0
+        for kind in PAGE_KINDS:
+            page_seconds, page_chars = rates[kind]
+            kind_pages = getattr(scan, f"{kind}_pages")
+            seconds += kind_pages * page_seconds
+            markdown_bytes += kind_pages * page_chars
+
+        image_bytes = 0.0
+        if PDF_IMPORT_PROFILES[profile].images:
+            seconds += scan.images * rates['image_seconds']
+            image_bytes = scan.image_bytes
+
+        return PdfImportEstimate(
+            profile=profile,
+            seconds=seconds,
+            markdown_bytes=int(markdown_bytes),
+            image_bytes=int(image_bytes),
+            from_history=bool(recorded),
+            scan=scan,
+        )
+
+    def _blend(self, current, observed):
+        if current is None:
+            return observed
+        if isinstance(observed, tuple):
+            return tuple(self._blend(old, new) for old, new in zip(current, observed))
+        return (1 - self.SMOOTHING) * current + self.SMOOTHING * observed
+
+
+def estimate_pdf_import(pdf_path, page_range: Optional[tuple] = None,
+                        profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                        history: Optional[PdfImportHistory] = None) -> PdfImportEstimate:
+    """
+    Pre-scan a PDF and estimate its import
+
+    Raises:
+        ValueError: If the page range does not select any page
+    """
+    scan = scan_pdf(pdf_path, page_range)
+    return (history or PdfImportHistory()).estimate(scan, profile)
@@ -0,0 +1,169 @@
+"""
+PDF Import Job Module
+Runs a streaming PDF → Markdown import in the conversion service
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QSettings, pyqtSignal
+
+from backend.conversion_service import ConversionService, PRIORITY_NORMAL, get_conversion_service
+from backend.file_manager import FileManager
+from backend.markdown_writer import MarkdownStreamWriter
+from backend.pdf_import_profiles import (
+    DEFAULT_PDF_IMPORT_PROFILE, PDF_IMPORT_PROFILES, PdfImportTimings
+)
+from utils.logger import get_logger
+from utils.memory import peak_rss_mb
+
+logger = get_logger()
+
+
+def load_pdf_import_profile() -> str:
+    """Import profile chosen in the settings (QSettings)"""
+    settings = QSettings("Saekim", "SaekimEditor")
+    profile = settings.value("pdf_import_profile", DEFAULT_PDF_IMPORT_PROFILE)
+    return profile if profile in PDF_IMPORT_PROFILES else DEFAULT_PDF_IMPORT_PROFILE
+
+
+def save_pdf_import_profile(profile: str):
+    """Remember the import profile for later imports"""
+    settings = QSettings("Saekim", "SaekimEditor")
+    settings.setValue("pdf_import_profile", profile)
+    logger.info(f"PDF import profile saved: {profile}")
+
+
+class PdfImportJob(QObject):
+    """
+    Streaming PDF import
+
+    Converts a PDF page by page in a worker process of the conversion service,
+    so the GUI never blocks and a PDF that crashes the converter cannot take
+    the editor down. Every converted page is re-emitted on the GUI thread,
+    which lets callers open the tab right away and append pages as they arrive.
+    Pages are cleaned up as they arrive (MarkdownStreamWriter), so only one
+    copy of the document is kept. When the import completes, the finalized
+    markdown is saved to md_path. The per-stage timing breakdown of the
+    import is collected in timings.
+    """
+
+    page_converted = pyqtSignal(str, dict)  # (markdown_chunk, progress)
+    finished = pyqtSignal(bool, str)  # (success, error_message)
+
+    # Service callbacks arrive on the service thread; re-emitted onto the GUI thread
+    _service_event = pyqtSignal(dict)
+    _service_done = pyqtSignal(tuple)
+
+    def __init__(self, pdf_path: str, md_path: str, output_dir: Optional[str] = None,
+                 service: Optional[ConversionService] = None, workers: int = 1,
+                 table_engine: str = 'pymupdf', profile: str = DEFAULT_PDF_IMPORT_PROFILE,
+                 page_range: Optional[tuple] = None, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.md_path = md_path
+        self.output_dir = output_dir or str(Path(pdf_path).parent / f"{Path(pdf_path).stem}_images")
+        self.service = service or get_conversion_service()
+        self.workers = workers
+        self.table_engine = table_engine
+        self.profile = profile
+        self.page_range = page_range  # (first, last) pages, None for the whole PDF
+        self.timings = PdfImportTimings(profile)
+
+        self.last_progress = {}
+        self.error = ""
+        self.is_done = False
+        self.is_cancelled = False
+
+        self._writer = MarkdownStreamWriter()
+        self._final_content = None
+        self._job = None
+
+        self._service_event.connect(self._on_page_converted)
+        self._service_done.connect(self._on_job_finished)
+
+    @property
+    def content(self) -> str:
+        """Markdown converted so far (final content once finished)"""
+        if self._final_content is not None:
+            return self._final_content
+        return self._writer.getvalue(include_pending=True)
+
+    @property
+    def is_running(self) -> bool:
+        return self._job is not None and not self.is_done
+
+    def start(self):
+        """Queue the import in the conversion service"""
+        self._job = self.service.submit('pdf_import', {
+            'pdf_path': self.pdf_path,
+            'output_dir': self.output_dir,
+            'workers': self.workers,
+            'table_engine': self.table_engine,
+            'profile': self.profile,
+            'page_range': self.page_range,
+        }, priority=PRIORITY_NORMAL)
+        self._job.subscribe(self._service_event.emit, self._service_done.emit)
+        pages = f", pages {self.page_range[0]}-{self.page_range[1] or ''}" if self.page_range else ""
+        logger.info(f"PDF import started: {self.pdf_path} -> {self.md_path} "
+                    f"(profile {self.profile}{pages}, job {self._job.job_id})")
+
+    def cancel(self, wait: bool = False):
+        """
+        Cancel the import after the page currently being converted
+
+        The job keeps running for other tabs importing the same PDF.
+
+        Args:
+            wait: Block until the worker has stopped the import
+        """
+        if self.is_done or self.is_cancelled:
+            return
+        self.is_cancelled = True
+        if self._job is not None and self._job.cancel() and wait:
+            self._job.wait()
+
+        self.is_done = True
+        logger.info(f"PDF import cancelled: {self.pdf_path}")
+        self.finished.emit(False, "Cancelled")
+
+    def _on_page_converted(self, event: dict):
+        if self.is_done:
+            return
+
+        chunk = event.get('markdown', "")
+        self._writer.write(chunk)
+        self.timings.add_event(event)
+        self.last_progress = event
+        self.page_converted.emit(chunk, event)
+
+    def _on_job_finished(self, result: tuple):
+        if self.is_done:
+            return
+        self.is_done = True
+
+        success, _, error = result
+        if not success:
+            self.error = error
+            self.finished.emit(False, self.error)
+            return
+
+        self._writer.close()
+        self._final_content = self._writer.getvalue()
+        self._writer = MarkdownStreamWriter()
+
+        success, final_content, save_error = FileManager.save_file(
+            self._final_content,
+            self.md_path,
+            None  # No old file path
+        )
+
+        if not success:
+            self.error = f"Failed to save: {save_error}"
+            self.finished.emit(False, self.error)
+            return
+
+        self._final_content = final_content
+        logger.info(f"Markdown file saved: {self.md_path} (peak RSS {peak_rss_mb():.0f} MB)")
+        logger.info(f"PDF import timings: {self.timings.summary()}")
+        self.finished.emit(True, "")
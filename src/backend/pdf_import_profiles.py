@@ -0,0 +1,126 @@
+"""
+PDF Import Profiles Module
+Named sets of PDF import stages and the per-stage timing of an import
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PdfImportProfile:
+    """Stages a PDF import runs besides text and heading extraction"""
+    name: str
+    label: str
+    images: bool  # Extract embedded images
+    tables: bool  # Find tables (their text stays in the text flow otherwise)
+    code_blocks: bool  # Detect code lines (monospace fonts and content patterns)
+    code_languages: bool  # Score the language of every code block
+
+
+PDF_IMPORT_PROFILES = {profile.name: profile for profile in (
+    PdfImportProfile('fast', "빠르게 (텍스트와 제목만)",
+                     images=False, tables=False, code_blocks=False, code_languages=False),
+    PdfImportProfile('balanced', "균형 (표 제외)",
+                     images=True, tables=False, code_blocks=True, code_languages=False),
+    PdfImportProfile('full', "전체 (이미지, 표, 코드 언어)",
+                     images=True, tables=True, code_blocks=True, code_languages=True),
+)}
+
+DEFAULT_PDF_IMPORT_PROFILE = 'full'
+
+# Stages reported by an import, in pipeline order
+PDF_IMPORT_STAGES = ('text', 'code', 'tables', 'images', 'margins', 'merge', 'languages')
+
+
+def get_pdf_import_profile(name: str) -> PdfImportProfile:
+    """
+    Look up an import profile by name
+
+    Raises:
+        ValueError: If there is no profile with that name
+    """
+    profile = PDF_IMPORT_PROFILES.get(name)
+    if profile is None:
+        raise ValueError(f"Unknown PDF import profile: {name}")
+    return profile
+
+
+class StageTimer:
+    """Wall time spent per import stage, for one page"""
+
+    def __init__(self):
+        self.seconds = {}
+
+    def add(self, stage: str, seconds: float):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Time the body of a with statement as part of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+
+class PdfImportTimings:
+    """
+    Per-stage and per-page timing breakdown of a whole import
+
+    Collected from the progress events of DocumentConverter.iter_pdf_to_markdown(),
+    whose 'stage_times' hold the seconds each stage took on that page. Pages
+    extracted in worker processes overlap in time, so the stage totals can
+    exceed the wall time of the import.
+    """
+
+    def __init__(self, profile: str = DEFAULT_PDF_IMPORT_PROFILE):
+        self.profile = profile
+        self.stage_totals = {}
+        self.pages = []  # (page number, page time, stage times) per event
+        self.wall_seconds = 0.0
+        self.cached = False
+
+    def add_event(self, event: dict):
+        """Record a progress event of iter_pdf_to_markdown()"""
+        stage_times = event.get('stage_times', {})
+        for stage, seconds in stage_times.items():
+            self.stage_totals[stage] = self.stage_totals.get(stage, 0.0) + seconds
+        self.pages.append((event['page'], event['page_time'], stage_times))
+        self.wall_seconds = event['elapsed']
+        self.cached = event['cached']
+
+    def slowest_pages(self, count: int = 5) -> list:
+        """Page numbers and times of the slowest pages, slowest first"""
+        ranked = sorted(self.pages, key=lambda page: page[1], reverse=True)
+        return [(page_num, page_time) for page_num, page_time, _ in ranked[:count]]
+
+    def summary(self) -> str:
+        """One-line breakdown, e.g. 'text 1.20s, tables 0.80s (wall 2.10s)'"""
+        if self.cached:
+            return f"served from cache (wall {self.wall_seconds:.2f}s)"
+        stages = [f"{stage} {self.stage_totals[stage]:.2f}s"
+                  for stage in PDF_IMPORT_STAGES if stage in self.stage_totals]
+        return f"{', '.join(stages) or 'no stages'} (wall {self.wall_seconds:.2f}s)"
+
+    def to_dict(self, include_pages: bool = True) -> dict:
+        """JSON-serializable breakdown"""
+        report = {
+            'profile': self.profile,
+            'cached': self.cached,
+            'wall_seconds': round(self.wall_seconds, 4),
+            'stage_seconds': {stage: round(self.stage_totals[stage], 4)
+                              for stage in PDF_IMPORT_STAGES if stage in self.stage_totals},
+        }
+        if include_pages:
+            report['pages'] = [
+                {
+                    'page': page_num,
+                    'seconds': round(page_time, 4),
+                    'stages': {stage: round(seconds, 4) for stage, seconds in stage_times.items()},
+                }
+                for page_num, page_time, stage_times in self.pages
+            ]
+        return report
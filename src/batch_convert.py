@@ -0,0 +1,311 @@
+"""
+새김 (Saekim) 일괄 PDF → 마크다운 변환기
+
+Headless command-line entry point for converting many PDFs at once.
+Built on DocumentConverter only - PyQt is never imported.
+
+Usage:
+    python src/batch_convert.py <dir | glob | file.pdf>... [-o OUTPUT_DIR] [-j JOBS] [--profile PROFILE]
+                                [--pages FIRST-LAST]
+"""
+
+import sys
+import os
+import json
+import time
+import glob
+import logging
+import argparse
+import multiprocessing
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.pdf_import_estimate import parse_page_range
+from backend.pdf_import_profiles import (
+    DEFAULT_PDF_IMPORT_PROFILE, PDF_IMPORT_PROFILES, PDF_IMPORT_STAGES
+)
+from utils.logger import setup_logger, get_logger
+from utils.memory import peak_rss_mb
+
+
+def collect_pdfs(inputs: list) -> list:
+    """
+    Expand input arguments into PDF files
+
+    Args:
+        inputs: Directories (searched recursively), glob patterns or PDF files
+
+    Returns:
+        Sorted list of unique (pdf_path, base_dir) tuples; base_dir is the
+        root the output tree mirrors
+    """
+    found = {}
+
+    for spec in inputs:
+        path = Path(spec)
+        if path.is_dir():
+            for pdf in path.rglob('*'):
+                if pdf.is_file() and pdf.suffix.lower() == '.pdf':
+                    found.setdefault(pdf.resolve(), path.resolve())
+        elif path.is_file():
+            found.setdefault(path.resolve(), path.resolve().parent)
+        else:
+            for match in glob.glob(spec, recursive=True):
+                pdf = Path(match)
+                if pdf.is_file() and pdf.suffix.lower() == '.pdf':
+                    found.setdefault(pdf.resolve(), pdf.resolve().parent)
+
+    return sorted(found.items())
+
+
+def output_paths(pdf_path: Path, base_dir: Path, output_dir: str = None) -> tuple:
+    """
+    Get the markdown path and images folder of a PDF
+
+    Without output_dir the files are written next to the PDF; otherwise the
+    folder structure below base_dir is mirrored into output_dir.
+    """
+    if output_dir:
+        md_path = Path(output_dir) / pdf_path.relative_to(base_dir).with_suffix('.md')
+    else:
+        md_path = pdf_path.with_suffix('.md')
+
+    images_dir = md_path.parent / f"{md_path.stem}_images"
+    return md_path, images_dir
+
+
+def convert_file(pdf_path: str, md_path: str, images_dir: str, use_cache: bool,
+                 log_level: int = logging.WARNING, table_engine: str = 'pymupdf',
+                 profile: str = DEFAULT_PDF_IMPORT_PROFILE, page_timings: bool = False,
+                 page_range: tuple = None) -> dict:
+    """
+    Worker process entry point: convert a single PDF (or a page range of it)
+
+    Returns:
+        Per-file summary dict with the seconds spent per import stage (and
+        per page with page_timings); errors are reported, never raised
+    """
+    from backend.converter import DocumentConverter
+
+    # Per-page/per-image converter logs would drown the batch progress
+    get_logger().setLevel(log_level)
+
+    result = {
+        'pdf': pdf_path,
+        'markdown': md_path,
+        'success': False,
+        'pages': 0,
+        'images': 0,
+        'tables': 0,
+        'seconds': 0.0,
+        'pages_per_second': 0.0,
+        'peak_rss_mb': 0.0,
+        'profile': profile,
+        'stage_seconds': {},
+        'error': "",
+    }
+
+    start_time = time.perf_counter()
+    try:
+        converter = DocumentConverter()
+        if not use_cache:
+            converter.import_cache = None
+
+        # Pages are streamed straight into the markdown file
+        success, stats, error = converter.pdf_to_markdown_file(
+            pdf_path, md_path, output_dir=images_dir, table_engine=table_engine, profile=profile,
+            page_range=page_range
+        )
+        result['stage_seconds'] = stats['timings'].get('stage_seconds', {})
+        if page_timings:
+            result['page_timings'] = stats['timings'].get('pages', [])
+        result['pages'] = stats['total_pages']
+        result['images'] = stats['total_images']
+        result['tables'] = stats['total_tables']
+        result['success'] = success
+        result['error'] = error
+
+    except Exception as e:
+        result['error'] = f"PDF to Markdown conversion failed: {str(e)}"
+
+    seconds = time.perf_counter() - start_time
+    result['seconds'] = round(seconds, 3)
+    if seconds > 0:
+        result['pages_per_second'] = round(result['pages'] / seconds, 2)
+    result['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    return result
+
+
+def run_batch(jobs: list, workers: int, use_cache: bool, logger,
+              log_level: int = logging.WARNING, table_engine: str = 'pymupdf',
+              profile: str = DEFAULT_PDF_IMPORT_PROFILE, page_timings: bool = False,
+              page_range: tuple = None) -> list:
+    """
+    Convert files in a bounded pool of worker processes
+
+    At most `workers` files are in flight at any time. On Python 3.11+
+    every file gets a fresh worker process, so its peak memory is measured
+    on its own. A crashing worker only fails the files it was running; the
+    pool is restarted for the rest.
+    """
+    results = []
+    pending = list(jobs)
+    total = len(jobs)
+
+    executor_options = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+
+    while pending:
+        executor = ProcessPoolExecutor(max_workers=workers, **executor_options)
+        in_flight = {}
+        pool_broken = False
+
+        try:
+            while (pending or in_flight) and not pool_broken:
+                while pending and len(in_flight) < workers:
+                    pdf_path, md_path, images_dir = pending.pop(0)
+                    future = executor.submit(convert_file, str(pdf_path), str(md_path),
+                                             str(images_dir), use_cache, log_level, table_engine,
+                                             profile, page_timings, page_range)
+                    in_flight[future] = pdf_path
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pdf_path = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        pool_broken = True
+                        result = {'pdf': str(pdf_path), 'success': False,
+                                  'error': "Worker process crashed"}
+                    results.append(result)
+
+                    status = "OK" if result['success'] else f"FAILED: {result['error']}"
+                    logger.info(f"[{len(results)}/{total}] {pdf_path} - {status}")
+
+            if pool_broken:
+                # Files still running in the broken pool are lost with it
+                for future, pdf_path in in_flight.items():
+                    results.append({'pdf': str(pdf_path), 'success': False,
+                                    'error': "Worker process crashed"})
+                    logger.info(f"[{len(results)}/{total}] {pdf_path} - FAILED: Worker process crashed")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return sorted(results, key=lambda result: result['pdf'])
+
+
+def main(argv=None) -> int:
+    """Batch converter entry point"""
+    parser = argparse.ArgumentParser(
+        description="Convert PDF files to Markdown without starting the editor."
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help="PDF files, directories (searched recursively) or glob patterns")
+    parser.add_argument('-o', '--output-dir',
+                        help="Write into this folder, mirroring the input folders "
+                             "(default: next to each PDF)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Number of files converted in parallel (default: CPU count)")
+    parser.add_argument('--summary',
+                        help="Path of the JSON summary (default: <output>/batch_summary.json)")
+    parser.add_argument('--skip-existing', action='store_true',
+                        help="Skip PDFs whose markdown file already exists")
+    parser.add_argument('--use-cache', action='store_true',
+                        help="Use the persistent PDF import cache (~/.saekim/cache)")
+    parser.add_argument('--tables', choices=['pymupdf', 'pdfplumber'], default='pymupdf',
+                        help="Table finder (default: pymupdf, falls back to pdfplumber)")
+    parser.add_argument('--profile', choices=list(PDF_IMPORT_PROFILES), default=DEFAULT_PDF_IMPORT_PROFILE,
+                        help="Import profile: fast = text and headings only, balanced = no table "
+                             f"finding, full = everything (default: {DEFAULT_PDF_IMPORT_PROFILE})")
+    parser.add_argument('--pages', type=parse_page_range, metavar='FIRST-LAST',
+                        help="Only convert these pages of every PDF, e.g. 120-180 or 40- "
+                             "(default: all pages)")
+    parser.add_argument('--page-timings', action='store_true',
+                        help="Write the per-page stage timings of every file into the summary")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Show the converter's own log messages")
+    args = parser.parse_args(argv)
+
+    logger = setup_logger()
+
+    jobs = []
+    skipped = 0
+    for pdf_path, base_dir in collect_pdfs(args.inputs):
+        md_path, images_dir = output_paths(pdf_path, base_dir, args.output_dir)
+        if args.skip_existing and md_path.exists():
+            skipped += 1
+            continue
+        jobs.append((pdf_path, md_path, images_dir))
+
+    if not jobs and not skipped:
+        logger.error("No PDF files found")
+        return 2
+
+    workers = max(1, min(args.jobs, len(jobs) or 1))
+    logger.info(f"Converting {len(jobs)} PDF files with {workers} workers, "
+                f"profile {args.profile} ({skipped} skipped)")
+
+    started_at = datetime.now().isoformat(timespec='seconds')
+    start_time = time.perf_counter()
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    results = run_batch(jobs, workers, args.use_cache, logger, log_level, args.tables,
+                        args.profile, args.page_timings, args.pages)
+    elapsed = time.perf_counter() - start_time
+
+    succeeded = [r for r in results if r['success']]
+    total_pages = sum(r.get('pages', 0) for r in succeeded)
+
+    # Seconds per import stage, summed over all files
+    stage_seconds = {}
+    for result in results:
+        for stage, seconds in result.get('stage_seconds', {}).items():
+            stage_seconds[stage] = stage_seconds.get(stage, 0.0) + seconds
+    stage_seconds = {stage: round(stage_seconds[stage], 3)
+                     for stage in PDF_IMPORT_STAGES if stage in stage_seconds}
+
+    summary = {
+        'started_at': started_at,
+        'files': len(results),
+        'succeeded': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'skipped': skipped,
+        'workers': workers,
+        'profile': args.profile,
+        'seconds': round(elapsed, 3),
+        'pages': total_pages,
+        'pages_per_second': round(total_pages / elapsed, 2) if elapsed > 0 else 0.0,
+        'peak_rss_mb': max((r.get('peak_rss_mb', 0.0) for r in results), default=0.0),
+        'stage_seconds': stage_seconds,
+        'errors': [{'pdf': r['pdf'], 'error': r['error']} for r in results if not r['success']],
+        'results': results,
+    }
+
+    if args.summary:
+        summary_path = Path(args.summary)
+    elif args.output_dir:
+        summary_path = Path(args.output_dir) / 'batch_summary.json'
+    else:
+        summary_path = Path.cwd() / 'batch_summary.json'
+
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"Converted {summary['succeeded']}/{summary['files']} files, "
+                f"{total_pages} pages in {elapsed:.1f}s ({summary['pages_per_second']} pages/s)")
+    if stage_seconds:
+        logger.info("Stage times: " + ", ".join(f"{stage} {seconds:.2f}s"
+                                                for stage, seconds in stage_seconds.items()))
+    logger.info(f"Summary written to {summary_path}")
+
+    return 0 if not summary['failed'] else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
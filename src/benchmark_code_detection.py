@@ -0,0 +1,499 @@
+"""
+새김 (Saekim) 코드 감지 벤치마크
+
+Checks the code classifiers of the PDF importer (backend/code_detection.py)
+against the implementations they replaced and measures their throughput.
+The line classifier is compared line by line with the old regex loop of
+_looks_like_code on a seeded line corpus, the language detector with the
+languages labelled for a fixed set of code blocks; the run fails on any
+line or block where they disagree.
+
+Usage:
+    python src/benchmark_code_detection.py [--lines N] [--passes N] [-o RESULTS]
+"""
+
+import sys
+import json
+import time
+import random
+import string
+import logging
+import argparse
+import platform
+from pathlib import Path
+from datetime import datetime
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.code_detection import CodeLanguageDetector, CodeLineClassifier
+from utils.logger import setup_logger, get_logger
+
+logger = get_logger()
+
+DEFAULT_LINES = 100000
+
+# Pages of the document stream used to measure memoized throughput
+DOCUMENT_PAGES = 200
+
+# Passes over LABELLED_BLOCKS when timing the language detector
+DEFAULT_LANGUAGE_PASSES = 200
+
+WORDS = (
+    "the import engine reads every page of the document and writes markdown with headings "
+    "lists tables images and code blocks while the layout of paragraphs is kept across "
+    "columns sections chapters figures results values records notes references summary"
+).split()
+
+# Lines of real code in the languages the importer meets most
+CODE_LINES = [
+    "def total(items, limit=10) -> int:", "class Parser(Base):", "from pathlib import Path",
+    "import os", "@property", "if value is None:", "elif count > 3:", "else:",
+    "for item in items:", "while queue:", "try:", "except ValueError as e:", "finally:",
+    "with open(path) as f:", "return total", "yield item", "raise KeyError(key)", "pass",
+    "break", "continue", "values = [1, 2, 3]", "config = {'a': 1}", "point = (x, y)",
+    "key=lambda item: item.name", "names = list(map(str, ids))", "print(f\"{name}: {value}\")",
+    "parts = line.split(',')", "text = ', '.join(parts)", "result.append(row)",
+    "const out = rows.filter(r => r.active);", "let count = 0;", "var self = this;",
+    "function render(rows) {", "  => {", "console.log(result);",
+    "public static void main(String[] args) {", "private int count;", "public class Main {",
+    "#include <stdio.h>", "#define MAX 10", "int main(void) {", "printf(\"%d\\n\", x);",
+    "std::cout << value << std::endl;", "// TODO: handle errors", "# comment", "/* block",
+    " */", "x = y + 1", "    return sum;", "\tindent", "$value = 1;", "if (a && b) {",
+    "SELECT id, name FROM users WHERE active = 1;", "}", "{", "};", "end;",
+]
+
+# Keywords, symbols and near misses for the random lines
+FRAGMENTS = [
+    'def', 'class', 'from', 'import', '@x', 'if', 'elif', 'else', 'for', 'while', 'try',
+    'except', 'exceptional', 'finally', 'with', 'return', 'yield', 'raise', 'pass', 'break',
+    'continue', 'const', 'let', 'var', 'function', '=>', 'public', 'private', 'protected',
+    '#include', '#define', 'int main', '//', '#', '##', '/*', '*/', 'lambda', 'map', 'filter',
+    'list', 'dict', 'range', 'print', 'input', 'len', '.split', '.join', '.append', 'int', 'str',
+    'float', 'console.log', 'printf', 'cout', '$var', 'snake_case', '"q"', "'s'", 'x.y(', '{',
+    '}', '[', ']', '(', ')', ';', ':', '=', '==', '!=', '&&', '||', '->', '++', '--', '\t', '    ',
+    '  ', 'é', '한글', ' ', '\x1c', 'tryé', 'if(',
+]
+
+FRAGMENT_CHARS = string.ascii_letters + string.digits + ' _=(){}[]:;.,#@$<>!&|+-*/"\'\t'
+
+# Code blocks labelled with the language the detector has always picked for them
+# ('' = no language). Every pick must stay the same.
+LABELLED_BLOCKS = [
+    ('python', ["def foo(a, b) -> int:", "    if a:", "        return None", "print(foo(1, 2))"]),
+    ('python', ["import os", "from pathlib import Path", "", "class Loader:",
+                "    def __init__(self, root):", "        self.root = Path(root)"]),
+    ('python', ["for name in os.listdir('.'):", "    if name.endswith('.py'):",
+                "        print(name)", "    elif name == 'README':", "        continue"]),
+    ('javascript', ["const x = 1;", "let y = () => x === 1;", "console.log(y);"]),
+    ('javascript', ["function render(rows) {", "  const out = rows.filter(r => r.active);",
+                    "  document.getElementById('list').innerHTML = out.join('');", "}"]),
+    ('javascript', ["const fs = require('fs');", "module.exports = function read(path) {",
+                    "  return fs.readFileSync(path, 'utf8');", "};"]),
+    ('typescript', ["interface Foo {", "  name: string;", "}", "type Bar = Foo;"]),
+    ('typescript', ["export interface User {", "  id: number;", "  email: string;", "}",
+                    "const users: User[] = [];"]),
+    ('typescript', ["function first<T>(items: T[]): T | undefined {", "  return items[0];", "}",
+                    "let count: number = 0;"]),
+    ('java', ["public class Main {", "  public static void main(String[] a) {",
+              "    System.out.println(\"hi\");", "  }", "}"]),
+    ('java', ["import java.util.List;", "", "public class Repo {", "    private final List<String> names;",
+              "    @Override", "    public String toString() {", "        return names.toString();",
+              "    }", "}"]),
+    ('java', ["public interface Shape {", "    double area();", "}",
+              "public class Circle implements Shape {", "    private double r;", "}"]),
+    ('c', ["#include <stdio.h>", "int main(void) {", "  printf(\"x\");", "}"]),
+    ('c', ["#include <stdlib.h>", "struct node {", "    int value;", "    struct node *next;", "};",
+           "struct node *n = malloc(sizeof(struct node));", "free(n);"]),
+    ('c', ["#include <string.h>", "#define MAX 10", "int sum(int *v, int n) {", "    int s = 0;",
+           "    for (int i = 0; i < n; i++) s += v[i];", "    printf(\"%d\", s);", "    return s;", "}"]),
+    ('cpp', ["#include <iostream>", "int main() {", "  std::cout << 1;", "}"]),
+    ('cpp', ["#include <vector>", "using namespace std;", "template <typename T>",
+             "T largest(const vector<T>& v) {", "    return *max_element(v.begin(), v.end());", "}"]),
+    ('cpp', ["class Counter {", "public:", "    void add() { ++count; }", "private:",
+             "    int count = 0;", "};", "std::cout << \"done\" << std::endl;"]),
+    ('csharp', ["using System;", "namespace App {", "  Console.WriteLine(\"x\");", "}"]),
+    ('csharp', ["using System.Threading.Tasks;", "public class Service {",
+                "    public async Task<int> RunAsync() {", "        await Task.Delay(10);",
+                "        return 1;", "    }", "}"]),
+    ('csharp', ["using System.Linq;", "namespace Shop.Models {", "    public class Item {",
+                "        public string Name { get; set; }", "    }", "}"]),
+    ('go', ["package main", "import \"fmt\"", "func main() {", "  x := 1", "  fmt.Println(x)", "}"]),
+    ('go', ["func (s *Server) Start() error {", "    go s.loop()", "    defer s.Close()",
+            "    return nil", "}"]),
+    ('go', ["package store", "", "type Item struct {", "    Name string", "}",
+            "func New() *Item {", "    return &Item{}", "}"]),
+    ('rust', ["fn main() {", "  let mut v = vec![1];", "  println!(\"{}\", v[0]);", "}"]),
+    ('rust', ["use std::collections::HashMap;", "pub struct Cache {", "    map: HashMap<String, u32>,",
+              "}", "impl Cache {", "    pub fn new() -> Self { Cache { map: HashMap::new() } }", "}"]),
+    ('rust', ["fn parse(s: &str) -> Result<u32, String> {", "    match s.parse::<u32>() {",
+              "        Ok(n) => Ok(n),", "        Err(e) => Err(e.to_string()),", "    }", "}"]),
+    ('html', ["<!DOCTYPE html>", "<html><body><div class=\"a\">x</div></body></html>"]),
+    ('html', ["<div class=\"card\">", "  <img src=\"logo.png\" alt=\"logo\">",
+              "  <p>Hello <a href=\"/docs\">docs</a></p>", "</div>"]),
+    ('html', ["<html>", "<head><title>Page</title></head>", "<body>", "  <h1>Title</h1>",
+              "</body>", "</html>"]),
+    ('css', [".box {", "  margin: 0;", "  color: red;", "}"]),
+    ('css', ["body {", "    font-family: sans-serif;", "    background-color: #fff;", "}",
+             "#header .title {", "    padding: 4px 8px;", "}"]),
+    ('css', ["@media (max-width: 600px) {", "  .nav {", "    display: none;", "  }", "}"]),
+    ('sql', ["SELECT name", "FROM users", "WHERE id = 1;"]),
+    ('sql', ["CREATE TABLE orders (", "    id INTEGER PRIMARY KEY,", "    total DECIMAL(10, 2)", ");"]),
+    ('sql', ["INSERT INTO logs (level, message)", "VALUES ('info', 'started');",
+             "UPDATE logs SET level = 'warn' WHERE id = 3;"]),
+    ('bash', ["#!/bin/bash", "export PATH=$HOME/bin", "echo $PATH"]),
+    ('bash', ["for f in *.txt; do", "  echo \"$f\"", "done", "if [ -d build ]; then", "  rm -rf build",
+              "fi"]),
+    ('bash', ["sudo apt-get install -y curl", "cd /tmp && curl -O https://example.com/x.tar.gz",
+              "tar -xzf x.tar.gz"]),
+    ('json', ['{', '  "a": 1,', '  "b": [1,2]', '}']),
+    ('json', ['{', '  "name": "saekim",', '  "version": "1.0.0",', '  "private": true', '}']),
+    ('json', ['[', '  {"id": 1, "tags": ["a", "b"]},', '  {"id": 2, "tags": []}', ']']),
+    ('xml', ['<?xml version="1.0"?>', '<root><a>1</a></root>']),
+    ('xml', ['<?xml version="1.0" encoding="UTF-8"?>', '<project>', '  <modelVersion>4.0.0</modelVersion>',
+             '</project>']),
+    ('yaml', ['name: test', 'items:', '  - key: value']),
+    ('yaml', ['version: 3', 'services:', '  web:', '    image: nginx', '    ports:', '      - 8080']),
+    ('yaml', ['jobs:', '  build:', '    runs-on: ubuntu-latest', '    steps:', '      - run: make']),
+    ('', ['The quick brown fox jumps over the lazy dog.', 'Nothing here looks like a program.']),
+]
+
+
+# ==================== Reference implementations ====================
+
+def legacy_looks_like_code(text: str) -> bool:
+    """
+    DocumentConverter._looks_like_code before CodeLineClassifier replaced it
+    (kept verbatim as the reference for the equivalence check)
+    """
+    import re
+
+    text_stripped = text.strip()
+    if not text_stripped:
+        return False
+
+    # Strong indicators - if any match, it's very likely code
+    strong_patterns = [
+        # Python specific
+        r'^def\s+\w+\s*\([^)]*\)\s*(->\s*\w+)?:',  # def func() -> Type:
+        r'^class\s+\w+.*:',  # class Foo:
+        r'^(from|import)\s+\w+',  # import/from
+        r'^@\w+',  # @decorator
+        r'^\s*if\s+.+:$',  # if condition:
+        r'^\s*elif\s+.+:$',  # elif condition:
+        r'^\s*else\s*:$',  # else:
+        r'^\s*for\s+\w+\s+in\s+.+:',  # for x in ...:
+        r'^\s*while\s+.+:',  # while ...:
+        r'^\s*try\s*:',  # try:
+        r'^\s*except.*:',  # except:
+        r'^\s*finally\s*:',  # finally:
+        r'^\s*with\s+.+:',  # with ...:
+        r'^\s*return\s+',  # return
+        r'^\s*yield\s+',  # yield
+        r'^\s*raise\s+',  # raise
+        r'^\s*pass\s*$',  # pass
+        r'^\s*break\s*$',  # break
+        r'^\s*continue\s*$',  # continue
+        r'\w+\s*=\s*\[.*\]',  # list assignment
+        r'\w+\s*=\s*\{.*\}',  # dict assignment
+        r'\w+\s*=\s*\(.*\)',  # tuple assignment
+        r'lambda\s+\w+\s*:',  # lambda
+        r'map\s*\(.+\)',  # map()
+        r'filter\s*\(.+\)',  # filter()
+        r'list\s*\(.+\)',  # list()
+        r'dict\s*\(.+\)',  # dict()
+        r'range\s*\(.+\)',  # range()
+        r'print\s*\(.+\)',  # print()
+        r'input\s*\(.+\)',  # input()
+        r'len\s*\(.+\)',  # len()
+        r'\.split\s*\(',  # .split()
+        r'\.join\s*\(',  # .join()
+        r'\.append\s*\(',  # .append()
+        r'int\s*\(.+\)',  # int()
+        r'str\s*\(.+\)',  # str()
+        r'float\s*\(.+\)',  # float()
+
+        # JavaScript/TypeScript
+        r'^(const|let|var)\s+\w+\s*=',
+        r'^function\s+\w+\s*\(',
+        r'^\s*=>\s*\{',
+        r'console\.(log|error|warn)\s*\(',
+
+        # Java/C#
+        r'^(public|private|protected)\s+(static\s+)?(void|int|String|boolean)',
+        r'^(public|private|protected)\s+class\s+\w+',
+
+        # C/C++
+        r'^#include\s*[<"]',
+        r'^#define\s+\w+',
+        r'^int\s+main\s*\(',
+        r'printf\s*\(',
+        r'cout\s*<<',
+
+        # General
+        r'^\s*//.*$',  # // comment
+        r'^\s*#(?!#)\s*\w+',  # # comment (but not ## heading)
+        r'^\s*/\*',  # /* comment
+        r'^\s*\*/',  # */ end comment
+    ]
+
+    for pattern in strong_patterns:
+        if re.search(pattern, text_stripped):
+            logger.debug(f"Code pattern matched: {pattern} in '{text_stripped[:50]}...'")
+            return True
+
+    # Check for code-like characteristics
+    code_indicators = 0
+
+    # Has significant indentation (4+ spaces or tab at start)
+    if re.match(r'^(\t|    +)', text):
+        code_indicators += 3
+
+    # Line ends with colon (Python)
+    if text_stripped.endswith(':') and not text_stripped.startswith('#'):
+        code_indicators += 2
+
+    # Contains brackets/braces
+    bracket_count = len(re.findall(r'[\{\}\[\]\(\)]', text_stripped))
+    if bracket_count >= 2:
+        code_indicators += 2
+    elif bracket_count >= 1:
+        code_indicators += 1
+
+    # Contains operators common in code
+    if re.search(r'[=!<>]=|&&|\|\||=>|->|\+\+|--|==|!=', text_stripped):
+        code_indicators += 2
+
+    # Contains semicolon at end (C-style)
+    if text_stripped.endswith(';'):
+        code_indicators += 2
+
+    # Multiple assignment operators
+    if text_stripped.count('=') >= 1 and re.search(r'\w+\s*=\s*\w+', text_stripped):
+        code_indicators += 1
+
+    # Contains common code symbols
+    if re.search(r'[$@]\w+', text_stripped):  # $var, @decorator
+        code_indicators += 2
+
+    # Has snake_case identifiers (common in Python)
+    if re.search(r'\b[a-z]+_[a-z_]+\b', text_stripped):
+        code_indicators += 1
+
+    # Contains string literals with quotes
+    if re.search(r'["\'][^"\']+["\']', text_stripped):
+        code_indicators += 1
+
+    # Line is a comment (# followed by space and text)
+    if re.match(r'^\s*#\s+\S', text_stripped):
+        code_indicators += 2
+
+    # Contains method/function call pattern
+    if re.search(r'\w+\.\w+\(', text_stripped):
+        code_indicators += 2
+
+    # Threshold for considering it code
+    if code_indicators >= 3:
+        logger.debug(f"Code indicators: {code_indicators} for '{text_stripped[:50]}...'")
+        return True
+
+    return False
+
+
+# ==================== Corpus ====================
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def build_line_corpus(lines: int, seed: int = 0) -> list:
+    """
+    Distinct lines for the equivalence check: prose, real code lines (also
+    indented) and random mixes of keywords, symbols and characters
+    """
+    rng = random.Random(seed)
+    corpus = [_sentence(rng, rng.randint(3, 16)) for _ in range(2000)]
+    corpus += [indent + line for line in CODE_LINES for indent in ("", "    ", "\t", "  ")]
+
+    while len(corpus) < lines:
+        parts = [rng.choice(FRAGMENTS) if rng.random() < 0.6 else
+                 ''.join(rng.choice(FRAGMENT_CHARS) for _ in range(rng.randint(1, 8)))
+                 for _ in range(rng.randint(1, 6))]
+        corpus.append(rng.choice(['', '', '    ', '\t', ' ']) + rng.choice([' ', '', ' ', '  ']).join(parts)
+                      + rng.choice(['', ':', ';', ' ', '()', '\n']))
+
+    return list(dict.fromkeys(corpus))[:lines]
+
+
+def build_document_lines(pages: int = DOCUMENT_PAGES, seed: int = 0) -> list:
+    """
+    Text lines of a book in reading order: a running header and footer on
+    every page, prose and an occasional code listing (repeats like a PDF)
+    """
+    rng = random.Random(seed)
+    lines = []
+    for page in range(1, pages + 1):
+        lines.append("The Synthetic Handbook")
+        for _ in range(rng.randint(30, 40)):
+            if rng.random() < 0.05:
+                lines += rng.sample(CODE_LINES, rng.randint(3, 8))
+            else:
+                lines.append(_sentence(rng, rng.randint(8, 14))[:-1])
+        lines += ["Saekim Benchmark Series", str(page)]
+    return lines
+
+
+# ==================== Checks ====================
+
+def _lines_per_second(classify, lines: list) -> float:
+    start_time = time.perf_counter()
+    for line in lines:
+        classify(line)
+    seconds = time.perf_counter() - start_time
+    return round(len(lines) / seconds) if seconds > 0 else 0.0
+
+
+def check_line_classifier(lines: int) -> dict:
+    """
+    Compare CodeLineClassifier with legacy_looks_like_code and time both
+
+    Returns:
+        Dict with 'lines', 'code_lines', 'mismatches' (count), 'examples'
+        (first mismatched lines) and 'lines_per_second' per implementation
+    """
+    corpus = build_line_corpus(lines)
+    classifier = CodeLineClassifier()
+
+    verdicts = [classifier._classify(line) for line in corpus]
+    mismatched = [line for line, verdict in zip(corpus, verdicts)
+                  if legacy_looks_like_code(line) != verdict]
+
+    document = build_document_lines()
+    memoized = CodeLineClassifier()
+    throughput = {
+        'legacy': _lines_per_second(legacy_looks_like_code, corpus),
+        'classifier': _lines_per_second(CodeLineClassifier()._classify, corpus),
+        'legacy_document': _lines_per_second(legacy_looks_like_code, document),
+        'classifier_document': _lines_per_second(memoized.is_code, document),
+    }
+    cache = memoized.cache_info()
+
+    return {
+        'lines': len(corpus),
+        'code_lines': sum(verdicts),
+        'mismatches': len(mismatched),
+        'examples': mismatched[:10],
+        'document_lines': len(document),
+        'document_cache_hit_rate': round(cache.hits / max(1, cache.hits + cache.misses), 3),
+        'lines_per_second': throughput,
+    }
+
+
+def _blocks_per_second(detector: CodeLanguageDetector, blocks: list) -> float:
+    start_time = time.perf_counter()
+    for _, code_lines in blocks:
+        detector.detect(code_lines)
+    seconds = time.perf_counter() - start_time
+    return round(len(blocks) / seconds) if seconds > 0 else 0.0
+
+
+def check_language_detector(passes: int) -> dict:
+    """
+    Check CodeLanguageDetector against LABELLED_BLOCKS and time it
+
+    Uncached timing gives every block to a detector without a verdict
+    cache; cached timing repeats the blocks, like snippets that recur
+    throughout a textbook.
+
+    Returns:
+        Dict with 'blocks', 'mismatches' (count), 'examples' (expected,
+        picked, first line) and 'blocks_per_second' uncached and cached
+    """
+    detector = CodeLanguageDetector()
+    mismatched = []
+    for language, code_lines in LABELLED_BLOCKS:
+        picked = detector.detect(code_lines)
+        if picked != language:
+            mismatched.append((language, picked, code_lines[0]))
+
+    workload = LABELLED_BLOCKS * passes
+    cached = CodeLanguageDetector()
+    throughput = {
+        'uncached': _blocks_per_second(CodeLanguageDetector(cache_size=0), workload),
+        'cached': _blocks_per_second(cached, workload),
+    }
+
+    return {
+        'blocks': len(LABELLED_BLOCKS),
+        'languages': len({language for language, _ in LABELLED_BLOCKS if language}),
+        'mismatches': len(mismatched),
+        'examples': mismatched[:10],
+        'timed_blocks': len(workload),
+        'blocks_per_second': throughput,
+    }
+
+
+def main(argv=None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(
+        description="Check the code classifiers of the PDF importer and measure their throughput."
+    )
+    parser.add_argument('--lines', type=int, default=DEFAULT_LINES,
+                        help="Distinct lines in the line corpus (default: %(default)s)")
+    parser.add_argument('--passes', type=int, default=DEFAULT_LANGUAGE_PASSES,
+                        help="Passes over the labelled code blocks when timing (default: %(default)s)")
+    parser.add_argument('-o', '--output',
+                        help="Also write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    setup_logger()
+    log_level = logger.level
+
+    logger.info(f"Checking the code line classifier on {args.lines} lines "
+                f"and the language detector on {len(LABELLED_BLOCKS)} labelled blocks")
+    # Debug lines of the legacy implementation would drown the results
+    logger.setLevel(logging.WARNING)
+    try:
+        lines = check_line_classifier(max(1, args.lines))
+        languages = check_language_detector(max(1, args.passes))
+    finally:
+        logger.setLevel(log_level)
+
+    speed = lines['lines_per_second']
+    logger.info(f"Line classifier: {lines['mismatches']} of {lines['lines']} lines differ "
+                f"({lines['code_lines']} code lines)")
+    logger.info(f"  corpus:   legacy {speed['legacy']:>10,.0f} lines/s  "
+                f"classifier {speed['classifier']:>10,.0f} lines/s (not memoized)")
+    logger.info(f"  document: legacy {speed['legacy_document']:>10,.0f} lines/s  "
+                f"classifier {speed['classifier_document']:>10,.0f} lines/s "
+                f"({lines['document_cache_hit_rate']:.0%} memo hits)")
+    for line in lines['examples']:
+        logger.error(f"  differs: {line!r}")
+
+    speed = languages['blocks_per_second']
+    logger.info(f"Language detector: {languages['mismatches']} of {languages['blocks']} labelled "
+                f"blocks ({languages['languages']} languages) picked differently")
+    logger.info(f"  {languages['timed_blocks']} blocks: {speed['uncached']:>10,.0f} blocks/s uncached  "
+                f"{speed['cached']:>10,.0f} blocks/s cached")
+    for language, picked, first_line in languages['examples']:
+        logger.error(f"  expected {language or 'none'}, picked {picked or 'none'}: {first_line!r}")
+
+    if args.output:
+        report = {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'line_classifier': lines,
+            'language_detector': languages,
+        }
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Results written to {output_path}")
+
+    return 1 if lines['mismatches'] or languages['mismatches'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
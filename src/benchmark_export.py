@@ -0,0 +1,223 @@
+"""
+새김 (Saekim) PDF 내보내기 벤치마크
+
+Headless benchmark of Markdown → PDF export latency with a cold browser
+(Playwright and Chromium launched and closed for every export, as each
+export did before the browser was kept running), with a warm one
+(launched once, reused by every export), and of the same exports started
+at once on the warm browser.
+
+Usage:
+    python src/benchmark_export.py [--cases CASE,...] [--exports N] [-o RESULTS]
+"""
+
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.logger import setup_logger, get_logger
+
+# Case name -> (sections, description)
+BENCHMARK_CASES = {
+    'note': (1, "One-page note"),
+    'report': (12, "Report of about ten pages: headings, paragraphs, tables and code"),
+}
+
+DEFAULT_EXPORTS = 5
+
+WORDS = (
+    "the export renders every section of the document with headings lists tables and "
+    "code blocks while page numbers margins and fonts follow the printed layout of the "
+    "report chapter figure result value record note reference summary"
+).split()
+
+
+def build_markdown(sections: int, seed: int = 0) -> str:
+    """Deterministic Markdown document with the given number of sections"""
+    rng = random.Random(seed)
+
+    def sentence(words: int = 14) -> str:
+        text = " ".join(rng.choice(WORDS) for _ in range(words))
+        return text[0].upper() + text[1:] + "."
+
+    lines = ["# Benchmark Report", ""]
+    for section in range(1, sections + 1):
+        lines += [f"## Section {section}", ""]
+        for _ in range(3):
+            lines += [" ".join(sentence() for _ in range(5)), ""]
+        lines += ["| Item | Count | Share |", "| --- | ---: | ---: |"]
+        lines += [f"| {rng.choice(WORDS)} | {rng.randint(1, 999)} | {rng.random():.2f} |"
+                  for _ in range(6)]
+        lines += ["", "```python", f"def section_{section}(items):",
+                  "    return sorted(items)[:10]", "```", ""]
+        lines += [f"- {sentence(8)}" for _ in range(4)]
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def _summary(seconds: list) -> dict:
+    return {
+        'runs': len(seconds),
+        'median_seconds': round(_percentile(seconds, 0.5), 3),
+        'p90_seconds': round(_percentile(seconds, 0.9), 3),
+        'min_seconds': round(min(seconds), 3),
+    }
+
+
+def run_case(markdown: str, exports: int, work_dir: Path) -> dict:
+    """
+    Export one document cold and warm
+
+    Returns:
+        Dict with 'cold' and 'warm' summaries, 'first_warm_seconds' (the
+        export that launched the warm browser), 'parallel_seconds' (all
+        exports started at once, warm), 'launches' and 'error'
+    """
+    from backend.converter import DocumentConverter
+    from backend.pdf_browser import PdfBrowserService
+
+    converter = DocumentConverter()
+    result = {'cold': None, 'warm': None, 'first_warm_seconds': 0.0, 'parallel_seconds': 0.0,
+              'launches': 0, 'error': ""}
+
+    def export(index: int) -> float:
+        output_path = work_dir / f"export-{index}.pdf"
+        start_time = time.perf_counter()
+        success, error = converter.markdown_to_pdf(markdown, str(output_path), "Benchmark")
+        seconds = time.perf_counter() - start_time
+        if not success:
+            raise RuntimeError(error)
+        output_path.unlink()
+        return seconds
+
+    try:
+        # Cold: a new browser for every export, closed again afterwards
+        cold = []
+        for index in range(exports):
+            converter.pdf_browser = PdfBrowserService()
+            start_time = time.perf_counter()
+            export(index)
+            converter.close()
+            cold.append(time.perf_counter() - start_time)
+        result['cold'] = _summary(cold)
+
+        # Warm: the first export launches the browser, the others reuse it
+        converter.pdf_browser = PdfBrowserService()
+        result['first_warm_seconds'] = round(export(0), 3)
+        result['warm'] = _summary([export(index) for index in range(exports)])
+
+        # Parallel: every export submitted at once to the warm browser
+        start_time = time.perf_counter()
+        futures = [converter.markdown_to_pdf_async(markdown, str(work_dir / f"parallel-{index}.pdf"),
+                                                   "Benchmark")
+                   for index in range(exports)]
+        errors = [error for success, error in (future.result() for future in futures) if not success]
+        if errors:
+            raise RuntimeError(errors[0])
+        result['parallel_seconds'] = round(time.perf_counter() - start_time, 3)
+        result['launches'] = converter.pdf_browser.launches
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        converter.close()
+
+    return result
+
+
+def _package_version(name: str) -> str:
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return ""
+
+
+def main(argv=None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark PDF export latency with a cold and a warm browser."
+    )
+    parser.add_argument('--cases', default=",".join(BENCHMARK_CASES),
+                        help=f"Comma-separated cases (default: all of {', '.join(BENCHMARK_CASES)})")
+    parser.add_argument('--exports', type=int, default=DEFAULT_EXPORTS,
+                        help="Timed exports per case and mode (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='benchmark_export_results.json',
+                        help="Path of the JSON results (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    logger = setup_logger()
+
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    unknown = [case for case in cases if case not in BENCHMARK_CASES]
+    if unknown:
+        logger.error(f"Unknown cases: {', '.join(unknown)}")
+        return 2
+
+    logger.info(f"Benchmarking PDF export on {', '.join(cases)} ({args.exports} exports per mode)")
+    started_at = datetime.now().isoformat(timespec='seconds')
+    exports = max(1, args.exports)
+
+    # Per-export log lines would drown the results
+    log_level = get_logger().level
+    get_logger().setLevel(logging.WARNING)
+    results = {}
+    work_dir = Path(tempfile.mkdtemp(prefix='saekim_benchmark_export_'))
+    try:
+        for case in cases:
+            markdown = build_markdown(BENCHMARK_CASES[case][0])
+            results[case] = dict(run_case(markdown, exports, work_dir), markdown_bytes=len(markdown))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        get_logger().setLevel(log_level)
+
+    for case, result in results.items():
+        if result['error']:
+            logger.info(f"{case:8} FAILED: {result['error']}")
+            continue
+        cold, warm = result['cold']['median_seconds'], result['warm']['median_seconds']
+        logger.info(f"{case:8} cold {cold:6.3f}s  warm {warm:6.3f}s  "
+                    f"first warm {result['first_warm_seconds']:6.3f}s  "
+                    f"({cold / warm if warm else 0:.1f}x faster warm), "
+                    f"{exports} at once {result['parallel_seconds']:6.3f}s")
+
+    report = {
+        'started_at': started_at,
+        'exports': exports,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'playwright': _package_version('playwright'),
+        },
+        'cases': results,
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logger.info(f"Results written to {output_path}")
+
+    failed = [case for case, result in results.items() if result['error']]
+    if failed:
+        logger.error(f"Failed cases: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,986 @@
+"""
+새김 (Saekim) PDF 가져오기 벤치마크
+
+Headless benchmark of the PDF → Markdown import engines on a synthetic corpus.
+The corpus is generated locally with PyMuPDF from fixed seeds (no network,
+same PDFs on every machine); every engine runs every case in a fresh process,
+so peak memory is measured per run. Results can be compared with a stored
+baseline to catch regressions.
+
+Usage:
+    python src/benchmark_import.py [--cases CASE,...] [--engines ENGINE,...] [--profile PROFILE]
+                                   [-o RESULTS] [--baseline BASELINE] [--save-baseline BASELINE]
+    python src/benchmark_import.py --micro NAME,...|all [-o RESULTS]
+"""
+
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import multiprocessing
+from pathlib import Path
+from typing import Optional
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.pdf_import_profiles import (
+    DEFAULT_PDF_IMPORT_PROFILE, PDF_IMPORT_PROFILES, PDF_IMPORT_STAGES
+)
+from utils.logger import setup_logger, get_logger
+from utils.memory import peak_rss_mb
+
+# Bump whenever a generator changes, so old corpus files are not reused
+CORPUS_VERSION = 1
+
+# Case name -> (pages, description)
+BENCHMARK_CASES = {
+    'text': (50, "Headings and paragraphs only"),
+    'code': (50, "Code listings in monospace fonts, some continuing across pages"),
+    'tables': (50, "Ruled tables with captions, several per page"),
+    'images': (50, "Captioned photos on every page and a logo repeated on all pages"),
+    'columns': (50, "Two-column layout"),
+    'large': (1000, "1,000-page book: running headers, chapters, occasional code, tables and figures"),
+}
+
+BENCHMARK_ENGINES = ('pymupdf', 'pdfplumber')
+
+# Relative change beyond which a result counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# Throughput of runs this short is too noisy to flag (still reported)
+MIN_COMPARED_SECONDS = 2.0
+
+DEFAULT_CORPUS_DIR = Path(tempfile.gettempdir()) / 'saekim_benchmark_corpus'
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4
+MARGIN = 72
+
+WORDS = (
+    "the import engine reads every page of the document and writes markdown with headings "
+    "lists tables images and code blocks while the layout of paragraphs is kept across "
+    "columns sections chapters figures results values records notes references summary"
+).split()
+
+CODE_SNIPPETS = (
+    ["def {name}(items, limit=10):", "    total = 0", "    for item in items[:limit]:",
+     "        total += item.value", "    return total"],
+    ["function {name}(rows) {{", "  const out = rows.filter(r => r.active);", "  return out.length;", "}}"],
+    ["SELECT id, name FROM {name}", "WHERE created_at > '2024-01-01'", "ORDER BY name;"],
+    ["public int {name}(int[] values) {{", "    int sum = 0;", "    for (int v : values) sum += v;",
+     "    return sum;", "}}"],
+)
+
+
+# ==================== Corpus ====================
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(3, 5)))
+
+
+def _photo(rng: random.Random, width: int = 160, height: int = 120) -> bytes:
+    """PNG of random colour blocks (compresses like a photo, unlike a flat fill)"""
+    import fitz  # PyMuPDF
+
+    block = 8
+    blocks_per_row = -(-width // block)
+    colors = [bytes(rng.randrange(256) for _ in range(3))
+              for _ in range(blocks_per_row * -(-height // block))]
+    samples = bytearray()
+    for y in range(height):
+        row = colors[(y // block) * blocks_per_row:(y // block + 1) * blocks_per_row]
+        samples += b"".join(color * block for color in row)[:width * 3]
+    return fitz.Pixmap(fitz.csRGB, width, height, bytes(samples), 0).tobytes("png")
+
+
+class _PageWriter:
+    """
+    Places text top to bottom on the pages of a document, starting new pages as needed
+
+    Text and rules of a page are drawn into one Shape, so every page gets a
+    single content stream like a typical PDF. close() commits the last page.
+    """
+
+    def __init__(self, doc, header: str = "", logo: bytes = None):
+        self.doc = doc
+        self.header = header
+        self.logo = logo  # Image repeated at the top of every page
+        self.page = None
+        self.shape = None
+        self.y = 0
+        self.new_page()
+
+    def new_page(self):
+        self.close()
+        self.page = self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        self.shape = self.page.new_shape()
+        if self.header:
+            self.shape.insert_text((MARGIN, 36), self.header, fontsize=8)
+        if self.logo:
+            self.page.insert_image((PAGE_WIDTH - MARGIN - 40, 20, PAGE_WIDTH - MARGIN, 40), stream=self.logo)
+        self.shape.insert_text((PAGE_WIDTH / 2 - 10, PAGE_HEIGHT - 30), f"- {len(self.doc)} -", fontsize=8)
+        self.y = MARGIN
+
+    def close(self):
+        if self.shape is not None:
+            self.shape.commit()
+            self.shape = None
+
+    def space(self, height: float) -> bool:
+        return self.y + height <= PAGE_HEIGHT - MARGIN
+
+    def line(self, text: str, fontsize: float = 10, fontname: str = "helv", leading: float = 1.4):
+        if not self.space(fontsize * leading):
+            self.new_page()
+        self.y += fontsize * leading
+        self.shape.insert_text((MARGIN, self.y), text, fontsize=fontsize, fontname=fontname)
+
+    def paragraph(self, text: str, fontsize: float = 10):
+        """Wrap text to the page width"""
+        chars_per_line = int((PAGE_WIDTH - 2 * MARGIN) / (fontsize * 0.5))
+        line = []
+        for word in text.split():
+            if line and len(" ".join(line + [word])) > chars_per_line:
+                self.line(" ".join(line), fontsize)
+                line = []
+            line.append(word)
+        if line:
+            self.line(" ".join(line), fontsize)
+        self.y += fontsize * 0.6
+
+    def code(self, lines: list):
+        for text in lines:
+            self.line(text, fontsize=9, fontname="cour", leading=1.3)
+        self.y += 6
+
+    def table(self, rng: random.Random, rows: int = 8, cols: int = 5):
+        row_height, col_width = 16, (PAGE_WIDTH - 2 * MARGIN) / cols
+        if not self.space(rows * row_height + 10):
+            self.new_page()
+        top = self.y + 6
+        for row in range(rows):
+            for col in range(cols):
+                rect = (MARGIN + col * col_width, top + row * row_height,
+                        MARGIN + (col + 1) * col_width, top + (row + 1) * row_height)
+                self.shape.draw_rect(rect)
+                cell = f"Column {col + 1}" if row == 0 else (
+                    rng.choice(WORDS) if col == 0 else f"{rng.uniform(0, 1000):.2f}")
+                self.shape.insert_text((rect[0] + 3, rect[3] - 4), cell, fontsize=8)
+        self.shape.finish(color=(0, 0, 0), width=0.6)
+        self.y = top + rows * row_height + 12
+
+    def image(self, png: bytes, width: float = 160, height: float = 120):
+        if not self.space(height + 10):
+            self.new_page()
+        rect = (MARGIN, self.y + 4, MARGIN + width, self.y + 4 + height)
+        self.page.insert_image(rect, stream=png)
+        self.y = rect[3] + 8
+
+
+def _fill_pages(doc, pages: int, writer: _PageWriter, add_block):
+    """Call add_block() until the document has the requested number of pages"""
+    while len(doc) < pages or writer.space(200):
+        add_block()
+        if len(doc) > pages:
+            break
+    writer.close()
+    if len(doc) > pages:
+        doc.delete_page(len(doc) - 1)  # Partial page beyond the requested count
+
+
+def _build_text(doc, pages: int, rng: random.Random):
+    writer = _PageWriter(doc)
+    section = [0]
+
+    def add_block():
+        if rng.random() < 0.15:
+            section[0] += 1
+            writer.line(f"{section[0]}. {_sentence(rng, 4)[:-1]}", fontsize=16)
+        writer.paragraph(_paragraph(rng))
+
+    _fill_pages(doc, pages, writer, add_block)
+
+
+def _build_code(doc, pages: int, rng: random.Random):
+    writer = _PageWriter(doc)
+
+    def add_block():
+        writer.paragraph(_sentence(rng))
+        snippet = rng.choice(CODE_SNIPPETS)
+        name = "_".join(rng.choice(WORDS) for _ in range(2))
+        writer.code([line.format(name=name) for line in snippet] * rng.randint(1, 3))
+
+    _fill_pages(doc, pages, writer, add_block)
+
+
+def _build_tables(doc, pages: int, rng: random.Random):
+    writer = _PageWriter(doc)
+
+    def add_block():
+        writer.paragraph(_sentence(rng, 20))
+        writer.table(rng)
+
+    _fill_pages(doc, pages, writer, add_block)
+
+
+def _build_images(doc, pages: int, rng: random.Random):
+    writer = _PageWriter(doc, logo=_photo(random.Random(0), 40, 20))
+
+    def add_block():
+        writer.line(f"Figure: {_sentence(rng, 6)}")
+        writer.image(_photo(rng))
+
+    _fill_pages(doc, pages, writer, add_block)
+
+
+def _build_columns(doc, pages: int, rng: random.Random):
+    gap = 24
+    column_width = (PAGE_WIDTH - 2 * MARGIN - gap) / 2
+    for _ in range(pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page.insert_text((MARGIN, 60), _sentence(rng, 5)[:-1], fontsize=16)
+        for column in range(2):
+            x0 = MARGIN + column * (column_width + gap)
+            text = "\n\n".join(_paragraph(rng) for _ in range(4))
+            page.insert_textbox((x0, 80, x0 + column_width, PAGE_HEIGHT - MARGIN), text,
+                                fontsize=9, fontname="helv")
+
+
+def _build_large(doc, pages: int, rng: random.Random):
+    writer = _PageWriter(doc, header="The Synthetic Handbook")
+    chapter = [0]
+
+    def add_block():
+        roll = rng.random()
+        if len(doc) // 25 >= chapter[0]:
+            chapter[0] += 1
+            if writer.y > MARGIN:
+                writer.new_page()
+            writer.line(f"Chapter {chapter[0]}: {_sentence(rng, 3)[:-1]}", fontsize=20)
+        if roll < 0.06:
+            snippet = rng.choice(CODE_SNIPPETS)
+            writer.code([line.format(name=rng.choice(WORDS)) for line in snippet])
+        elif roll < 0.08:
+            writer.table(rng, rows=6, cols=4)
+        elif roll < 0.09:
+            writer.image(_photo(rng, 120, 90), 120, 90)
+        else:
+            writer.paragraph(_paragraph(rng))
+
+    _fill_pages(doc, pages, writer, add_block)
+
+
+_CASE_BUILDERS = {
+    'text': _build_text,
+    'code': _build_code,
+    'tables': _build_tables,
+    'images': _build_images,
+    'columns': _build_columns,
+    'large': _build_large,
+}
+
+
+def generate_case(case: str, corpus_dir: Path, pages: Optional[int] = None) -> Path:
+    """
+    Generate the PDF of a benchmark case, unless it already exists
+
+    The content only depends on the case name, the page count and
+    CORPUS_VERSION.
+
+    Args:
+        case: Benchmark case
+        corpus_dir: Folder of the generated PDFs
+        pages: Page count other than the case's own (micro-benchmarks)
+
+    Returns:
+        Path of the PDF
+    """
+    import fitz  # PyMuPDF
+
+    if pages is None:
+        pages, _ = BENCHMARK_CASES[case]
+        pdf_path = Path(corpus_dir) / f"{case}-v{CORPUS_VERSION}.pdf"
+    else:
+        pdf_path = Path(corpus_dir) / f"{case}-{pages}p-v{CORPUS_VERSION}.pdf"
+    if pdf_path.exists():
+        return pdf_path
+
+    doc = fitz.open()
+    _CASE_BUILDERS[case](doc, pages, random.Random(f"{case}-{CORPUS_VERSION}"))
+    doc.set_metadata({'title': f"Saekim benchmark: {case}", 'producer': "Saekim benchmark"})
+
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = pdf_path.with_suffix('.tmp')
+    doc.save(temp_path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+    temp_path.replace(pdf_path)
+    return pdf_path
+
+
+# ==================== Runs ====================
+
+def run_case(pdf_path: str, engine: str, profile: str, images_dir: str) -> dict:
+    """
+    Worker process entry point: import one PDF with one engine
+
+    The persistent import cache and history are off, so every run does the
+    full work. Errors are reported, never raised.
+    """
+    from backend.converter import DocumentConverter
+    from backend.pdf_import_profiles import PdfImportTimings
+
+    get_logger().setLevel(logging.WARNING)
+
+    result = {
+        'success': False,
+        'seconds': 0.0,
+        'pages_per_second': 0.0,
+        'peak_rss_mb': 0.0,
+        'characters': 0,
+        'stage_seconds': {},
+        'error': "",
+    }
+
+    converter = DocumentConverter()
+    converter.import_cache = None
+    converter.import_history = None
+    converter.image_objects_dir = None
+    timings = PdfImportTimings(profile)
+
+    start_time = time.perf_counter()
+    try:
+        if engine == 'pymupdf':
+            success, content, error = converter._pdf_to_markdown_pymupdf(
+                pdf_path, images_dir, profile=profile, timings=timings
+            )
+        else:
+            success, content, error = converter._pdf_to_markdown_pdfplumber(
+                pdf_path, profile=profile, timings=timings
+            )
+        result['success'] = success
+        result['characters'] = len(content)
+        result['error'] = error
+    except Exception as e:
+        result['error'] = f"PDF to Markdown conversion failed: {str(e)}"
+
+    seconds = time.perf_counter() - start_time
+    pages = len(timings.pages)
+    result['seconds'] = round(seconds, 3)
+    result['pages_per_second'] = round(pages / seconds, 2) if seconds > 0 else 0.0
+    result['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    result['stage_seconds'] = timings.to_dict(include_pages=False)['stage_seconds']
+    return result
+
+
+def run_benchmark(cases: list, engines: list, profile: str, corpus_dir: Path,
+                  repeat: int, logger) -> dict:
+    """
+    Run every engine on every case
+
+    Each run gets its own spawned process, so imports and peak memory of one
+    run never leak into the next. With repeat > 1 the run with the median
+    time is kept.
+    """
+    import fitz  # PyMuPDF
+
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    work_dir = Path(tempfile.mkdtemp(prefix='saekim_benchmark_'))
+
+    try:
+        for case in cases:
+            pdf_path = generate_case(case, corpus_dir)
+            with fitz.open(pdf_path) as doc:
+                pages = len(doc)
+            case_result = {'pdf': str(pdf_path), 'pages': pages, 'engines': {}}
+            results[case] = case_result
+
+            for engine in engines:
+                runs = []
+                for run in range(repeat):
+                    images_dir = work_dir / f"{case}-{engine}-{run}"
+                    executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+                    try:
+                        runs.append(executor.submit(run_case, str(pdf_path), engine, profile,
+                                                    str(images_dir)).result())
+                    except BrokenProcessPool:
+                        runs.append({'success': False, 'error': "Worker process crashed"})
+                    finally:
+                        executor.shutdown(wait=True)
+                        shutil.rmtree(images_dir, ignore_errors=True)
+
+                runs.sort(key=lambda result: result.get('seconds', 0.0))
+                result = runs[len(runs) // 2]
+                case_result['engines'][engine] = result
+
+                if result['success']:
+                    logger.info(f"{case:8} {engine:10} {pages:5} pages {result['seconds']:8.2f}s "
+                                f"{result['pages_per_second']:8.1f} pages/s "
+                                f"{result['peak_rss_mb']:7.0f} MB peak")
+                else:
+                    logger.info(f"{case:8} {engine:10} FAILED: {result['error']}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def compare_with_baseline(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare results with a baseline run
+
+    A case/engine regresses when its pages/s dropped, or its peak memory
+    grew, by more than threshold (relative). Pages/s is not flagged when
+    both runs took less than MIN_COMPARED_SECONDS. Cases or engines missing
+    from either run are skipped; runs that failed now but not in the
+    baseline are regressions.
+
+    Returns:
+        List of dicts with 'case', 'engine', 'metric', 'baseline', 'current',
+        'change' (relative) and 'regression'
+    """
+    comparisons = []
+    for case, case_result in results.items():
+        baseline_case = baseline.get('cases', {}).get(case)
+        if not baseline_case or baseline_case.get('pages') != case_result['pages']:
+            continue
+
+        for engine, result in case_result['engines'].items():
+            baseline_result = baseline_case['engines'].get(engine)
+            if not baseline_result or not baseline_result.get('success'):
+                continue
+
+            if not result['success']:
+                comparisons.append({'case': case, 'engine': engine, 'metric': 'success',
+                                    'baseline': True, 'current': False, 'change': None,
+                                    'regression': True})
+                continue
+
+            # Higher is better for pages/s, lower for memory
+            for metric, higher_is_better in (('pages_per_second', True), ('peak_rss_mb', False)):
+                old, new = baseline_result.get(metric, 0), result[metric]
+                if not old:
+                    continue
+                change = (new - old) / old
+                regression = change < -threshold if higher_is_better else change > threshold
+                if higher_is_better and max(result['seconds'], baseline_result.get('seconds', 0)) \
+                        < MIN_COMPARED_SECONDS:
+                    regression = False
+                comparisons.append({'case': case, 'engine': engine, 'metric': metric,
+                                    'baseline': old, 'current': new, 'change': round(change, 4),
+                                    'regression': regression})
+    return comparisons
+
+
+# ==================== Micro-benchmarks ====================
+
+# Page counts of the table documents in 'table-scaling'
+TABLE_SCALING_PAGES = (25, 50, 100)
+
+# Time per page may grow at most this much from the smallest to the largest
+# document before the scaling counts as no longer linear
+MAX_LINEAR_GROWTH = 1.5
+
+
+def micro_table_scaling(corpus_dir: Path) -> dict:
+    """
+    Table extraction time per page on table documents of growing length
+
+    Every page goes through _extract_tables_from_page with one shared
+    PdfImportSession per document, as an import does, once per table
+    engine. 'reopen' opens the file with pdfplumber again for every page,
+    as imports did before the session; its time per page grows with the
+    page count.
+
+    Returns:
+        Dict with 'ms_per_page' and 'growth' per mode, 'success', 'summary' and 'error'
+    """
+    import pdfplumber
+    from backend.converter import PDF_TABLE_ENGINES, DocumentConverter, PdfImportSession
+
+    converter = DocumentConverter()
+    documents = {pages: generate_case('tables', corpus_dir, pages) for pages in TABLE_SCALING_PAGES}
+    result = {'pages': list(TABLE_SCALING_PAGES), 'ms_per_page': {}, 'growth': {},
+              'success': True, 'summary': "", 'error': ""}
+
+    for mode in PDF_TABLE_ENGINES + ('reopen',):
+        ms_per_page = []
+        for pages, pdf_path in documents.items():
+            start_time = time.perf_counter()
+            if mode == 'reopen':
+                for page_idx in range(pages):
+                    with pdfplumber.open(pdf_path) as pdf:
+                        for table in pdf.pages[page_idx].find_tables():
+                            table.extract()
+            else:
+                with PdfImportSession(pdf_path, table_engine=mode) as session:
+                    for page_idx in range(pages):
+                        converter._extract_tables_from_page(session, session.doc[page_idx], page_idx)
+            ms_per_page.append(round((time.perf_counter() - start_time) * 1000 / pages, 2))
+
+        result['ms_per_page'][mode] = ms_per_page
+        result['growth'][mode] = round(ms_per_page[-1] / ms_per_page[0], 2)
+
+    result['summary'] = "  ".join(
+        f"{mode} {'/'.join(map(str, ms_per_page))} ms/page ({result['growth'][mode]}x)"
+        for mode, ms_per_page in result['ms_per_page'].items())
+    slow = [mode for mode in PDF_TABLE_ENGINES if result['growth'][mode] > MAX_LINEAR_GROWTH]
+    if slow:
+        result['success'] = False
+        result['error'] = (f"Time per page grows more than {MAX_LINEAR_GROWTH}x with "
+                           f"{', '.join(slow)}")
+    return result
+
+
+# Corpus cases whose pdfplumber chars 'line-grouping' groups into lines
+LINE_GROUPING_CASES = ('text', 'code', 'columns')
+
+
+def _legacy_group_chars_into_lines(chars: list, is_monospace_font) -> list:
+    """
+    Line grouping of the pdfplumber engine before it was vectorized: a dict
+    of chars per rounded top, each line sorted on its own and every font of
+    every line checked for monospace (kept as the reference)
+    """
+    lines_by_y = {}
+    for char in chars:
+        y = round(char['top'], 1)  # Round to group nearby chars
+        if y not in lines_by_y:
+            lines_by_y[y] = []
+        lines_by_y[y].append(char)
+
+    lines = []
+    for y in sorted(lines_by_y.keys()):
+        line_chars = sorted(lines_by_y[y], key=lambda c: c['x0'])
+        line_text = ''.join(c['text'] for c in line_chars)
+        fonts = set(c.get('fontname', '') for c in line_chars)
+        lines.append((y, line_text, any(is_monospace_font(font.lower()) for font in fonts)))
+    return lines
+
+
+def _best_seconds(function, repeat: int = 3) -> float:
+    seconds = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start_time)
+    return min(seconds)
+
+
+# Lengths of the code listings in 'code-blocks'
+CODE_BLOCK_LINES = (5000, 10000, 20000)
+
+# Code lines per text block and per page of the synthetic listings
+CODE_BLOCK_LINES_PER_BLOCK = 5
+CODE_BLOCK_LINES_PER_PAGE = 50
+
+
+def micro_code_blocks(corpus_dir: Path) -> dict:
+    """
+    Merge time per line of one code listing spread over many blocks and pages
+
+    Feeds a synthetic listing of each CODE_BLOCK_LINES length through
+    PdfPageAssembler as page results, so the listing is collected by one
+    CodeBlockAccumulator across all its blocks and pages and formatted once.
+    Checks that the output is a single code block holding every line.
+
+    Returns:
+        Dict with 'lines', 'us_per_line', 'growth', 'success', 'summary' and 'error'
+    """
+    from backend.converter import DocumentConverter, PdfImportSession, PdfPageAssembler
+
+    converter = DocumentConverter()
+    converter.image_objects_dir = None  # No images; keep the user's store untouched
+    result = {'lines': list(CODE_BLOCK_LINES), 'us_per_line': [], 'growth': 0.0,
+              'success': True, 'summary': "", 'error': ""}
+
+    for line_count in CODE_BLOCK_LINES:
+        code_lines = [f"    result_{i} = compute(value_{i}, {i})" if i % 7 else ""
+                      for i in range(line_count)]
+        pages = []
+        for page_start in range(0, line_count, CODE_BLOCK_LINES_PER_PAGE):
+            page_lines = code_lines[page_start:page_start + CODE_BLOCK_LINES_PER_PAGE]
+            items = [{'type': 'text', 'margin_keys': [],
+                      'lines': [(text, True, 10.0, False, False)
+                                for text in page_lines[i:i + CODE_BLOCK_LINES_PER_BLOCK]]}
+                     for i in range(0, len(page_lines), CODE_BLOCK_LINES_PER_BLOCK)]
+            pages.append({'page_num': len(pages) + 1, 'items': items, 'tables': []})
+
+        # The document is never opened: the pages hold no images
+        session = PdfImportSession(corpus_dir / 'code-blocks.pdf')
+        with tempfile.TemporaryDirectory() as images_dir:
+            start_time = time.perf_counter()
+            assembler = PdfPageAssembler(converter, session, Path(images_dir),
+                                         'code-blocks', len(pages))
+            try:
+                chunks = []
+                for page in pages:
+                    chunks += assembler.add_page(page)
+                chunks += assembler.finish()
+            finally:
+                assembler.close()
+            seconds = time.perf_counter() - start_time
+
+        result['us_per_line'].append(round(seconds * 1e6 / line_count, 2))
+        # Common indentation is removed when the block is formatted
+        markdown = ''.join(chunks)
+        kept = sum(1 for text in code_lines if text and text.strip() in markdown)
+        expected = sum(1 for text in code_lines if text)
+        if markdown.count('```') != 2 or kept != expected:
+            result['success'] = False
+            result['error'] = (f"{line_count}-line listing: {markdown.count('```') // 2} "
+                               f"code blocks, {kept}/{expected} lines kept")
+
+    result['growth'] = round(result['us_per_line'][-1] / result['us_per_line'][0], 2)
+    result['summary'] = (f"{'/'.join(map(str, result['us_per_line']))} us/line for "
+                         f"{'/'.join(map(str, CODE_BLOCK_LINES))} lines ({result['growth']}x)")
+    if result['success'] and result['growth'] > MAX_LINEAR_GROWTH:
+        result['success'] = False
+        result['error'] = f"Time per line grows more than {MAX_LINEAR_GROWTH}x"
+    return result
+
+
+def micro_line_grouping(corpus_dir: Path) -> dict:
+    """
+    Pages per second of the pdfplumber engine's line grouping
+
+    Groups the chars of every page of the LINE_GROUPING_CASES documents
+    with _group_chars_into_lines and with the loop it replaced, and checks
+    that both give the same lines. Only the grouping is timed (best of 3);
+    the chars are read beforehand.
+
+    Returns:
+        Dict with 'pages', 'chars', 'pages_per_second' per implementation,
+        'speedup', 'success', 'summary' and 'error'
+    """
+    import pdfplumber
+    from backend.converter import DocumentConverter
+
+    converter = DocumentConverter()
+    pages = []
+    for case in LINE_GROUPING_CASES:
+        with pdfplumber.open(generate_case(case, corpus_dir)) as pdf:
+            pages += [page.chars for page in pdf.pages]
+
+    def group_all():
+        monospace_fonts = {}  # Shared by all pages, as in one import
+        return [converter._group_chars_into_lines(chars, monospace_fonts) for chars in pages]
+
+    def group_all_legacy():
+        return [_legacy_group_chars_into_lines(chars, converter._is_monospace_font) for chars in pages]
+
+    same = [[line[:3] for line in lines] for lines in group_all()] == group_all_legacy()
+    legacy_seconds = _best_seconds(group_all_legacy)
+    seconds = _best_seconds(group_all)
+
+    result = {
+        'pages': len(pages),
+        'chars': sum(map(len, pages)),
+        'pages_per_second': {
+            'legacy': round(len(pages) / legacy_seconds, 1),
+            'vectorized': round(len(pages) / seconds, 1),
+        },
+        'speedup': round(legacy_seconds / seconds, 2),
+        'success': same,
+        'summary': "",
+        'error': "" if same else "Grouped lines differ from the legacy loop",
+    }
+    result['summary'] = "  ".join(f"{name} {value:.0f} pages/s"
+                                  for name, value in result['pages_per_second'].items()) + \
+        f" ({result['speedup']}x, {result['pages']} pages, {result['chars']} chars)"
+    return result
+
+
+# Page size and margin of the document in 'margins' (US Letter, 1 inch)
+MARGIN_CHECK_PAGE = (612, 792)
+MARGIN_CHECK_MARGIN = 72
+MARGIN_CHECK_PAGES = 30
+
+
+def _build_margin_check(pdf_path: Path) -> tuple:
+    """
+    Letter-size document with a running header and page numbers in the
+    margins and body text right at the 1-inch margins: a log listing whose
+    lines only differ by numbers, and on every page a short total line
+    first and last plus a paragraph starting at the top margin
+
+    Returns:
+        (body lines, header text, footer texts)
+    """
+    import fitz  # PyMuPDF
+
+    width, height = MARGIN_CHECK_PAGE
+    body, footers = [], []
+    doc = fitz.open()
+    for page_num in range(1, MARGIN_CHECK_PAGES + 1):
+        page = doc.new_page(width=width, height=height)
+        shape = page.new_shape()
+        shape.insert_text((MARGIN_CHECK_MARGIN, 40), "Operations Log Review", fontsize=9)
+        footer = f"Page {page_num} of {MARGIN_CHECK_PAGES}"
+        shape.insert_text((width / 2 - 30, height - 30), footer, fontsize=9)
+        footers.append(footer)
+
+        y = MARGIN_CHECK_MARGIN + 9
+        page_lines = [(f"Total: {page_num * 17}", "helv")]
+        page_lines += [(f"Requests served on day {page_num} were stable with no failed retries.", "helv")]
+        page_lines += [(f"2024-01-{page_num:02d} 12:{minute:02d}:07 INFO request "
+                        f"{page_num * 100 + minute} served in {minute + 3} ms", "cour")
+                       for minute in range(50)]
+        page_lines += [(f"Total: {page_num * 17 + 1}", "helv")]
+        for text, fontname in page_lines:
+            shape.insert_text((MARGIN_CHECK_MARGIN, y), text, fontsize=9, fontname=fontname)
+            body.append(text)
+            y += 12.3
+        shape.commit()
+
+    doc.save(pdf_path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+    return body, "Operations Log Review", footers
+
+
+def micro_margins(corpus_dir: Path) -> dict:
+    """
+    Running header/footer removal next to body text at the page margins
+
+    Imports the _build_margin_check document with both engines and counts
+    the body lines lost and the header/footer lines left in the output.
+    Every body line must survive and every header and page number must go.
+
+    Returns:
+        Dict with 'body_lines', 'lost' and 'margins_left' per engine,
+        'success', 'summary' and 'error'
+    """
+    from backend.converter import DocumentConverter
+
+    converter = DocumentConverter()
+    converter.import_cache = None
+    converter.import_history = None
+    converter.image_objects_dir = None
+
+    pdf_path = Path(corpus_dir) / f"margins-v{CORPUS_VERSION}.pdf"
+    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    body, header, footers = _build_margin_check(pdf_path)
+    result = {'body_lines': len(body), 'lost': {}, 'margins_left': {},
+              'success': True, 'summary': "", 'error': ""}
+
+    for engine in BENCHMARK_ENGINES:
+        with tempfile.TemporaryDirectory() as images_dir:
+            if engine == 'pymupdf':
+                success, content, error = converter._pdf_to_markdown_pymupdf(str(pdf_path), images_dir)
+            else:
+                success, content, error = converter._pdf_to_markdown_pdfplumber(str(pdf_path))
+        if not success:
+            result['success'] = False
+            result['error'] = f"{engine}: {error}"
+            continue
+
+        output_lines = {line.strip() for line in content.splitlines()}
+        result['lost'][engine] = sum(1 for text in body if text not in output_lines)
+        result['margins_left'][engine] = content.count(header) + sum(
+            1 for footer in footers if footer in output_lines)
+        if result['lost'][engine] or result['margins_left'][engine]:
+            result['success'] = False
+            result['error'] = result['error'] or (
+                f"{engine}: {result['lost'][engine]}/{len(body)} body lines lost, "
+                f"{result['margins_left'][engine]} header/footer lines left")
+
+    result['summary'] = "  ".join(
+        f"{engine} {result['lost'][engine]}/{len(body)} body lines lost, "
+        f"{result['margins_left'][engine]} header/footer lines left"
+        for engine in result['lost'])
+    return result
+
+
+# Micro-benchmark name -> (function, description)
+MICRO_BENCHMARKS = {
+    'table-scaling': (micro_table_scaling, "Table extraction per page on 25/50/100-page documents"),
+    'line-grouping': (micro_line_grouping, "pdfplumber char-to-line grouping against the old loop"),
+    'code-blocks': (micro_code_blocks, "Code listings of 5,000/10,000/20,000 lines across pages"),
+    'margins': (micro_margins, "Header/footer removal next to body text at 1-inch Letter margins"),
+}
+
+
+def run_micro_benchmarks(names: list, corpus_dir: Path, logger) -> dict:
+    """Run micro-benchmarks in this process; errors are reported, never raised"""
+    results = {}
+    log_level = get_logger().level
+    for name in names:
+        # Per-page log lines would drown the results
+        get_logger().setLevel(logging.WARNING)
+        try:
+            results[name] = MICRO_BENCHMARKS[name][0](corpus_dir)
+        except Exception as e:
+            results[name] = {'success': False, 'summary': "", 'error': str(e)}
+        finally:
+            get_logger().setLevel(log_level)
+
+        if results[name]['success']:
+            logger.info(f"{name:14} {results[name]['summary']}")
+        else:
+            logger.info(f"{name:14} FAILED: {results[name]['error']}")
+    return results
+
+
+def _package_version(name: str) -> str:
+    try:
+        from importlib.metadata import version
+        return version(name)
+    except Exception:
+        return ""
+
+
+def _environment() -> dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'pymupdf': _package_version('PyMuPDF'),
+        'pdfplumber': _package_version('pdfplumber'),
+    }
+
+
+def _main_micro(args, logger) -> int:
+    """--micro: run the micro-benchmarks and write their results"""
+    names = list(MICRO_BENCHMARKS) if args.micro == 'all' else \
+        [name.strip() for name in args.micro.split(',') if name.strip()]
+    unknown = [name for name in names if name not in MICRO_BENCHMARKS]
+    if unknown:
+        logger.error(f"Unknown micro-benchmarks: {', '.join(unknown)}")
+        return 2
+
+    logger.info(f"Running micro-benchmarks {', '.join(names)}")
+    report = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'corpus_version': CORPUS_VERSION,
+        'environment': _environment(),
+        'micro': run_micro_benchmarks(names, Path(args.corpus_dir), logger),
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logger.info(f"Results written to {output_path}")
+
+    failed = [name for name, result in report['micro'].items() if not result['success']]
+    if failed:
+        logger.error(f"Failed micro-benchmarks: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the PDF import engines on a generated corpus."
+    )
+    parser.add_argument('--cases', default=",".join(BENCHMARK_CASES),
+                        help=f"Comma-separated cases (default: all of {', '.join(BENCHMARK_CASES)})")
+    parser.add_argument('--engines', default=",".join(BENCHMARK_ENGINES),
+                        help="Comma-separated engines (default: pymupdf,pdfplumber)")
+    parser.add_argument('--profile', choices=list(PDF_IMPORT_PROFILES), default=DEFAULT_PDF_IMPORT_PROFILE,
+                        help=f"Import profile (default: {DEFAULT_PDF_IMPORT_PROFILE})")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Runs per case and engine; the median is reported (default: 1)")
+    parser.add_argument('--corpus-dir', default=str(DEFAULT_CORPUS_DIR),
+                        help="Folder of the generated PDFs (default: %(default)s)")
+    parser.add_argument('-o', '--output', default='benchmark_results.json',
+                        help="Path of the JSON results (default: %(default)s)")
+    parser.add_argument('--baseline',
+                        help="Compare with the results JSON of an earlier run")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change that counts as a regression (default: %(default)s)")
+    parser.add_argument('--save-baseline',
+                        help="Also write the results to this path, for later --baseline runs")
+    parser.add_argument('--micro', metavar='NAME,...',
+                        help=f"Run micro-benchmarks instead of the import cases "
+                             f"('all' or any of {', '.join(MICRO_BENCHMARKS)})")
+    args = parser.parse_args(argv)
+
+    logger = setup_logger()
+
+    if args.micro:
+        return _main_micro(args, logger)
+
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    engines = [engine.strip() for engine in args.engines.split(',') if engine.strip()]
+    unknown = [case for case in cases if case not in BENCHMARK_CASES] + \
+              [engine for engine in engines if engine not in BENCHMARK_ENGINES]
+    if unknown:
+        logger.error(f"Unknown cases or engines: {', '.join(unknown)}")
+        return 2
+
+    logger.info(f"Benchmarking {', '.join(engines)} on {', '.join(cases)} (profile {args.profile})")
+    started_at = datetime.now().isoformat(timespec='seconds')
+    results = run_benchmark(cases, engines, args.profile, Path(args.corpus_dir),
+                            max(1, args.repeat), logger)
+
+    report = {
+        'started_at': started_at,
+        'corpus_version': CORPUS_VERSION,
+        'profile': args.profile,
+        'repeat': max(1, args.repeat),
+        'environment': _environment(),
+        'stages': list(PDF_IMPORT_STAGES),
+        'cases': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('corpus_version') != CORPUS_VERSION or baseline.get('profile') != args.profile:
+            logger.warning("Baseline was recorded with another corpus version or profile; "
+                           "only matching cases are compared")
+        comparisons = compare_with_baseline(results, baseline, args.threshold)
+        report['baseline'] = {'path': args.baseline, 'threshold': args.threshold,
+                              'comparisons': comparisons}
+
+        for comparison in comparisons:
+            if comparison['change'] is None:
+                status = "now FAILS"
+            else:
+                status = (f"{comparison['baseline']} -> {comparison['current']} "
+                          f"({comparison['change']:+.1%})")
+            marker = "REGRESSION" if comparison['regression'] else "ok"
+            logger.info(f"{marker:10} {comparison['case']:8} {comparison['engine']:10} "
+                        f"{comparison['metric']}: {status}")
+        regressions = [comparison for comparison in comparisons if comparison['regression']]
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logger.info(f"Results written to {output_path}")
+
+    if args.save_baseline:
+        baseline_report = {key: value for key, value in report.items() if key != 'baseline'}
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline_report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Baseline written to {args.save_baseline}")
+
+    failed = [f"{case}/{engine}" for case, case_result in results.items()
+              for engine, result in case_result['engines'].items() if not result['success']]
+    if failed:
+        logger.error(f"Failed runs: {', '.join(failed)}")
+    if regressions:
+        logger.error(f"{len(regressions)} regressions beyond {args.threshold:.0%}")
+
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+새김 (Saekim) PDF 내보내기 자산 받기
+
+Downloads the stylesheets and fonts of the PDF export page (KaTeX) into
+src/ui/vendor, so exports render without network access. Run it once after
+cloning; saekim.spec runs it before bundling src/ui and fails if it fails.
+
+Usage:
+    python src/fetch_pdf_assets.py [--force]
+"""
+
+import io
+import sys
+import shutil
+import tarfile
+import argparse
+import urllib.request
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backend.pdf_assets import KATEX_VERSION
+from utils.logger import setup_logger
+
+KATEX_PACKAGE_URL = f"https://registry.npmjs.org/katex/-/katex-{KATEX_VERSION}.tgz"
+
+VENDOR_DIR = Path(__file__).parent / 'ui' / 'vendor'
+
+
+def fetch_katex(target_dir: Path, logger) -> int:
+    """
+    Extract katex.min.css and its WOFF2 fonts from the KaTeX npm package
+
+    Chromium only requests the WOFF2 variant of each font, so the WOFF and
+    TTF files are left out.
+
+    Returns:
+        Number of files written
+    """
+    logger.info(f"Downloading {KATEX_PACKAGE_URL}")
+    with urllib.request.urlopen(KATEX_PACKAGE_URL, timeout=60) as response:
+        package = response.read()
+
+    temp_dir = target_dir.with_name(f"{target_dir.name}.tmp")
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    (temp_dir / 'fonts').mkdir(parents=True)
+
+    written = 0
+    with tarfile.open(fileobj=io.BytesIO(package), mode='r:gz') as archive:
+        for member in archive.getmembers():
+            name = member.name
+            if name == 'package/dist/katex.min.css':
+                target = temp_dir / 'katex.min.css'
+            elif name.startswith('package/dist/fonts/') and name.endswith('.woff2'):
+                target = temp_dir / 'fonts' / Path(name).name
+            else:
+                continue
+            target.write_bytes(archive.extractfile(member).read())
+            written += 1
+
+    if not (temp_dir / 'katex.min.css').exists():
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise RuntimeError("katex.min.css not found in the KaTeX package")
+
+    shutil.rmtree(target_dir, ignore_errors=True)
+    temp_dir.rename(target_dir)
+    return written
+
+
+def main(argv=None) -> int:
+    """Entry point"""
+    parser = argparse.ArgumentParser(
+        description="Download the assets of the PDF export page into src/ui/vendor."
+    )
+    parser.add_argument('--force', action='store_true',
+                        help="Download again even if the assets are present")
+    args = parser.parse_args(argv)
+
+    logger = setup_logger()
+
+    katex_dir = VENDOR_DIR / 'katex'
+    if (katex_dir / 'katex.min.css').exists() and not args.force:
+        logger.info(f"KaTeX assets already in {katex_dir} (use --force to download again)")
+        return 0
+
+    try:
+        written = fetch_katex(katex_dir, logger)
+    except Exception as e:
+        logger.error(f"Failed to download the KaTeX assets: {e}")
+        return 1
+
+    logger.info(f"KaTeX {KATEX_VERSION}: {written} files written to {katex_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
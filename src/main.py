@@ -7,6 +7,7 @@ Initializes the PyQt6 application and creates the main window.
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
@@ -77,4 +78,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for PDF import worker processes in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
@@ -83,6 +83,11 @@ const App = {
                 this.backend = channel.objects.backend;
                 console.log('✅ Python 백엔드 연결됨');
 
+                // Results of exports running in the conversion service
+                if (this.backend && this.backend.conversion_finished) {
+                    FileModule.listenForConversions(this.backend);
+                }
+
                 // Get project root for image path resolution
                 if (this.backend && this.backend.get_project_root) {
                     this.backend.get_project_root((resultJson) => {
@@ -443,6 +448,24 @@ window.setEditorContent = function (content) {
     }
 };
 
+// Global function for appending streamed content (e.g. PDF import pages) from Python backend
+window.appendEditorContent = function (chunk) {
+    if (typeof EditorModule !== 'undefined' && EditorModule.appendContent) {
+        EditorModule.appendContent(chunk);
+    } else {
+        console.error('❌ EditorModule not available');
+    }
+};
+
+// Global function for locking the editor while a PDF import streams into it, from Python backend
+window.setEditorReadOnly = function (readOnly) {
+    if (typeof EditorModule !== 'undefined' && EditorModule.setReadOnly) {
+        EditorModule.setReadOnly(readOnly);
+    } else {
+        console.error('❌ EditorModule not available');
+    }
+};
+
 // Global function for setting current file path from Python backend
 window.setCurrentFile = function (filePath) {
     App.state.currentFile = filePath;
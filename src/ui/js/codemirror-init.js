@@ -57,6 +57,10 @@
 시작하려면 이 텍스트를 지우고 작성을 시작하세요!
 `;
 
+            // Set while a PDF import streams into the editor: user edits are dropped,
+            // backend content (dispatched with filter: false) still goes through
+            let readOnly = false;
+
             // Create EditorState
             const startState = EditorState.create({
                 doc: initialContent,
@@ -64,6 +68,7 @@
                     basicSetup,
                     markdown(),
                     EditorView.lineWrapping,
+                    EditorState.changeFilter.of(() => !readOnly),
                     EditorView.updateListener.of((update) => {
                         if (update.docChanged) {
                             const content = update.state.doc.toString();
@@ -106,11 +111,23 @@
                                 from: 0,
                                 to: window.editorView.state.doc.length,
                                 insert: content
-                            }
+                            },
+                            filter: false
                         });
                     }
                 },
 
+                appendContent(text) {
+                    if (window.editorView) {
+                        const end = window.editorView.state.doc.length;
+                        window.editorView.dispatch({ changes: { from: end, insert: text }, filter: false });
+                    }
+                },
+
+                setReadOnly(value) {
+                    readOnly = value;
+                },
+
                 init() {
                     console.log('✅ CodeMirror 6 ready');
                     // Trigger initial preview
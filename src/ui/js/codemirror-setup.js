@@ -39,6 +39,10 @@ function initCodeMirror() {
 시작하려면 이 텍스트를 지우고 작성을 시작하세요!
 `;
 
+    // Set while a PDF import streams into the editor: user edits are dropped,
+    // backend content (dispatched with filter: false) still goes through
+    let readOnly = false;
+
     // Create EditorState
     const startState = EditorState.create({
         doc: initialContent,
@@ -46,6 +50,7 @@ function initCodeMirror() {
             basicSetup,
             markdown(),
             EditorView.lineWrapping,
+            EditorState.changeFilter.of(() => !readOnly),
             EditorView.updateListener.of((update) => {
                 if (update.docChanged) {
                     // Notify app of content change
@@ -87,10 +92,22 @@ function initCodeMirror() {
                     from: 0,
                     to: window.editorView.state.doc.length,
                     insert: content
-                }
+                },
+                filter: false
             });
         },
 
+        appendContent(text) {
+            if (window.editorView) {
+                const end = window.editorView.state.doc.length;
+                window.editorView.dispatch({ changes: { from: end, insert: text }, filter: false });
+            }
+        },
+
+        setReadOnly(value) {
+            readOnly = value;
+        },
+
         init() {
             console.log('✅ CodeMirror 6 initialized');
             // Trigger initial preview
@@ -24,6 +24,15 @@ const EditorModule = {
         this.setupEventListeners();
         this.updateWordCount();
 
+        // Word count and preview of appended content, once appends pause
+        this.refreshAfterAppend = Utils.debounce(() => {
+            this.updateWordCount();
+
+            if (typeof PreviewModule !== 'undefined') {
+                PreviewModule.update(this.getContent());
+            }
+        }, 300);
+
         console.log('✅ Editor 모듈 초기화 완료');
     },
 
@@ -105,11 +114,35 @@ const EditorModule = {
         }
     },
 
+    /**
+     * Append text at the end of the editor (streamed content, e.g. PDF import pages)
+     * Only the new text is inserted; the rest of the content is not copied
+     */
+    appendContent(text) {
+        if (this.editor) {
+            const end = this.editor.textLength;
+            this.editor.setRangeText(text, end, end, 'preserve');
+
+            if (this.refreshAfterAppend) {
+                this.refreshAfterAppend();
+            }
+        }
+    },
+
+    /**
+     * Make the editor read-only (while a PDF import streams into it) or editable again
+     */
+    setReadOnly(readOnly) {
+        if (this.editor) {
+            this.editor.readOnly = readOnly;
+        }
+    },
+
     /**
      * Insert text at cursor position
      */
     insertText(text) {
-        if (!this.editor) return;
+        if (!this.editor || this.editor.readOnly) return;
 
         const start = this.editor.selectionStart;
         const end = this.editor.selectionEnd;
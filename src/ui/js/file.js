@@ -123,6 +123,54 @@ const FileModule = {
         }
     },
 
+    // job_id -> resolvers waiting for conversion_finished
+    pendingConversions: new Map(),
+    // job_id -> results that arrived before anyone waited for them
+    finishedConversions: new Map(),
+
+    /**
+     * Listen for finished backend conversions
+     * Called once the backend is connected: signals emitted before the
+     * connection are not delivered
+     */
+    listenForConversions(backend) {
+        backend.conversion_finished.connect((jobId, finishedJson) => {
+            const result = JSON.parse(finishedJson);
+            const resolvers = this.pendingConversions.get(jobId);
+            if (!resolvers) {
+                this.finishedConversions.set(jobId, result);
+                return;
+            }
+            this.pendingConversions.delete(jobId);
+            resolvers.forEach((resolve) => resolve(result));
+        });
+    },
+
+    /**
+     * Wait for the result of a backend conversion
+     * Exports run in the background: the backend answers with
+     * {pending, job_id} right away and emits conversion_finished later
+     */
+    awaitConversion(resultJson) {
+        const result = JSON.parse(resultJson);
+        if (!result.pending) {
+            return Promise.resolve(result);
+        }
+
+        // Finished before the answer to the export call arrived
+        if (this.finishedConversions.has(result.job_id)) {
+            const finished = this.finishedConversions.get(result.job_id);
+            this.finishedConversions.delete(result.job_id);
+            return Promise.resolve(finished);
+        }
+
+        return new Promise((resolve) => {
+            const resolvers = this.pendingConversions.get(result.job_id) || [];
+            resolvers.push(resolve);
+            this.pendingConversions.set(result.job_id, resolvers);
+        });
+    },
+
     /**
      * Export to PDF (Advanced - requires GTK3)
      */
@@ -381,10 +429,10 @@ const FileModule = {
             }, 200); // Update every 200ms
 
             // Step 3: Generate PDF to the selected path
-            App.backend.generate_pdf_from_html(renderedHTML, title, savePath, (resultJson) => {
-                clearInterval(progressInterval); // Stop fake progress
+            App.backend.generate_pdf_from_html(renderedHTML, title, savePath, async (resultJson) => {
+                const result = await this.awaitConversion(resultJson);
 
-                const result = JSON.parse(resultJson);
+                clearInterval(progressInterval); // Stop fake progress
 
                 if (result.success) {
                     this.showPDFProgress(100, '✅ 완료!', `PDF 생성이 완료되었습니다!`);
@@ -406,6 +454,10 @@ const FileModule = {
                         }
                         if (typeof Utils !== 'undefined') {
                             Utils.showToast(`PDF를 생성했습니다\n${result.filepath}`, 'success');
+                            // Remote images that could not be loaded are missing from the PDF
+                            if (result.warning) {
+                                Utils.showToast(`일부 원격 이미지를 불러오지 못해 PDF에서 빠졌습니다\n${result.warning}`, 'warning');
+                            }
                         }
                     }, 2000);
                 } else if (result.error !== 'Cancelled') {
@@ -514,8 +566,8 @@ const FileModule = {
             console.log('📄 HTML로 내보내기...');
 
             // Call backend to export to HTML
-            App.backend.export_to_html(content, (resultJson) => {
-                const result = JSON.parse(resultJson);
+            App.backend.export_to_html(content, async (resultJson) => {
+                const result = await this.awaitConversion(resultJson);
 
                 if (result.success) {
                     console.log('✅ HTML 생성 성공:', result.filepath);
@@ -574,23 +626,14 @@ const FileModule = {
                 const result = JSON.parse(resultJson);
 
                 if (result.success) {
-                    console.log('✅ PDF 변환 성공');
-                    console.log('  - 저장된 파일:', result.filepath);
-                    if (result.images_dir) {
-                        console.log('  - 이미지 폴더:', result.images_dir);
-                    }
+                    console.log('✅ PDF 변환 시작');
+                    console.log('  - 저장할 파일:', result.filepath);
 
-                    // File is already opened in new tab by backend
-                    // No need to set content here
-
-                    // Show success message
-                    let message = 'PDF를 마크다운으로 변환하여 새 탭에서 열었습니다';
-                    if (result.images_dir) {
-                        message += `\n이미지가 ${result.images_dir}에 저장되었습니다`;
-                    }
+                    // Backend opened a new tab and streams converted pages into it;
+                    // it shows its own toast once the conversion completes
 
                     if (typeof Utils !== 'undefined') {
-                        Utils.showToast(message, 'success');
+                        Utils.showToast('PDF 변환을 시작했습니다. 변환된 페이지가 새 탭에 차례로 추가됩니다', 'info');
                     }
                 } else if (result.error !== 'Cancelled' && result.error !== 'Save cancelled') {
                     console.error('❌ PDF 변환 실패:', result.error);
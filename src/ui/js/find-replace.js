@@ -514,7 +514,7 @@ const FindReplaceModule = {
      * Replace current match
      */
     replace() {
-        if (!this.editor || this.matches.length === 0 || this.currentMatchIndex < 0) return;
+        if (!this.editor || this.editor.readOnly || this.matches.length === 0 || this.currentMatchIndex < 0) return;
 
         const match = this.matches[this.currentMatchIndex];
         const replaceTerm = this.replaceInput?.value || '';
@@ -548,7 +548,7 @@ const FindReplaceModule = {
      * Replace all matches
      */
     replaceAll() {
-        if (!this.editor || this.matches.length === 0) return;
+        if (!this.editor || this.editor.readOnly || this.matches.length === 0) return;
 
         const replaceTerm = this.replaceInput?.value || '';
         let content = this.editor.value;
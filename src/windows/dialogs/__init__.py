@@ -3,5 +3,6 @@ Dialog classes for Saekim markdown editor
 """
 
 from .startup_dialog import StartupDialog
+from .pdf_import_dialog import PdfImportDialog
 
-__all__ = ['StartupDialog']
+__all__ = ['StartupDialog', 'PdfImportDialog']
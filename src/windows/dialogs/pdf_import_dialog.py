@@ -0,0 +1,145 @@
+"""
+PDF 가져오기 다이얼로그 (PDF Import Dialog)
+
+변환 전에 PDF를 빠르게 훑어보고(텍스트 추출 없이) 다음을 보여준다:
+- 페이지 수, 텍스트/이미지/표 페이지 비율
+- 지난 변환 속도를 바탕으로 한 예상 변환 시간과 결과 크기
+
+가져올 페이지 범위를 입력하면 예상치가 바로 다시 계산된다.
+"""
+
+from pathlib import Path
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QLabel, QLineEdit, QDialogButtonBox
+)
+from PyQt6.QtCore import QTimer
+
+from backend.pdf_import_estimate import estimate_pdf_import, parse_page_range
+from backend.pdf_import_profiles import PDF_IMPORT_PROFILES
+from utils.logger import get_logger
+from utils.design_manager import DesignManager
+
+logger = get_logger()
+
+
+def format_duration(seconds: float) -> str:
+    """예상 시간 표시 (예: '약 12초', '약 3분 20초')"""
+    seconds = max(1, round(seconds))
+    if seconds < 60:
+        return f"약 {seconds}초"
+    minutes, seconds = divmod(seconds, 60)
+    return f"약 {minutes}분 {seconds}초" if seconds else f"약 {minutes}분"
+
+
+def format_size(size: float) -> str:
+    """바이트 크기 표시 (예: '340 KB', '12.5 MB')"""
+    if size < 1024 * 1024:
+        return f"{max(1, round(size / 1024))} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class PdfImportDialog(QDialog):
+    """PDF 변환 전 예상 비용 확인 및 페이지 범위 선택"""
+
+    # 입력이 멈춘 뒤 다시 계산하기까지 기다리는 시간 (ms)
+    ESTIMATE_DELAY = 250
+
+    def __init__(self, pdf_path: str, profile: str, parent=None):
+        super().__init__(parent)
+        self.pdf_path = pdf_path
+        self.profile = profile
+        self.page_range = None  # (first, last) 또는 None (전체)
+
+        self.setWindowTitle("PDF 가져오기")
+        self.setFont(DesignManager.get_font("body"))
+        self.setMinimumWidth(420)
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+
+        file_label = QLabel(Path(pdf_path).name)
+        file_font = DesignManager.get_font("body")
+        file_font.setBold(True)
+        file_label.setFont(file_font)
+        layout.addWidget(file_label)
+
+        form_layout = QFormLayout()
+        self.pages_label = QLabel()
+        form_layout.addRow("페이지:", self.pages_label)
+        self.content_label = QLabel()
+        form_layout.addRow("구성:", self.content_label)
+
+        self.range_edit = QLineEdit()
+        self.range_edit.setPlaceholderText("예: 120-180 (비우면 전체)")
+        self.range_edit.textChanged.connect(self._schedule_estimate)
+        form_layout.addRow("변환할 페이지:", self.range_edit)
+
+        self.estimate_label = QLabel()
+        self.estimate_label.setWordWrap(True)
+        form_layout.addRow("예상:", self.estimate_label)
+        form_layout.addRow("프로필:", QLabel(PDF_IMPORT_PROFILES[profile].label))
+        layout.addLayout(form_layout)
+
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setText("변환")
+        self.buttons.button(QDialogButtonBox.StandardButton.Cancel).setText("취소")
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+
+        self._estimate_timer = QTimer(self)
+        self._estimate_timer.setSingleShot(True)
+        self._estimate_timer.setInterval(self.ESTIMATE_DELAY)
+        self._estimate_timer.timeout.connect(self.update_estimate)
+
+        self.update_estimate()
+
+    def _schedule_estimate(self):
+        self._estimate_timer.start()
+
+    def update_estimate(self):
+        """입력된 범위로 PDF를 다시 훑어보고 예상치를 표시"""
+        self._estimate_timer.stop()
+        ok_button = self.buttons.button(QDialogButtonBox.StandardButton.Ok)
+
+        try:
+            self.page_range = parse_page_range(self.range_edit.text())
+            estimate = estimate_pdf_import(self.pdf_path, self.page_range, self.profile)
+        except ValueError as e:
+            self.estimate_label.setText(f"잘못된 페이지 범위입니다 ({e})")
+            ok_button.setEnabled(False)
+            return
+        except Exception as e:
+            logger.warning(f"PDF 예상치 계산 실패: {e}")
+            self.estimate_label.setText("예상치를 계산할 수 없습니다")
+            ok_button.setEnabled(True)
+            return
+
+        scan = estimate.scan
+        if scan.pages == scan.page_count:
+            self.pages_label.setText(f"{scan.page_count}쪽")
+        else:
+            self.pages_label.setText(f"{scan.first_page}-{scan.last_page}쪽 "
+                                     f"({scan.pages}/{scan.page_count}쪽)")
+        self.content_label.setText(
+            f"텍스트 {scan.text_pages / scan.pages:.0%} · 이미지 {scan.image_ratio:.0%} · "
+            f"표 {scan.table_density:.0%}, 이미지 약 {round(scan.images)}개"
+        )
+
+        text = f"{format_duration(estimate.seconds)}, 마크다운 {format_size(estimate.markdown_bytes)}"
+        if estimate.image_bytes:
+            text += f" + 이미지 {format_size(estimate.image_bytes)}"
+        if not estimate.from_history:
+            text += "\n(아직 변환 기록이 없어 기본값으로 계산했습니다)"
+        self.estimate_label.setText(text)
+        ok_button.setEnabled(True)
+
+    def accept(self):
+        """입력 직후 바로 누른 경우에도 입력된 범위로 변환"""
+        if self._estimate_timer.isActive():
+            self.update_estimate()
+            if not self.buttons.button(QDialogButtonBox.StandardButton.Ok).isEnabled():
+                return
+        super().accept()
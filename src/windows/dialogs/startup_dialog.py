@@ -8,6 +8,7 @@
 
 추가 기능:
 - 드래그 & 드롭으로 MD/PDF 파일 열기
+- PDF 변환 전 예상 시간 확인 및 페이지 범위 선택
 - 시스템 테마 / 저장된 테마 적용
 """
 
@@ -21,8 +22,10 @@ from PyQt6.QtCore import Qt, QSize, QSettings, QMimeData
 from PyQt6.QtGui import QFont, QColor, QDragEnterEvent, QDropEvent, QPalette
 
 from backend.converter import DocumentConverter
+from backend.pdf_import_job import load_pdf_import_profile
 from utils.logger import get_logger
 from utils.design_manager import DesignManager
+from .pdf_import_dialog import PdfImportDialog
 
 logger = get_logger()
 
@@ -418,6 +421,12 @@ class StartupDialog(QDialog):
 
     def convert_pdf_file(self, pdf_path: str):
         """PDF 파일 변환 (드래그 & 드롭용)"""
+        # 예상 변환 시간/크기 확인 및 페이지 범위 선택
+        profile = load_pdf_import_profile()
+        import_dialog = PdfImportDialog(pdf_path, profile, self)
+        if not import_dialog.exec():
+            return
+
         # 저장할 마크다운 파일 경로 지정
         pdf_name = Path(pdf_path).stem
         suggested_name = f"{pdf_name}.md"
@@ -436,12 +445,14 @@ class StartupDialog(QDialog):
         if not save_path.endswith('.md'):
             save_path += '.md'
 
-        # 변환 진행
+        # 변환 진행 (선택한 페이지 범위만)
         try:
             converter = DocumentConverter()
             success, markdown_content, error_msg = converter.pdf_to_markdown(
                 pdf_path,
-                output_dir=str(Path(save_path).parent)
+                output_dir=str(Path(save_path).parent),
+                profile=profile,
+                page_range=import_dialog.page_range
             )
 
             if success:
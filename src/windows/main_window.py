@@ -550,7 +550,8 @@ class MainWindow(QMainWindow):
             if hasattr(self, 'title_bar'):
                 self.title_bar.set_view_mode('split')
 
-        # Get tab info
+        # Get tab info (with the pages of a PDF import still streaming into it)
+        self.backend.sync_pdf_import_content(tab_id)
         tab = self.tab_manager.get_tab(tab_id)
         if not tab:
             return
@@ -798,6 +799,9 @@ class MainWindow(QMainWindow):
         if not tab_id:
             return
 
+        # Stop a PDF import still streaming into this tab
+        self.backend.cancel_pdf_import(tab_id)
+
         # Check if tab has unsaved changes
         tab = self.tab_manager.get_tab(tab_id)
         if tab and tab.is_modified:
@@ -997,6 +1001,9 @@ class MainWindow(QMainWindow):
         Args:
             event: Close event
         """
+        # Stop running conversions before tearing down the window
+        self.backend.shutdown()
+
         # Get current file explorer path
         explorer_path = None
         if self.file_explorer.has_root_path():
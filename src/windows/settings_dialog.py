@@ -5,6 +5,8 @@ Settings Dialog
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QComboBox, QPushButton, QGroupBox, QFormLayout)
 from PyQt6.QtCore import Qt
+from backend.pdf_import_job import load_pdf_import_profile, save_pdf_import_profile
+from backend.pdf_import_profiles import PDF_IMPORT_PROFILES
 from utils.design_manager import DesignManager
 from windows.license_dialog import LicenseDialog
 
@@ -14,7 +16,7 @@ class SettingsDialog(QDialog):
         self.theme_manager = theme_manager
         self.setWindowTitle("Settings")
         self.setFont(DesignManager.get_font("body"))
-        self.setFixedSize(400, 350)
+        self.setFixedSize(400, 420)
         self.setModal(True)
         
         layout = QVBoxLayout(self)
@@ -40,6 +42,24 @@ class SettingsDialog(QDialog):
         group_appearance.setLayout(form_layout)
         layout.addWidget(group_appearance)
         
+        # PDF Import Group
+        group_pdf_import = QGroupBox("PDF Import")
+        pdf_import_layout = QFormLayout()
+        
+        self.combo_pdf_profile = QComboBox()
+        for key, profile in PDF_IMPORT_PROFILES.items():
+            self.combo_pdf_profile.addItem(profile.label, key)
+        
+        index = self.combo_pdf_profile.findData(load_pdf_import_profile())
+        if index >= 0:
+            self.combo_pdf_profile.setCurrentIndex(index)
+        
+        self.combo_pdf_profile.currentIndexChanged.connect(self.on_pdf_profile_changed)
+        
+        pdf_import_layout.addRow("Profile:", self.combo_pdf_profile)
+        group_pdf_import.setLayout(pdf_import_layout)
+        layout.addWidget(group_pdf_import)
+        
         # About / License Group
         group_about = QGroupBox("About")
         about_layout = QVBoxLayout()
@@ -77,3 +97,8 @@ class SettingsDialog(QDialog):
             # Apply theme immediately
             if self.parent():
                 self.parent().apply_theme(theme_key)
+
+    def on_pdf_profile_changed(self, index):
+        profile_key = self.combo_pdf_profile.itemData(index)
+        if profile_key:
+            save_pdf_import_profile(profile_key)